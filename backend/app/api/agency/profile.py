@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
@@ -8,19 +8,43 @@ from app.schemas.agency.profile import (
     AgencyProfileCreate, 
     AgencyProfileUpdate, 
     AgencyProfileOut,
-    AgencyProfilePublic
+    AgencyProfilePublic,
+    AgencySortEnum,
+    CreatorRosterPage,
+    BrandRosterPage,
+    RosterInviteOut
 )
 from app.schemas.shared.token import LoginResponse
 from app.schemas.shared.user import UserProfile
 from app.core.security import create_token_with_onboarding_status
+from app.schemas.shared.batch import ProfileBatchRequest
+from app.utils.result_cache import cached_discovery_response
+from app.utils.geo import parse_near
+from app.utils.pagination import decode_cursor
+from app.utils.http_cache import (
+    PUBLIC_PROFILE_CACHE_CONTROL,
+    PRIVATE_PROFILE_CACHE_CONTROL,
+    profile_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers
+)
 from app.crud.agency import (
+    PUBLIC_AGENCY_COLUMNS,
     create_agency_profile,
     get_agency_profile_by_user_id,
     get_agency_profile_by_id,
+    get_agency_profiles_by_ids,
+    get_agency_profile_version,
     update_agency_profile,
     get_public_agency_profiles,
-    get_agency_dashboard_stats
+    get_agency_dashboard_stats,
+    get_agency_roster,
+    invite_roster_member,
+    remove_roster_member
 )
+from app.crud.brand import get_brand_profile_by_id
+from app.crud.creator import get_creator_profile_by_id
 
 router = APIRouter(prefix="/agency/profile", tags=["Agency Profile"])
 
@@ -64,19 +88,34 @@ async def complete_agency_onboarding(
 
 @router.get("/me", response_model=AgencyProfileOut)
 async def get_my_agency_profile(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_onboarded_agency)
 ):
     """
     Get the current agency's profile.
     Requires completed onboarding.
+    Supports If-None-Match: answers 304 from the profile's version alone.
     """
+    if request.headers.get("if-none-match"):
+        version = get_agency_profile_version(db, user_id=str(current_user.id))
+        if version:
+            etag = profile_etag("agency-me", version.id, version.changed_at)
+            if etag_matches(request, etag):
+                return not_modified(etag, PRIVATE_PROFILE_CACHE_CONTROL)
+
     profile = get_agency_profile_by_user_id(db, str(current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agency profile not found."
         )
+    set_cache_headers(
+        response,
+        profile_etag("agency-me", profile.id, profile.updated_at or profile.created_at),
+        PRIVATE_PROFILE_CACHE_CONTROL
+    )
     return profile
 
 @router.put("/", response_model=AgencyProfileOut)
@@ -97,47 +136,96 @@ async def update_my_agency_profile(
         )
     return profile
 
+@router.post("/batch", response_model=List[AgencyProfilePublic])
+async def get_public_agency_profiles_batch(
+    batch: ProfileBatchRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Get public agency profiles for a list of IDs in one query, in request order.
+    Unknown and repeated IDs are left out.
+    Served through the discovery result cache, so pages can trail profile
+    writes by up to DISCOVERY_CACHE_TTL_SECONDS (15 s) in other workers.
+    """
+    profile_ids = list(dict.fromkeys(batch.ids))
+    return cached_discovery_response(
+        request,
+        "agency",
+        {"batch_ids": tuple(profile_ids)},
+        lambda: get_agency_profiles_by_ids(db, profile_ids, columns=PUBLIC_AGENCY_COLUMNS),
+        AgencyProfilePublic
+    )
+
 @router.get("/{profile_id}", response_model=AgencyProfilePublic)
 async def get_public_agency_profile(
     profile_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get a public agency profile by ID.
     Used by brands and creators to view agency information.
+    Supports If-None-Match: answers 304 from the profile's version alone.
     """
-    profile = get_agency_profile_by_id(db, profile_id)
+    if request.headers.get("if-none-match"):
+        version = get_agency_profile_version(db, profile_id=profile_id)
+        if version:
+            etag = profile_etag("agency-public", version.id, version.changed_at)
+            if etag_matches(request, etag):
+                return not_modified(etag, PUBLIC_PROFILE_CACHE_CONTROL)
+
+    profile = get_agency_profile_by_id(db, profile_id, columns=PUBLIC_AGENCY_COLUMNS)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agency profile not found."
         )
     
+    set_cache_headers(
+        response,
+        profile_etag("agency-public", profile.id, profile.updated_at or profile.created_at),
+        PUBLIC_PROFILE_CACHE_CONTROL
+    )
     return profile
 
 @router.get("/", response_model=List[AgencyProfilePublic])
 async def discover_agencies(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of profiles to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of profiles to return"),
     agency_type: Optional[str] = Query(None, description="Filter by agency type"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
-    location: Optional[str] = Query(None, description="Filter by location")
+    location: Optional[str] = Query(None, description="Filter by location"),
+    sort_by: AgencySortEnum = Query(AgencySortEnum.CREATED_AT, description="Sort order (highest/newest first)"),
+    near: Optional[str] = Query(None, description="City name or 'lat,lon' to search around"),
+    radius_km: float = Query(50, gt=0, le=1000, description="Search radius around near, in km")
 ):
     """
     Discover agency profiles with filtering.
     Used by brands and creators to find agency partners.
+    Served through the discovery result cache, so pages can trail profile
+    writes by up to DISCOVERY_CACHE_TTL_SECONDS (15 s) in other workers.
     """
-    profiles = get_public_agency_profiles(
-        db=db,
+    filters = dict(
         skip=skip,
         limit=limit,
         agency_type=agency_type,
         industry=industry,
-        location=location
+        location=location,
+        sort_by=sort_by,
+        near=parse_near(near, radius_km)
     )
     
-    return profiles
+    return cached_discovery_response(
+        request,
+        "agency",
+        filters,
+        lambda: get_public_agency_profiles(db=db, **filters),
+        AgencyProfilePublic
+    )
 
 @router.get("/me/dashboard", response_model=dict)
 async def get_agency_dashboard(
@@ -158,4 +246,133 @@ async def get_agency_dashboard(
     return {
         "dashboard_stats": stats,
         "message": "Agency dashboard data retrieved successfully"
-    }
\ No newline at end of file
+    }
+
+def _current_agency(db: Session, current_user: User):
+    profile = get_agency_profile_by_user_id(db, str(current_user.id))
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agency profile not found."
+        )
+    return profile
+
+def _roster_page(db: Session, current_user: User, kind: str, limit: int, cursor: Optional[str]) -> dict:
+    agency = _current_agency(db, current_user)
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    return get_agency_roster(db, agency.id, kind, limit, after)
+
+def _invite_to_roster(db: Session, current_user: User, kind: str, profile):
+    agency = _current_agency(db, current_user)
+    if profile.agency_id == agency.id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This profile is already on this agency's roster."
+        )
+    if profile.agency_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This profile is already managed by another agency."
+        )
+    return invite_roster_member(db, agency, kind, profile.id)
+
+def _remove_from_roster(db: Session, current_user: User, kind: str, profile_id: str) -> None:
+    agency = _current_agency(db, current_user)
+    if not remove_roster_member(db, agency, kind, profile_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile is not on this agency's roster."
+        )
+
+@router.get("/me/roster/creators", response_model=CreatorRosterPage)
+async def list_roster_creators(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_agency),
+    limit: int = Query(20, ge=1, le=100, description="Number of creators to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    List creators managed by the current agency, ordered by display name.
+    Keyset paginated: pass next_cursor back to get the following page.
+    """
+    return _roster_page(db, current_user, "creators", limit, cursor)
+
+@router.post("/me/roster/creators/{profile_id}/invite", response_model=RosterInviteOut, status_code=status.HTTP_201_CREATED)
+async def invite_roster_creator(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_agency)
+):
+    """
+    Invite a public creator to the current agency's roster.
+    The creator joins only once they accept the invite from their own account.
+    """
+    profile = get_creator_profile_by_id(db, profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Creator profile not found."
+        )
+    if not profile.is_public:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This creator profile is private."
+        )
+    return _invite_to_roster(db, current_user, "creators", profile)
+
+@router.delete("/me/roster/creators/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_roster_creator(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_agency)
+):
+    """Remove a creator from the current agency's roster"""
+    _remove_from_roster(db, current_user, "creators", profile_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get("/me/roster/brands", response_model=BrandRosterPage)
+async def list_roster_brands(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_agency),
+    limit: int = Query(20, ge=1, le=100, description="Number of brands to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    List brands managed by the current agency, ordered by brand name.
+    Keyset paginated: pass next_cursor back to get the following page.
+    """
+    return _roster_page(db, current_user, "brands", limit, cursor)
+
+@router.post("/me/roster/brands/{profile_id}/invite", response_model=RosterInviteOut, status_code=status.HTTP_201_CREATED)
+async def invite_roster_brand(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_agency)
+):
+    """
+    Invite a brand to the current agency's roster.
+    The brand joins only once its owner accepts the invite from their own account.
+    """
+    profile = get_brand_profile_by_id(db, profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Brand profile not found."
+        )
+    return _invite_to_roster(db, current_user, "brands", profile)
+
+@router.delete("/me/roster/brands/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_roster_brand(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_agency)
+):
+    """Remove a brand from the current agency's roster"""
+    _remove_from_roster(db, current_user, "brands", profile_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,8 +1,13 @@
 from fastapi import APIRouter
 from app.api.auth import router as auth_router
 from app.api.creator.profile import router as creator_profile_router
+from app.api.creator.leaderboard import router as creator_leaderboard_router
 from app.api.brand.profile import router as brand_profile_router
+from app.api.brand.quote import router as brand_quote_router
 from app.api.agency.profile import router as agency_profile_router
+from app.api.search.suggest import router as suggest_router
+from app.api.search.search import router as search_router
+from app.api.metrics.events import router as metric_events_router
 
 api_router = APIRouter()
 
@@ -11,5 +16,14 @@ api_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 
 # Include profile management routes
 api_router.include_router(creator_profile_router, tags=["Creator Profile"])
+api_router.include_router(creator_leaderboard_router, tags=["Creator Profile"])
 api_router.include_router(brand_profile_router, tags=["Brand Profile"])
-api_router.include_router(agency_profile_router, tags=["Agency Profile"])
\ No newline at end of file
+api_router.include_router(brand_quote_router, tags=["Brand Profile"])
+api_router.include_router(agency_profile_router, tags=["Agency Profile"])
+
+# Include search routes
+api_router.include_router(suggest_router, tags=["Search"])
+api_router.include_router(search_router, tags=["Search"])
+
+# Include internal ingestion routes
+api_router.include_router(metric_events_router, tags=["Metrics"])
\ No newline at end of file
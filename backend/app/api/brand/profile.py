@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
@@ -8,18 +8,37 @@ from app.schemas.brand.profile import (
     BrandProfileCreate, 
     BrandProfileUpdate, 
     BrandProfileOut,
-    BrandProfilePublic
+    BrandProfilePublic,
+    BrandSortEnum,
+    CreatorMatch
 )
 from app.schemas.shared.token import LoginResponse
 from app.schemas.shared.user import UserProfile
 from app.core.security import create_token_with_onboarding_status
+from app.schemas.shared.batch import ProfileBatchRequest
+from app.utils.result_cache import cached_discovery_response
+from app.utils.geo import parse_near
+from app.utils.http_cache import (
+    PUBLIC_PROFILE_CACHE_CONTROL,
+    PRIVATE_PROFILE_CACHE_CONTROL,
+    profile_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers
+)
 from app.crud.brand import (
+    PUBLIC_BRAND_COLUMNS,
     create_brand_profile,
     get_brand_profile_by_user_id,
     get_brand_profile_by_id,
+    get_brand_profiles_by_ids,
+    get_brand_profile_version,
     update_brand_profile,
-    get_public_brand_profiles
+    get_public_brand_profiles,
+    get_brand_matches
 )
+from app.crud.agency import get_roster_invites, accept_roster_invite, decline_roster_invite
+from app.schemas.agency.profile import RosterInviteOut
 
 router = APIRouter(prefix="/brand/profile", tags=["Brand Profile"])
 
@@ -63,21 +82,114 @@ async def complete_brand_onboarding(
 
 @router.get("/me", response_model=BrandProfileOut)
 async def get_my_brand_profile(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_onboarded_brand)
 ):
     """
     Get the current brand's profile.
     Requires completed onboarding.
+    Supports If-None-Match: answers 304 from the profile's version alone.
     """
+    if request.headers.get("if-none-match"):
+        version = get_brand_profile_version(db, user_id=str(current_user.id))
+        if version:
+            etag = profile_etag("brand-me", version.id, version.changed_at)
+            if etag_matches(request, etag):
+                return not_modified(etag, PRIVATE_PROFILE_CACHE_CONTROL)
+
     profile = get_brand_profile_by_user_id(db, str(current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Brand profile not found."
         )
+    set_cache_headers(
+        response,
+        profile_etag("brand-me", profile.id, profile.updated_at or profile.created_at),
+        PRIVATE_PROFILE_CACHE_CONTROL
+    )
     return profile
 
+@router.get("/me/matches", response_model=List[CreatorMatch])
+async def get_my_creator_matches(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_brand),
+    limit: int = Query(20, ge=1, le=100, description="Number of matches to return")
+):
+    """
+    Creators ranked against the current brand's campaign preferences
+    (niches, creator tiers, content types, platforms) and budget range.
+    Each match carries its score and the per-component breakdown.
+    Served from the brand's precomputed recommendation list.
+    """
+    profile = get_brand_profile_by_user_id(db, str(current_user.id))
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Brand profile not found."
+        )
+    return get_brand_matches(db, profile, limit)
+
+def _my_profile(db: Session, current_user: User):
+    profile = get_brand_profile_by_user_id(db, str(current_user.id))
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Brand profile not found."
+        )
+    return profile
+
+@router.get("/me/agency-invites", response_model=List[RosterInviteOut])
+async def list_my_agency_invites(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_brand)
+):
+    """Pending invites from agencies asking to manage the current brand, oldest first"""
+    profile = _my_profile(db, current_user)
+    return get_roster_invites(db, "brands", profile.id)
+
+@router.post("/me/agency-invites/{invite_id}/accept", response_model=BrandProfileOut)
+async def accept_agency_invite(
+    invite_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_brand)
+):
+    """
+    Accept an agency invite: the current brand joins that agency's roster.
+    Other pending invites are dropped.
+    """
+    profile = _my_profile(db, current_user)
+    accepted = accept_roster_invite(db, "brands", profile.id, invite_id)
+    if accepted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agency invite not found."
+        )
+    if not accepted:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This profile is already managed by an agency."
+        )
+    db.refresh(profile)
+    return profile
+
+@router.delete("/me/agency-invites/{invite_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def decline_agency_invite(
+    invite_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_brand)
+):
+    """Decline an agency invite"""
+    profile = _my_profile(db, current_user)
+    if not decline_roster_invite(db, "brands", profile.id, invite_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agency invite not found."
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 @router.put("/", response_model=BrandProfileOut)
 async def update_my_brand_profile(
     profile_data: BrandProfileUpdate,
@@ -96,44 +208,93 @@ async def update_my_brand_profile(
         )
     return profile
 
+@router.post("/batch", response_model=List[BrandProfilePublic])
+async def get_public_brand_profiles_batch(
+    batch: ProfileBatchRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Get public brand profiles for a list of IDs in one query, in request order.
+    Unknown and repeated IDs are left out.
+    Served through the discovery result cache, so pages can trail profile
+    writes by up to DISCOVERY_CACHE_TTL_SECONDS (15 s) in other workers.
+    """
+    profile_ids = list(dict.fromkeys(batch.ids))
+    return cached_discovery_response(
+        request,
+        "brand",
+        {"batch_ids": tuple(profile_ids)},
+        lambda: get_brand_profiles_by_ids(db, profile_ids, columns=PUBLIC_BRAND_COLUMNS),
+        BrandProfilePublic
+    )
+
 @router.get("/{profile_id}", response_model=BrandProfilePublic)
 async def get_public_brand_profile(
     profile_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get a public brand profile by ID.
     Used by creators and agencies to view brand information.
+    Supports If-None-Match: answers 304 from the profile's version alone.
     """
-    profile = get_brand_profile_by_id(db, profile_id)
+    if request.headers.get("if-none-match"):
+        version = get_brand_profile_version(db, profile_id=profile_id)
+        if version:
+            etag = profile_etag("brand-public", version.id, version.changed_at)
+            if etag_matches(request, etag):
+                return not_modified(etag, PUBLIC_PROFILE_CACHE_CONTROL)
+
+    profile = get_brand_profile_by_id(db, profile_id, columns=PUBLIC_BRAND_COLUMNS)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Brand profile not found."
         )
     
+    set_cache_headers(
+        response,
+        profile_etag("brand-public", profile.id, profile.updated_at or profile.created_at),
+        PUBLIC_PROFILE_CACHE_CONTROL
+    )
     return profile
 
 @router.get("/", response_model=List[BrandProfilePublic])
 async def discover_brands(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of profiles to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of profiles to return"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     location: Optional[str] = Query(None, description="Filter by location"),
-    brand_type: Optional[str] = Query(None, description="Filter by brand type")
+    brand_type: Optional[str] = Query(None, description="Filter by brand type"),
+    sort_by: BrandSortEnum = Query(BrandSortEnum.CREATED_AT, description="Sort order (highest/newest first)"),
+    near: Optional[str] = Query(None, description="City name or 'lat,lon' to search around"),
+    radius_km: float = Query(50, gt=0, le=1000, description="Search radius around near, in km")
 ):
     """
     Discover brand profiles with filtering.
     Used by creators and agencies to find potential brand partners.
+    Served through the discovery result cache, so pages can trail profile
+    writes by up to DISCOVERY_CACHE_TTL_SECONDS (15 s) in other workers.
     """
-    profiles = get_public_brand_profiles(
-        db=db,
+    filters = dict(
         skip=skip,
         limit=limit,
         industry=industry,
         location=location,
-        brand_type=brand_type
+        brand_type=brand_type,
+        sort_by=sort_by,
+        near=parse_near(near, radius_km)
     )
     
-    return profiles
\ No newline at end of file
+    return cached_discovery_response(
+        request,
+        "brand",
+        filters,
+        lambda: get_public_brand_profiles(db=db, **filters),
+        BrandProfilePublic
+    )
\ No newline at end of file
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.core.dependencies import require_onboarded_brand
+from app.db.models.user import User
+from app.schemas.brand.quote import CampaignQuote, QuoteRequest
+from app.crud.quote import build_campaign_quote
+from app.utils.currency import currency_rates
+
+router = APIRouter(prefix="/brand/quote", tags=["Brand Profile"])
+
+@router.post("/", response_model=CampaignQuote)
+async def quote_campaign(
+    quote: QuoteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_brand)
+):
+    """
+    Cost a campaign: every deliverable for every selected creator, priced
+    from the creators' listed pricing and converted into one currency.
+    Creators without a matching price are flagged in incomplete.
+    """
+    if quote.currency.upper() not in currency_rates.get(db):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported currency: {quote.currency}"
+        )
+    return build_campaign_quote(db, quote.creator_ids, quote.deliverables, quote.currency)
\ No newline at end of file
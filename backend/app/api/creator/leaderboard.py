@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.db.session import get_db
+from app.core.security import get_current_user
+from app.db.models.user import User, UserRole
+from app.db.models.creator import ContentTypeEnum, CreatorTypeEnum
+from app.schemas.creator.profile import CreatorLeaderboardPage
+from app.crud.creator import get_creator_leaderboard, get_creator_profile_by_user_id
+from app.utils.tags import normalize_tag
+
+router = APIRouter(prefix="/creator/leaderboard", tags=["Creator Profile"])
+
+@router.get("/", response_model=CreatorLeaderboardPage)
+async def get_leaderboard(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    content_type: Optional[ContentTypeEnum] = Query(None, description="Board for one content type"),
+    creator_type: Optional[CreatorTypeEnum] = Query(None, description="Board for one creator tier"),
+    tag: Optional[str] = Query(None, min_length=1, max_length=50, description="Board for one tag"),
+    offset: int = Query(0, ge=0, le=100000, description="Number of ranks to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of ranks to return")
+):
+    """
+    Top public creators by XP score, overall or for one content type,
+    creator type or tag (at most one). Creators calling this also get
+    their own rank on the board.
+    """
+    boards = [
+        (dimension, value)
+        for dimension, value in (
+            ("content_type", content_type.value if content_type else None),
+            ("creator_type", creator_type.value if creator_type else None),
+            ("tag", normalize_tag(tag) if tag else None),
+        )
+        if value
+    ]
+    if len(boards) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Choose at most one of content_type, creator_type and tag."
+        )
+    board = boards[0] if boards else ("overall", "")
+
+    creator_id = None
+    if current_user.role == UserRole.CREATOR:
+        profile = get_creator_profile_by_user_id(db, str(current_user.id))
+        creator_id = profile.id if profile else None
+    return get_creator_leaderboard(db, board, offset, limit, creator_id)
\ No newline at end of file
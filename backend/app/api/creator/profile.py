@@ -1,26 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from app.db.session import get_db
 from app.core.dependencies import require_creator, require_onboarded_creator
 from app.db.models.user import User
+from app.db.models.creator import ContentTypeEnum, CreatorTypeEnum
 from app.schemas.creator.profile import (
     CreatorProfileCreate, 
     CreatorProfileUpdate, 
     CreatorProfileOut,
-    CreatorProfilePublic
+    CreatorProfilePublic,
+    CreatorDiscoveryPage,
+    CreatorSortEnum,
+    SimilarCreator
 )
 from app.schemas.shared.token import LoginResponse
 from app.schemas.shared.user import UserProfile
 from app.core.security import create_token_with_onboarding_status
+from app.schemas.shared.batch import ProfileBatchRequest
+from app.utils.result_cache import cached_discovery_response
+from app.utils.geo import parse_near
+from app.utils.tags import normalize_tags
+from app.utils.http_cache import (
+    PUBLIC_PROFILE_CACHE_CONTROL,
+    PRIVATE_PROFILE_CACHE_CONTROL,
+    profile_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers
+)
 from app.crud.creator import (
+    PUBLIC_CREATOR_COLUMNS,
     create_creator_profile,
     get_creator_profile_by_user_id,
     get_creator_profile_by_id,
+    get_creator_profiles_by_ids,
+    get_creator_profile_version,
     get_creator_profile_by_handle,
+    get_creator_discovery_stats,
+    get_similar_creators,
     update_creator_profile,
     get_public_creator_profiles
 )
+from app.crud.agency import get_roster_invites, accept_roster_invite, decline_roster_invite
+from app.schemas.agency.profile import RosterInviteOut
 
 router = APIRouter(prefix="/creator/profile", tags=["Creator Profile"])
 
@@ -72,21 +95,94 @@ async def complete_creator_onboarding(
 
 @router.get("/me", response_model=CreatorProfileOut)
 async def get_my_creator_profile(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_onboarded_creator)
 ):
     """
     Get the current creator's profile.
     Requires completed onboarding.
+    Supports If-None-Match: answers 304 from the profile's version alone.
     """
+    if request.headers.get("if-none-match"):
+        version = get_creator_profile_version(db, user_id=str(current_user.id))
+        if version:
+            etag = profile_etag("creator-me", version.id, version.changed_at)
+            if etag_matches(request, etag):
+                return not_modified(etag, PRIVATE_PROFILE_CACHE_CONTROL)
+
     profile = get_creator_profile_by_user_id(db, str(current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Creator profile not found."
         )
+    set_cache_headers(
+        response,
+        profile_etag("creator-me", profile.id, profile.updated_at or profile.created_at),
+        PRIVATE_PROFILE_CACHE_CONTROL
+    )
     return profile
 
+def _my_profile(db: Session, current_user: User):
+    profile = get_creator_profile_by_user_id(db, str(current_user.id))
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Creator profile not found."
+        )
+    return profile
+
+@router.get("/me/agency-invites", response_model=List[RosterInviteOut])
+async def list_my_agency_invites(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_creator)
+):
+    """Pending invites from agencies asking to manage the current creator, oldest first"""
+    profile = _my_profile(db, current_user)
+    return get_roster_invites(db, "creators", profile.id)
+
+@router.post("/me/agency-invites/{invite_id}/accept", response_model=CreatorProfileOut)
+async def accept_agency_invite(
+    invite_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_creator)
+):
+    """
+    Accept an agency invite: the current creator joins that agency's roster.
+    Other pending invites are dropped.
+    """
+    profile = _my_profile(db, current_user)
+    accepted = accept_roster_invite(db, "creators", profile.id, invite_id)
+    if accepted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agency invite not found."
+        )
+    if not accepted:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This profile is already managed by an agency."
+        )
+    db.refresh(profile)
+    return profile
+
+@router.delete("/me/agency-invites/{invite_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def decline_agency_invite(
+    invite_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_onboarded_creator)
+):
+    """Decline an agency invite"""
+    profile = _my_profile(db, current_user)
+    if not decline_roster_invite(db, "creators", profile.id, invite_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agency invite not found."
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 @router.put("/", response_model=CreatorProfileOut)
 async def update_my_creator_profile(
     profile_data: CreatorProfileUpdate,
@@ -114,16 +210,47 @@ async def update_my_creator_profile(
         )
     return profile
 
+@router.post("/batch", response_model=List[CreatorProfilePublic])
+async def get_public_creator_profiles_batch(
+    batch: ProfileBatchRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Get public creator profiles for a list of IDs in one query, in request order.
+    Private, unknown and repeated IDs are left out.
+    Served through the discovery result cache, so pages can trail profile
+    writes by up to DISCOVERY_CACHE_TTL_SECONDS (15 s) in other workers.
+    """
+    profile_ids = list(dict.fromkeys(batch.ids))
+    return cached_discovery_response(
+        request,
+        "creator",
+        {"batch_ids": tuple(profile_ids)},
+        lambda: get_creator_profiles_by_ids(db, profile_ids, public_only=True, columns=PUBLIC_CREATOR_COLUMNS),
+        CreatorProfilePublic
+    )
+
 @router.get("/{profile_id}", response_model=CreatorProfilePublic)
 async def get_public_creator_profile(
     profile_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get a public creator profile by ID.
     Only returns public profiles for discovery by brands.
+    Supports If-None-Match: answers 304 from the profile's version alone.
     """
-    profile = get_creator_profile_by_id(db, profile_id)
+    if request.headers.get("if-none-match"):
+        version = get_creator_profile_version(db, profile_id=profile_id)
+        if version and version.is_public:
+            etag = profile_etag("creator-public", version.id, version.changed_at)
+            if etag_matches(request, etag):
+                return not_modified(etag, PUBLIC_PROFILE_CACHE_CONTROL)
+
+    profile = get_creator_profile_by_id(db, profile_id, columns=PUBLIC_CREATOR_COLUMNS)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -136,34 +263,134 @@ async def get_public_creator_profile(
             detail="This creator profile is private."
         )
     
+    set_cache_headers(
+        response,
+        profile_etag("creator-public", profile.id, profile.updated_at or profile.created_at),
+        PUBLIC_PROFILE_CACHE_CONTROL
+    )
     return profile
 
-@router.get("/", response_model=List[CreatorProfilePublic])
+@router.get("/{profile_id}/similar", response_model=List[SimilarCreator])
+async def get_similar_creator_profiles(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(10, ge=1, le=50, description="Number of similar creators to return")
+):
+    """
+    Creators like this one, by bio, tags and content type.
+    Answered from an in-memory nearest-neighbour index.
+    """
+    profile = get_creator_profile_by_id(db, profile_id, columns=PUBLIC_CREATOR_COLUMNS)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Creator profile not found."
+        )
+
+    if not profile.is_public:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This creator profile is private."
+        )
+
+    return get_similar_creators(db, profile.id, limit)
+
+def _parse_enum_list(value: Optional[str], enum_cls, field: str) -> Optional[list]:
+    """Parse a comma-separated query value into enum members, 400 on unknown values"""
+    if not value:
+        return None
+    try:
+        return [enum_cls(item.strip()) for item in value.split(",") if item.strip()]
+    except ValueError:
+        allowed = ", ".join(member.value for member in enum_cls)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {field}. Allowed values: {allowed}"
+        )
+
+DISCOVERY_INCLUDE_OPTIONS = ("total", "facets")
+
+def _parse_include(value: Optional[str]) -> List[str]:
+    """Parse include=total,facets, 400 on unknown values"""
+    if not value:
+        return []
+    include = sorted({item.strip() for item in value.split(",") if item.strip()})
+    unknown = [item for item in include if item not in DISCOVERY_INCLUDE_OPTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid include. Allowed values: {', '.join(DISCOVERY_INCLUDE_OPTIONS)}"
+        )
+    return include
+
+@router.get("/", response_model=Union[List[CreatorProfilePublic], CreatorDiscoveryPage])
 async def discover_creators(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of profiles to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of profiles to return"),
-    content_type: Optional[str] = Query(None, description="Filter by content type"),
+    content_type: Optional[str] = Query(None, description="Comma-separated content types to filter by (any)"),
     location: Optional[str] = Query(None, description="Filter by location"),
-    tags: Optional[str] = Query(None, description="Comma-separated tags to filter by")
+    tags: Optional[str] = Query(None, description="Comma-separated tags to filter by"),
+    sort_by: CreatorSortEnum = Query(CreatorSortEnum.XP_SCORE, description="Sort order (highest/newest first)"),
+    language: Optional[str] = Query(None, description="Comma-separated languages to filter by (any)"),
+    creator_type: Optional[str] = Query(None, description="Comma-separated creator tiers to filter by (any)"),
+    is_verified: Optional[bool] = Query(None, description="Filter by verification status"),
+    min_xp: Optional[float] = Query(None, ge=0, description="Minimum XP score"),
+    include: Optional[str] = Query(None, description="Comma-separated extras: total, facets"),
+    near: Optional[str] = Query(None, description="City name or 'lat,lon' to search around"),
+    radius_km: float = Query(50, gt=0, le=1000, description="Search radius around near, in km")
 ):
     """
     Discover public creator profiles with filtering.
     Used by brands to find creators for campaigns.
+    Results are served from the discovery result cache when possible, so
+    they can trail profile writes by up to DISCOVERY_CACHE_TTL_SECONDS (15 s)
+    in other workers.
+    With include=total and/or include=facets the response is an object with
+    items, total (total_is_estimate marks planner estimates) and facet counts.
+    near limits results to profiles geocoded within radius_km of a place.
     """
+    include_list = _parse_include(include)
+
     # Parse tags if provided
-    tag_list = tags.split(",") if tags else None
+    tag_list = normalize_tags(tags.split(",")) if tags else None
+    language_list = [item.strip() for item in language.split(",") if item.strip()] if language else None
     
-    profiles = get_public_creator_profiles(
-        db=db,
+    filters = dict(
         skip=skip,
         limit=limit,
-        content_type=content_type,
+        content_type=_parse_enum_list(content_type, ContentTypeEnum, "content_type"),
         location=location,
-        tags=tag_list
+        tags=tag_list,
+        sort_by=sort_by,
+        language=language_list,
+        creator_type=_parse_enum_list(creator_type, CreatorTypeEnum, "creator_type"),
+        is_verified=is_verified,
+        min_xp=min_xp,
+        near=parse_near(near, radius_km)
     )
     
-    return profiles
+    def load():
+        items = get_public_creator_profiles(db=db, **filters)
+        if not include_list:
+            return items
+        criteria = {name: value for name, value in filters.items() if name not in ("skip", "limit", "sort_by")}
+        stats = get_creator_discovery_stats(
+            db,
+            include_total="total" in include_list,
+            include_facets="facets" in include_list,
+            **criteria
+        )
+        return {"items": items, **stats}
+
+    return cached_discovery_response(
+        request,
+        "creator",
+        {**filters, "include": include_list},
+        load,
+        CreatorProfilePublic
+    )
 
 @router.patch("/visibility", response_model=CreatorProfileOut)
 async def update_profile_visibility(
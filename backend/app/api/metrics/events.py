@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.dependencies import require_ingest_token
+from app.crud.metrics import metric_ingest_worker
+from app.schemas.shared.metrics import MetricEventBatch, MetricIngestAccepted
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.post(
+    "/events",
+    response_model=MetricIngestAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_ingest_token)]
+)
+async def ingest_metric_events(batch: MetricEventBatch):
+    """
+    Queue campaign, earnings and spend events for internal producers.
+    Events are summed per profile and applied in batches within a short
+    window. Each event_id is applied at most once, so a producer should
+    resend a whole request on any error.
+    """
+    try:
+        accepted, duplicates = metric_ingest_worker.submit(batch.events)
+    except BufferError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metric ingestion is busy, retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    return {
+        "accepted": accepted,
+        "duplicates": duplicates,
+        "pending": metric_ingest_worker.stats()["pending"]
+    }
\ No newline at end of file
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from app.schemas.shared.search import SearchResults
+from app.crud.search import search_all
+from app.utils.geo import parse_near
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100, description="Name to search for"),
+    limit: int = Query(5, ge=1, le=20, description="Results per profile type"),
+    location: Optional[str] = Query(None, description="Filter by location"),
+    near: Optional[str] = Query(None, description="City name or 'lat,lon' to search around"),
+    radius_km: float = Query(50, gt=0, le=1000, description="Search radius around near, in km"),
+    deadline_ms: Optional[int] = Query(None, ge=50, le=5000, description="Time budget for the search")
+):
+    """
+    Search creators, brands and agencies in one call.
+    The three sources are queried concurrently; any that miss the deadline
+    come back empty and are listed in incomplete.
+    """
+    return await run_in_threadpool(
+        search_all,
+        q,
+        limit=limit,
+        location=location,
+        near=parse_near(near, radius_km),
+        deadline_ms=deadline_ms
+    )
\ No newline at end of file
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.session import get_db
+from app.schemas.shared.search import Suggestion, HandleAvailability
+from app.crud.search import get_suggestions, is_handle_available
+from app.utils.suggest import SUGGEST_KINDS
+
+router = APIRouter(prefix="/suggest", tags=["Search"])
+
+@router.get("/", response_model=List[Suggestion])
+async def suggest(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=25, description="Number of suggestions to return"),
+    kinds: Optional[str] = Query(None, description="Comma-separated kinds: handle, creator, brand, tag")
+):
+    """
+    As-you-type suggestions over creator handles and display names,
+    brand names and tags. Private creators are never suggested.
+    """
+    kind_list = [kind.strip().lower() for kind in kinds.split(",") if kind.strip()] if kinds else None
+    unknown = [kind for kind in kind_list or [] if kind not in SUGGEST_KINDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid kinds: {', '.join(unknown)}. Allowed: {', '.join(SUGGEST_KINDS)}"
+        )
+    return get_suggestions(db, q, limit, kind_list)
+
+@router.get("/handle-available", response_model=HandleAvailability)
+async def handle_available(
+    handle: str = Query(..., min_length=1, max_length=100, description="Handle to check"),
+    db: Session = Depends(get_db)
+):
+    """
+    Check whether a creator handle is free, for onboarding as-you-type.
+    The answer is advisory: a free handle can still be claimed by someone
+    else first, and profile creation then rejects it.
+    """
+    return {"handle": handle, "available": is_handle_available(db, handle)}
\ No newline at end of file
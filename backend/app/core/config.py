@@ -20,6 +20,58 @@ class Settings(BaseSettings):
     # Google OAuth
     GOOGLE_CLIENT_ID: Optional[str] = None
     
+    # Discovery index (in-memory columnar snapshot of public creator profiles)
+    DISCOVERY_INDEX_ENABLED: bool = True
+    DISCOVERY_INDEX_REFRESH_SECONDS: int = 5
+    # Shared mmapped snapshot written by `python -m app.utils.discovery_snapshot`;
+    # when set, workers read it instead of building their own index
+    DISCOVERY_SNAPSHOT_PATH: Optional[str] = None
+    DISCOVERY_SNAPSHOT_CHECK_SECONDS: float = 1.0
+
+    # Discovery result cache (per worker). Profile writes invalidate it through
+    # generation counters: per worker unless DISCOVERY_CACHE_GENERATION_PATH
+    # names a file shared by the host's workers. Writes made elsewhere show up
+    # within the TTL, which matches the discovery Cache-Control max-age.
+    DISCOVERY_CACHE_TTL_SECONDS: float = 15.0
+    DISCOVERY_CACHE_MAX_ENTRIES: int = 1000
+    DISCOVERY_CACHE_GENERATION_PATH: Optional[str] = None
+
+    # "Similar creators" nearest-neighbour index (per worker, polled for changes)
+    SIMILARITY_INDEX_REFRESH_SECONDS: int = 30
+
+    # Typeahead prefix index over handles, names and tags (per worker, polled for changes)
+    SUGGEST_INDEX_REFRESH_SECONDS: int = 5
+
+    # XP leaderboards overall and per content type, creator type and tag (per worker, polled for changes)
+    LEADERBOARD_REFRESH_SECONDS: int = 5
+
+    # Near-duplicate creator detection: MinHash/LSH index over bios, handles and social links (per worker, polled for changes)
+    NEAR_DUPLICATE_INDEX_REFRESH_SECONDS: int = 30
+
+    # Response compression (gzip, plus br/zstd when installed): smaller bodies are sent as-is
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+
+    # Cross-entity /api/search: per-request deadline and connections used for the fan-out
+    SEARCH_DEADLINE_MS: int = 800
+    SEARCH_MAX_WORKERS: int = 6
+
+    # Persisted brand -> creator recommendations kept per brand
+    BRAND_MATCH_LIST_SIZE: int = 100
+
+    # Campaign quotes: how long exchange rates are cached per worker
+    CURRENCY_RATE_CACHE_SECONDS: int = 300
+
+    # Metric event ingestion (per worker): events are summed per profile for up
+    # to the window and applied in one UPDATE per profile type and batch.
+    # Producers authenticate with the X-Ingest-Token header; unset disables ingestion.
+    # A batch that fails MAX_ATTEMPTS times is retried event by event and the
+    # events that still fail are dropped.
+    METRIC_INGEST_TOKEN: Optional[str] = None
+    METRIC_INGEST_WINDOW_MS: int = 250
+    METRIC_INGEST_MAX_BATCH: int = 5000
+    METRIC_INGEST_MAX_PENDING: int = 50000
+    METRIC_INGEST_MAX_ATTEMPTS: int = 3
+
     class Config:
         env_file = "/app/.env"
 
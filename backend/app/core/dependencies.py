@@ -1,5 +1,8 @@
-from fastapi import Depends, HTTPException, status
+import secrets
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.security import get_current_user
 from app.db.session import get_db
 from app.db.models.user import User, UserRole
@@ -77,4 +80,19 @@ def require_onboarded_agency(current_user: User = Depends(require_agency)) -> Us
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Please complete your agency profile onboarding first."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+def require_ingest_token(x_ingest_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency for internal metric producers: the X-Ingest-Token header must
+    match METRIC_INGEST_TOKEN. Returns 503 while no token is configured.
+    """
+    if not settings.METRIC_INGEST_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metric ingestion is not configured."
+        )
+    if not x_ingest_token or not secrets.compare_digest(x_ingest_token, settings.METRIC_INGEST_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid ingest token."
+        )
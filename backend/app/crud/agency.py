@@ -1,8 +1,43 @@
-from sqlalchemy.orm import Session
+import uuid
+from sqlalchemy import Float, any_, func, literal, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from sqlalchemy.orm import Session, joinedload
 from typing import Optional, List
-from app.db.models.agency import AgencyProfile
+from app.db.models.agency import AgencyProfile, AgencyRosterInvite
+from app.db.models.brand import BrandProfile
+from app.db.models.creator import CreatorProfile
 from app.db.models.user import User
-from app.schemas.agency.profile import AgencyProfileCreate, AgencyProfileUpdate
+from app.schemas.brand.profile import BrandProfilePublic
+from app.schemas.creator.profile import CreatorProfilePublic
+from app.schemas.agency.profile import AgencyProfileCreate, AgencyProfileUpdate, AgencyProfilePublic, AgencySortEnum
+from app.utils.discovery_snapshot import discovery_snapshot, search_agency_snapshot
+from app.utils.result_cache import discovery_cache
+from app.utils.geo import geocode_profile, within_radius_clause
+from app.utils.projection import load_schema_columns
+from app.utils.pagination import encode_cursor
+
+# Roster kind -> (profile model, sort column, agency counter kept in step)
+ROSTER_KINDS = {
+    "creators": (CreatorProfile, CreatorProfile.display_name, AgencyProfile.total_creators_managed),
+    "brands": (BrandProfile, BrandProfile.brand_name, AgencyProfile.total_brands_managed),
+}
+# Roster pages render the public schemas
+ROSTER_COLUMNS = {
+    "creators": load_schema_columns(CreatorProfile, CreatorProfilePublic),
+    "brands": load_schema_columns(BrandProfile, BrandProfilePublic),
+}
+
+# Discovery sort columns, each backed by an index ordered DESC NULLS LAST, id
+AGENCY_SORT_COLUMNS = {
+    AgencySortEnum.TOTAL_CAMPAIGNS: AgencyProfile.total_campaigns_run,
+    AgencySortEnum.CREATED_AT: AgencyProfile.created_at,
+}
+
+# Columns public read paths load: what AgencyProfilePublic renders plus the
+# timestamps behind its ETag
+PUBLIC_AGENCY_COLUMNS = load_schema_columns(
+    AgencyProfile, AgencyProfilePublic, AgencyProfile.created_at, AgencyProfile.updated_at
+)
 
 def create_agency_profile(db: Session, user_id: str, data: AgencyProfileCreate) -> AgencyProfile:
     """
@@ -14,6 +49,7 @@ def create_agency_profile(db: Session, user_id: str, data: AgencyProfileCreate)
     
     # Create the profile
     profile = AgencyProfile(user_id=user_id, **profile_data)
+    geocode_profile(profile)
     db.add(profile)
     
     # Mark user as having completed onboarding
@@ -23,15 +59,53 @@ def create_agency_profile(db: Session, user_id: str, data: AgencyProfileCreate)
     
     db.commit()
     db.refresh(profile)
+    discovery_cache.bump("agency")
     return profile
 
 def get_agency_profile_by_user_id(db: Session, user_id: str) -> Optional[AgencyProfile]:
     """Get agency profile by user ID"""
     return db.query(AgencyProfile).filter(AgencyProfile.user_id == user_id).first()
 
-def get_agency_profile_by_id(db: Session, profile_id: str) -> Optional[AgencyProfile]:
-    """Get agency profile by profile ID"""
-    return db.query(AgencyProfile).filter(AgencyProfile.id == profile_id).first()
+def get_agency_profile_by_id(db: Session, profile_id: str, columns=None) -> Optional[AgencyProfile]:
+    """Get agency profile by profile ID; columns is a loader option such as PUBLIC_AGENCY_COLUMNS"""
+    query = db.query(AgencyProfile).filter(AgencyProfile.id == profile_id)
+    if columns is not None:
+        query = query.options(columns)
+    return query.first()
+
+def get_agency_profile_version(
+    db: Session,
+    profile_id: Optional[str] = None,
+    user_id: Optional[str] = None
+):
+    """
+    Id and last-change time of an agency profile, by profile or user ID.
+    Loads no JSON columns; used to answer conditional GETs with 304.
+    """
+    query = db.query(
+        AgencyProfile.id,
+        func.coalesce(AgencyProfile.updated_at, AgencyProfile.created_at).label("changed_at")
+    )
+    if profile_id is not None:
+        query = query.filter(AgencyProfile.id == profile_id)
+    else:
+        query = query.filter(AgencyProfile.user_id == user_id)
+    return query.first()
+
+def get_agency_profiles_by_ids(db: Session, profile_ids: List, columns=None) -> List[AgencyProfile]:
+    """
+    Get agency profiles by ID in one query, returned in the order of profile_ids.
+    ids are bound as one array (id = ANY(:ids)), so the SQL is the same for any count.
+    columns is a loader option such as PUBLIC_AGENCY_COLUMNS.
+    """
+    if not profile_ids:
+        return []
+    query = db.query(AgencyProfile).filter(AgencyProfile.id == any_(literal(list(profile_ids), ARRAY(UUID(as_uuid=True)))))
+    if columns is not None:
+        query = query.options(columns)
+    profiles = query.all()
+    by_id = {profile.id: profile for profile in profiles}
+    return [by_id[profile_id] for profile_id in profile_ids if profile_id in by_id]
 
 def update_agency_profile(db: Session, user_id: str, data: AgencyProfileUpdate) -> Optional[AgencyProfile]:
     """Update agency profile with partial data"""
@@ -43,9 +117,12 @@ def update_agency_profile(db: Session, user_id: str, data: AgencyProfileUpdate)
     update_data = data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(profile, field, value)
+    if "location" in update_data:
+        geocode_profile(profile)
     
     db.commit()
     db.refresh(profile)
+    discovery_cache.bump("agency")
     return profile
 
 def get_public_agency_profiles(
@@ -54,13 +131,22 @@ def get_public_agency_profiles(
     limit: int = 20,
     agency_type: Optional[str] = None,
     industry: Optional[str] = None,
-    location: Optional[str] = None
+    location: Optional[str] = None,
+    sort_by: str = AgencySortEnum.CREATED_AT,
+    near: Optional[tuple] = None
 ) -> List[AgencyProfile]:
     """
     Get public agency profiles for discovery.
     Used by brands and creators to find agency partners.
+    Results are ordered by sort_by (highest/newest first) with id as tie-breaker.
+    near is (lat, lon, radius_km) against the geocoded location.
     """
-    query = db.query(AgencyProfile)
+    snapshot = discovery_snapshot.get() if discovery_snapshot is not None else None
+    if snapshot is not None:
+        page_ids = search_agency_snapshot(snapshot, skip, limit, agency_type, industry, location, sort_by, near)
+        return get_agency_profiles_by_ids(db, page_ids, columns=PUBLIC_AGENCY_COLUMNS)
+
+    query = db.query(AgencyProfile).options(PUBLIC_AGENCY_COLUMNS)
     
     # Apply filters
     if agency_type:
@@ -72,57 +158,203 @@ def get_public_agency_profiles(
     if location:
         query = query.filter(AgencyProfile.location.ilike(f"%{location}%"))
     
+    if near:
+        query = query.filter(within_radius_clause(AgencyProfile, *near))
+
+    sort_column = AGENCY_SORT_COLUMNS[AgencySortEnum(sort_by)]
+    query = query.order_by(sort_column.desc().nulls_last(), AgencyProfile.id)
+
     return query.offset(skip).limit(limit).all()
 
 def update_agency_metrics(
     db: Session, 
     user_id: str, 
-    brands_added: int = 0,
-    creators_added: int = 0,
     campaigns_run: int = 0,
     earnings_added: float = 0.0,
     spend_managed: float = 0.0
 ) -> Optional[AgencyProfile]:
     """
     Update agency performance metrics.
-    Called when agencies manage new clients or complete campaigns.
+    Called when agencies complete campaigns. Roster counts are maintained
+    by accept_roster_invite/remove_roster_member.
+    One atomic UPDATE ... RETURNING, safe under concurrent updates.
     """
-    profile = get_agency_profile_by_user_id(db, user_id)
-    if not profile:
+    statement = update(AgencyProfile) \
+        .where(AgencyProfile.user_id == user_id) \
+        .values(
+            total_campaigns_run=func.coalesce(AgencyProfile.total_campaigns_run, 0) + campaigns_run,
+            total_earnings=func.coalesce(AgencyProfile.total_earnings, 0.0) + earnings_added,
+            total_spend_managed=func.coalesce(AgencyProfile.total_spend_managed, 0.0) + spend_managed
+        ) \
+        .returning(AgencyProfile)
+    profile = db.execute(statement).scalar_one_or_none()
+    if profile is None:
+        db.rollback()
         return None
-    
-    # Update metrics
-    profile.total_brands_managed += brands_added
-    profile.total_creators_managed += creators_added
-    profile.total_campaigns_run += campaigns_run
-    profile.total_earnings += earnings_added
-    profile.total_spend_managed += spend_managed
-    
+    # Detached instances are not expired on commit, so the RETURNING row is kept
+    db.expunge(profile)
     db.commit()
-    db.refresh(profile)
+    discovery_cache.bump("agency")
     return profile
 
 def get_agency_dashboard_stats(db: Session, user_id: str) -> Optional[dict]:
     """
     Get comprehensive dashboard statistics for an agency.
-    Returns key metrics for the agency dashboard UI.
+    Returns key metrics for the agency dashboard UI, computed by one query:
+    roster counts and averages are aggregated from the linked brand and
+    creator rows (lateral subqueries on the roster indexes), ratios in SQL.
     """
-    profile = get_agency_profile_by_user_id(db, user_id)
-    if not profile:
-        return None
-    
-    return {
-        "total_brands": profile.total_brands_managed,
-        "total_creators": profile.total_creators_managed,
-        "total_campaigns": profile.total_campaigns_run,
-        "total_earnings": profile.total_earnings,
-        "total_spend_managed": profile.total_spend_managed,
-        "avg_campaign_value": (
-            profile.total_spend_managed / profile.total_campaigns_run 
-            if profile.total_campaigns_run > 0 else 0
-        ),
-        "commission_rate": (
-            (profile.total_earnings / profile.total_spend_managed * 100) 
-            if profile.total_spend_managed > 0 else 0
+    brand_stats = (
+        select(
+            func.count(BrandProfile.id).label("total_brands"),
+            func.coalesce(func.sum(BrandProfile.total_campaigns), 0).label("roster_brand_campaigns"),
+            func.coalesce(func.sum(BrandProfile.total_spend), 0.0).label("roster_brand_spend"),
+        )
+        .where(BrandProfile.agency_id == AgencyProfile.id)
+        .lateral("brand_stats")
+    )
+    creator_stats = (
+        select(
+            func.count(CreatorProfile.id).label("total_creators"),
+            func.coalesce(func.sum(CreatorProfile.total_campaigns), 0).label("roster_creator_campaigns"),
+            func.coalesce(func.sum(CreatorProfile.total_earnings), 0.0).label("roster_creator_earnings"),
+            func.avg(CreatorProfile.xp_score).label("avg_creator_xp_score"),
+            func.avg(CreatorProfile.avg_engagement_rate).label("avg_creator_engagement_rate"),
         )
-    }
\ No newline at end of file
+        .where(CreatorProfile.agency_id == AgencyProfile.id)
+        .lateral("creator_stats")
+    )
+    campaigns = func.coalesce(AgencyProfile.total_campaigns_run, 0)
+    earnings = func.coalesce(AgencyProfile.total_earnings, 0.0)
+    spend = func.coalesce(AgencyProfile.total_spend_managed, 0.0)
+
+    row = db.query(
+        brand_stats.c.total_brands,
+        creator_stats.c.total_creators,
+        campaigns.label("total_campaigns"),
+        earnings.label("total_earnings"),
+        spend.label("total_spend_managed"),
+        func.coalesce(spend / func.nullif(campaigns, 0, type_=Float), 0.0).label("avg_campaign_value"),
+        func.coalesce(earnings / func.nullif(spend, 0.0, type_=Float) * 100, 0.0).label("commission_rate"),
+        brand_stats.c.roster_brand_campaigns,
+        brand_stats.c.roster_brand_spend,
+        creator_stats.c.roster_creator_campaigns,
+        creator_stats.c.roster_creator_earnings,
+        creator_stats.c.avg_creator_xp_score,
+        creator_stats.c.avg_creator_engagement_rate,
+    ) \
+        .select_from(AgencyProfile) \
+        .join(brand_stats, true()) \
+        .join(creator_stats, true()) \
+        .filter(AgencyProfile.user_id == user_id) \
+        .first()
+    if row is None:
+        return None
+    return dict(row._mapping)
+
+def get_agency_roster(
+    db: Session,
+    agency_id,
+    kind: str,
+    limit: int = 20,
+    after: Optional[tuple] = None
+) -> dict:
+    """
+    One keyset page of an agency's roster ("creators" or "brands"), ordered
+    by name then id. after is the (name, id) of the previous page's last row.
+    Returns {"items", "next_cursor"}; next_cursor is None on the last page.
+    """
+    model, sort_column, _ = ROSTER_KINDS[kind]
+    query = db.query(model).options(ROSTER_COLUMNS[kind]).filter(model.agency_id == agency_id)
+    if kind == "creators":
+        # Pages render the public schema, so private creators stay hidden here
+        # too (they still count towards total_creators_managed)
+        query = query.filter(CreatorProfile.is_public == True)
+    if after is not None:
+        query = query.filter(tuple_(sort_column, model.id) > tuple_(*after))
+    rows = query.order_by(sort_column, model.id).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+    return {"items": items, "next_cursor": next_cursor}
+
+def invite_roster_member(db: Session, agency: AgencyProfile, kind: str, profile_id) -> AgencyRosterInvite:
+    """
+    Record the agency's request to manage a brand/creator. Nothing is linked
+    until the profile's owner accepts; inviting twice keeps the first invite.
+    """
+    db.execute(
+        insert(AgencyRosterInvite)
+        .values(id=uuid.uuid4(), agency_id=agency.id, kind=kind, profile_id=profile_id)
+        .on_conflict_do_nothing(index_elements=["agency_id", "kind", "profile_id"])
+    )
+    db.commit()
+    return db.query(AgencyRosterInvite).filter(
+        AgencyRosterInvite.agency_id == agency.id,
+        AgencyRosterInvite.kind == kind,
+        AgencyRosterInvite.profile_id == profile_id
+    ).first()
+
+def get_roster_invites(db: Session, kind: str, profile_id) -> List[AgencyRosterInvite]:
+    """Pending agency invites for a brand/creator, oldest first"""
+    return db.query(AgencyRosterInvite) \
+        .options(joinedload(AgencyRosterInvite.agency).options(PUBLIC_AGENCY_COLUMNS)) \
+        .filter(AgencyRosterInvite.kind == kind, AgencyRosterInvite.profile_id == profile_id) \
+        .order_by(AgencyRosterInvite.created_at, AgencyRosterInvite.id) \
+        .all()
+
+def _get_roster_invite(db: Session, kind: str, profile_id, invite_id) -> Optional[AgencyRosterInvite]:
+    return db.query(AgencyRosterInvite).filter(
+        AgencyRosterInvite.id == invite_id,
+        AgencyRosterInvite.kind == kind,
+        AgencyRosterInvite.profile_id == profile_id
+    ).first()
+
+def accept_roster_invite(db: Session, kind: str, profile_id, invite_id) -> Optional[bool]:
+    """
+    Accept an invite on behalf of the profile's owner: link the profile to the
+    inviting agency and bump its roster counter in one transaction, then drop
+    the profile's other pending invites. Returns None if the invite does not
+    exist for this profile, False if another agency already manages it.
+    """
+    invite = _get_roster_invite(db, kind, profile_id, invite_id)
+    if invite is None:
+        return None
+    model, _, counter = ROSTER_KINDS[kind]
+    linked = db.query(model) \
+        .filter(model.id == profile_id, model.agency_id.is_(None)) \
+        .update({model.agency_id: invite.agency_id}, synchronize_session=False)
+    if not linked:
+        db.rollback()
+        return False
+    db.query(AgencyProfile).filter(AgencyProfile.id == invite.agency_id) \
+        .update({counter: func.coalesce(counter, 0) + 1}, synchronize_session=False)
+    db.query(AgencyRosterInvite) \
+        .filter(AgencyRosterInvite.kind == kind, AgencyRosterInvite.profile_id == profile_id) \
+        .delete(synchronize_session=False)
+    db.commit()
+    return True
+
+def decline_roster_invite(db: Session, kind: str, profile_id, invite_id) -> bool:
+    """Delete an invite on behalf of the profile's owner; False if there was none"""
+    deleted = db.query(AgencyRosterInvite).filter(
+        AgencyRosterInvite.id == invite_id,
+        AgencyRosterInvite.kind == kind,
+        AgencyRosterInvite.profile_id == profile_id
+    ).delete(synchronize_session=False)
+    db.commit()
+    return bool(deleted)
+
+def remove_roster_member(db: Session, agency: AgencyProfile, kind: str, profile_id) -> bool:
+    """Unlink a brand/creator from the agency; False if it was not on the roster"""
+    model, _, counter = ROSTER_KINDS[kind]
+    unlinked = db.query(model) \
+        .filter(model.id == profile_id, model.agency_id == agency.id) \
+        .update({model.agency_id: None}, synchronize_session=False)
+    if unlinked:
+        db.query(AgencyProfile).filter(AgencyProfile.id == agency.id) \
+            .update({counter: func.greatest(func.coalesce(counter, 0) - 1, 0)}, synchronize_session=False)
+    db.commit()
+    return bool(unlinked)
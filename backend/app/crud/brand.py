@@ -1,8 +1,34 @@
+from sqlalchemy import any_, func, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from app.db.models.brand import BrandProfile
+from app.db.models.brand import BrandProfile, BrandCreatorMatch
+from app.db.models.creator import CreatorProfile
 from app.db.models.user import User
-from app.schemas.brand.profile import BrandProfileCreate, BrandProfileUpdate
+from app.schemas.brand.profile import BrandProfileCreate, BrandProfileUpdate, BrandProfilePublic, BrandSortEnum
+from app.utils.discovery_snapshot import discovery_snapshot, search_brand_snapshot
+from app.utils.result_cache import discovery_cache
+from app.utils.geo import geocode_profile, within_radius_clause
+from app.utils.projection import load_schema_columns
+from app.utils.suggest import suggest_index
+from app.crud.creator import PUBLIC_CREATOR_COLUMNS, _mark_matches_built, rebuild_brand_matches
+
+# Discovery sort columns, each backed by an index ordered DESC NULLS LAST, id
+BRAND_SORT_COLUMNS = {
+    BrandSortEnum.TOTAL_CAMPAIGNS: BrandProfile.total_campaigns,
+    BrandSortEnum.CREATED_AT: BrandProfile.created_at,
+}
+
+# Columns public read paths load: what BrandProfilePublic renders plus the
+# timestamps behind its ETag
+PUBLIC_BRAND_COLUMNS = load_schema_columns(
+    BrandProfile, BrandProfilePublic, BrandProfile.created_at, BrandProfile.updated_at
+)
+
+def _index_brand_profile(profile: BrandProfile) -> None:
+    """Make a local write visible to this worker's typeahead index right away"""
+    if suggest_index.last_refresh:
+        suggest_index.apply_brands([profile])
 
 def create_brand_profile(db: Session, user_id: str, data: BrandProfileCreate) -> BrandProfile:
     """
@@ -14,6 +40,7 @@ def create_brand_profile(db: Session, user_id: str, data: BrandProfileCreate) ->
     
     # Create the profile
     profile = BrandProfile(user_id=user_id, **profile_data)
+    geocode_profile(profile)
     db.add(profile)
     
     # Mark user as having completed onboarding
@@ -23,15 +50,56 @@ def create_brand_profile(db: Session, user_id: str, data: BrandProfileCreate) ->
     
     db.commit()
     db.refresh(profile)
+    discovery_cache.bump("brand")
+    _index_brand_profile(profile)
+    if profile.campaign_preferences or profile.budget_range:
+        rebuild_brand_matches(db, profile.id, profile.campaign_preferences, profile.budget_range)
     return profile
 
 def get_brand_profile_by_user_id(db: Session, user_id: str) -> Optional[BrandProfile]:
     """Get brand profile by user ID"""
     return db.query(BrandProfile).filter(BrandProfile.user_id == user_id).first()
 
-def get_brand_profile_by_id(db: Session, profile_id: str) -> Optional[BrandProfile]:
-    """Get brand profile by profile ID"""
-    return db.query(BrandProfile).filter(BrandProfile.id == profile_id).first()
+def get_brand_profile_by_id(db: Session, profile_id: str, columns=None) -> Optional[BrandProfile]:
+    """Get brand profile by profile ID; columns is a loader option such as PUBLIC_BRAND_COLUMNS"""
+    query = db.query(BrandProfile).filter(BrandProfile.id == profile_id)
+    if columns is not None:
+        query = query.options(columns)
+    return query.first()
+
+def get_brand_profile_version(
+    db: Session,
+    profile_id: Optional[str] = None,
+    user_id: Optional[str] = None
+):
+    """
+    Id and last-change time of a brand profile, by profile or user ID.
+    Loads no JSON columns; used to answer conditional GETs with 304.
+    """
+    query = db.query(
+        BrandProfile.id,
+        func.coalesce(BrandProfile.updated_at, BrandProfile.created_at).label("changed_at")
+    )
+    if profile_id is not None:
+        query = query.filter(BrandProfile.id == profile_id)
+    else:
+        query = query.filter(BrandProfile.user_id == user_id)
+    return query.first()
+
+def get_brand_profiles_by_ids(db: Session, profile_ids: List, columns=None) -> List[BrandProfile]:
+    """
+    Get brand profiles by ID in one query, returned in the order of profile_ids.
+    ids are bound as one array (id = ANY(:ids)), so the SQL is the same for any count.
+    columns is a loader option such as PUBLIC_BRAND_COLUMNS.
+    """
+    if not profile_ids:
+        return []
+    query = db.query(BrandProfile).filter(BrandProfile.id == any_(literal(list(profile_ids), ARRAY(UUID(as_uuid=True)))))
+    if columns is not None:
+        query = query.options(columns)
+    profiles = query.all()
+    by_id = {profile.id: profile for profile in profiles}
+    return [by_id[profile_id] for profile_id in profile_ids if profile_id in by_id]
 
 def update_brand_profile(db: Session, user_id: str, data: BrandProfileUpdate) -> Optional[BrandProfile]:
     """Update brand profile with partial data"""
@@ -43,24 +111,72 @@ def update_brand_profile(db: Session, user_id: str, data: BrandProfileUpdate) ->
     update_data = data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(profile, field, value)
+    if "location" in update_data:
+        geocode_profile(profile)
     
     db.commit()
     db.refresh(profile)
+    discovery_cache.bump("brand")
+    _index_brand_profile(profile)
+    if "campaign_preferences" in update_data or "budget_range" in update_data:
+        rebuild_brand_matches(db, profile.id, profile.campaign_preferences, profile.budget_range)
     return profile
 
+def get_brand_matches(db: Session, brand: BrandProfile, limit: int = 20) -> List[dict]:
+    """
+    Read a brand's persisted creator recommendations, best first, in one
+    query on the (brand_id, score) index. A list never built is built on
+    first read; the reader that claims the build runs it, and concurrent
+    readers get an empty list until it lands. A built list that is empty
+    stays empty without rebuilding.
+    """
+    query = db.query(BrandCreatorMatch, CreatorProfile) \
+        .join(CreatorProfile, CreatorProfile.id == BrandCreatorMatch.creator_id) \
+        .filter(BrandCreatorMatch.brand_id == brand.id, CreatorProfile.is_public == True) \
+        .options(PUBLIC_CREATOR_COLUMNS) \
+        .order_by(BrandCreatorMatch.score.desc(), BrandCreatorMatch.creator_id) \
+        .limit(limit)
+    rows = query.all()
+    if brand.matches_built_at is None and (brand.campaign_preferences or brand.budget_range):
+        claimed = _mark_matches_built(db, brand.id, only_unbuilt=True)
+        db.commit()
+        if claimed:
+            try:
+                rebuild_brand_matches(db, brand.id, brand.campaign_preferences, brand.budget_range)
+            except Exception:
+                # Let the next read retry the build
+                db.rollback()
+                _mark_matches_built(db, brand.id, built=False)
+                db.commit()
+                raise
+            rows = query.all()
+    return [
+        {"creator": creator, "score": match.score, "components": match.components or {}}
+        for match, creator in rows
+    ]
+
 def get_public_brand_profiles(
     db: Session, 
     skip: int = 0, 
     limit: int = 20,
     industry: Optional[str] = None,
     location: Optional[str] = None,
-    brand_type: Optional[str] = None
+    brand_type: Optional[str] = None,
+    sort_by: str = BrandSortEnum.CREATED_AT,
+    near: Optional[tuple] = None
 ) -> List[BrandProfile]:
     """
     Get public brand profiles for discovery.
     Used by creators and agencies to find potential brand partners.
+    Results are ordered by sort_by (highest/newest first) with id as tie-breaker.
+    near is (lat, lon, radius_km) against the geocoded location.
     """
-    query = db.query(BrandProfile)
+    snapshot = discovery_snapshot.get() if discovery_snapshot is not None else None
+    if snapshot is not None:
+        page_ids = search_brand_snapshot(snapshot, skip, limit, industry, location, brand_type, sort_by, near)
+        return get_brand_profiles_by_ids(db, page_ids, columns=PUBLIC_BRAND_COLUMNS)
+
+    query = db.query(BrandProfile).options(PUBLIC_BRAND_COLUMNS)
     
     # Apply filters
     if industry:
@@ -69,9 +185,15 @@ def get_public_brand_profiles(
     if location:
         query = query.filter(BrandProfile.location.ilike(f"%{location}%"))
     
+    if near:
+        query = query.filter(within_radius_clause(BrandProfile, *near))
+
     if brand_type:
         query = query.filter(BrandProfile.brand_type == brand_type)
     
+    sort_column = BRAND_SORT_COLUMNS[BrandSortEnum(sort_by)]
+    query = query.order_by(sort_column.desc().nulls_last(), BrandProfile.id)
+
     return query.offset(skip).limit(limit).all()
 
 def update_brand_metrics(
@@ -83,17 +205,24 @@ def update_brand_metrics(
     """
     Update brand performance metrics.
     Called when campaigns are launched or completed.
+    One atomic UPDATE ... RETURNING, safe under concurrent updates.
     """
-    profile = get_brand_profile_by_user_id(db, user_id)
-    if not profile:
+    statement = update(BrandProfile) \
+        .where(BrandProfile.user_id == user_id) \
+        .values(
+            total_campaigns=func.coalesce(BrandProfile.total_campaigns, 0) + campaigns_launched,
+            total_spend=func.coalesce(BrandProfile.total_spend, 0.0) + spend_added
+        ) \
+        .returning(BrandProfile)
+    profile = db.execute(statement).scalar_one_or_none()
+    if profile is None:
+        db.rollback()
         return None
-    
-    # Update metrics
-    profile.total_campaigns += campaigns_launched
-    profile.total_spend += spend_added
-    
+    # Detached instances are not expired on commit, so the RETURNING row is kept
+    db.expunge(profile)
     db.commit()
-    db.refresh(profile)
+    discovery_cache.bump("brand")
+    _index_brand_profile(profile)
     return profile
 
 def search_brands_by_budget(
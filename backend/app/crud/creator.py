@@ -1,8 +1,211 @@
+import uuid
+from collections import Counter
+from sqlalchemy import Float, Numeric, String, Text, any_, case, cast, delete, func, literal, or_, select, true, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from typing import Optional, List
-from app.db.models.creator import CreatorProfile
+from app.db.models.creator import CreatorProfile, CreatorFacetCount, CreatorDuplicateFlag, ContentTypeEnum, CreatorTypeEnum
+from app.db.models.brand import BrandProfile, BrandCreatorMatch
 from app.db.models.user import User
-from app.schemas.creator.profile import CreatorProfileCreate, CreatorProfileUpdate
+from app.core.config import settings
+from app.schemas.creator.profile import CreatorProfileCreate, CreatorProfileUpdate, CreatorProfilePublic, CreatorSortEnum
+from app.utils.discovery_index import CreatorDiscoveryIndex, INDEXED_COLUMNS, creator_discovery_index
+from app.utils.discovery_snapshot import discovery_snapshot
+from app.utils.result_cache import discovery_cache
+from app.utils.matching import MATCH_BATCH_ROWS, TopKMatches
+from app.utils.similarity import creator_similarity_index
+from app.utils.geo import geocode_profile, within_radius_clause
+from app.utils.suggest import suggest_index
+from app.utils.leaderboard import creator_leaderboards
+from app.utils.near_duplicates import near_duplicate_index
+from app.utils.projection import load_schema_columns
+from app.utils.tags import normalize_tags
+
+# Discovery sort columns. Each one has a matching partial index on
+# is_public = true (see app/db/models/creator.py), ordered DESC NULLS LAST, id.
+CREATOR_SORT_COLUMNS = {
+    CreatorSortEnum.XP_SCORE: CreatorProfile.xp_score,
+    CreatorSortEnum.AVG_ENGAGEMENT_RATE: CreatorProfile.avg_engagement_rate,
+    CreatorSortEnum.TOTAL_CAMPAIGNS: CreatorProfile.total_campaigns,
+    CreatorSortEnum.CREATED_AT: CreatorProfile.created_at,
+}
+
+CREATOR_SORT_INDEXES = {
+    CreatorSortEnum.XP_SCORE: "ix_creator_profiles_public_xp_score",
+    CreatorSortEnum.AVG_ENGAGEMENT_RATE: "ix_creator_profiles_public_engagement",
+    CreatorSortEnum.TOTAL_CAMPAIGNS: "ix_creator_profiles_public_total_campaigns",
+    CreatorSortEnum.CREATED_AT: "ix_creator_profiles_public_created_at",
+}
+
+# Composite partial indexes leading with an IN-list filter column, then xp_score
+CREATOR_FILTER_INDEXES = {
+    "content_type": "ix_creator_profiles_public_content_type_xp",
+    "creator_type": "ix_creator_profiles_public_creator_type_xp",
+    "language": "ix_creator_profiles_public_language_xp",
+}
+
+# Estimated fraction of public profiles matching one value of each filter.
+# Only the relative order matters: it decides predicate order and the driving index.
+CREATOR_FILTER_SELECTIVITY = {
+    "is_verified": 0.05,
+    "tags": 0.1,
+    "content_type": 0.2,
+    "language": 0.2,
+    "creator_type": 0.25,
+    "min_xp": 0.5,
+    "location": 0.5,
+    # At NEAR_REFERENCE_RADIUS_KM; scales with the area of the circle
+    "near": 0.05,
+}
+NEAR_REFERENCE_RADIUS_KM = 50.0
+
+# Below this estimated selectivity the GIN tag index drives the query
+BITMAP_SELECTIVITY_THRESHOLD = 0.02
+
+CREATOR_FILTER_CLAUSES = {
+    "content_type": lambda values: CreatorProfile.content_type.in_(values),
+    "creator_type": lambda values: CreatorProfile.creator_type.in_(values),
+    "language": lambda values: CreatorProfile.language.in_(values),
+    "is_verified": lambda value: CreatorProfile.is_verified == value,
+    "min_xp": lambda value: CreatorProfile.xp_score >= value,
+    # Array containment (@>) so the GIN index can be used
+    "tags": lambda values: CreatorProfile.tags.contains(values),
+    "location": lambda value: CreatorProfile.location.ilike(f"%{value}%"),
+    # (lat, lon, radius_km): geohash prefix ranges plus an exact distance check
+    "near": lambda value: within_radius_clause(CreatorProfile, *value),
+}
+
+# Filters served by their own unordered index; they drive the query when
+# selective enough to beat walking an ordered index
+CREATOR_BITMAP_INDEXES = {
+    "tags": "ix_creator_profiles_public_tags",
+    "near": "ix_creator_profiles_public_geohash",
+}
+
+# Facets reported by discovery stats; ("total", "") counts all public profiles
+CREATOR_FACETS = ("content_type", "creator_type", "location", "tag")
+
+# Above this estimated selectivity a filtered total comes from the planner's
+# row estimate instead of an exact COUNT(*) over most of the table
+COUNT_ESTIMATE_SELECTIVITY = 0.2
+
+# Profile fields that feed the XP score through completeness (or directly);
+# editing one marks the score stale
+XP_PROFILE_FIELDS = {"bio", "profile_image_url", "platforms", "pricing_info", "tags", "location", "is_verified"}
+
+# Profile fields the brand match score reads (CreatorDiscoveryIndex.match);
+# writes touching none of them leave every brand's list as it was
+MATCH_PROFILE_FIELDS = frozenset({"tags", "creator_type", "content_type", "platforms", "pricing_info", "xp_score", "is_public"})
+
+# Columns public read paths load: what CreatorProfilePublic renders, plus
+# visibility and the timestamps behind its ETag. pricing_info, social_links,
+# portfolio_items and the other owner-only columns are never fetched.
+PUBLIC_CREATOR_COLUMNS = load_schema_columns(
+    CreatorProfile, CreatorProfilePublic,
+    CreatorProfile.is_public, CreatorProfile.created_at, CreatorProfile.updated_at
+)
+
+def _creator_search_index(db: Session):
+    """In-memory index answering discovery for this worker, or None to use SQL"""
+    if discovery_snapshot is not None:
+        # None until the snapshot builder has written its first snapshot
+        discovery_snapshot.get()
+        return discovery_snapshot.creator_index
+    if settings.DISCOVERY_INDEX_ENABLED:
+        creator_discovery_index.refresh_if_stale(db, settings.DISCOVERY_INDEX_REFRESH_SECONDS)
+        return creator_discovery_index
+    return None
+
+def _index_creator_profile(profile: CreatorProfile) -> None:
+    """Make a local write visible to this worker's in-process indexes right away"""
+    if discovery_snapshot is None and settings.DISCOVERY_INDEX_ENABLED:
+        creator_discovery_index.apply_rows([profile])
+    if creator_similarity_index.last_refresh:
+        creator_similarity_index.apply_rows([profile])
+    if suggest_index.last_refresh:
+        suggest_index.apply_creators([profile])
+    if creator_leaderboards.last_refresh:
+        creator_leaderboards.apply_rows([profile])
+    if near_duplicate_index.last_refresh:
+        near_duplicate_index.apply_rows([profile])
+
+# Fields whose text the near-duplicate check compares
+DUPLICATE_CHECK_FIELDS = frozenset({"bio", "handle", "social_links"})
+
+def _flag_near_duplicates(db: Session, profile: CreatorProfile) -> int:
+    """
+    Replace the profile's duplicate flags with the indexed profiles it nearly
+    duplicates (in the caller's transaction). One LSH lookup, so the cost
+    does not grow with the number of creators.
+    """
+    near_duplicate_index.refresh_if_stale(db, settings.NEAR_DUPLICATE_INDEX_REFRESH_SECONDS)
+    matches = near_duplicate_index.find(profile.bio, profile.handle, profile.social_links, exclude=profile.id)
+    db.query(CreatorDuplicateFlag) \
+        .filter(CreatorDuplicateFlag.creator_id == profile.id) \
+        .delete(synchronize_session=False)
+    if matches:
+        db.execute(insert(CreatorDuplicateFlag).values([
+            {"creator_id": profile.id, "duplicate_of_id": duplicate_of_id, "similarity": similarity}
+            for duplicate_of_id, similarity in matches
+        ]))
+    return len(matches)
+
+def _creator_facet_keys(profile: CreatorProfile) -> List[tuple]:
+    """(facet, value) pairs a profile contributes to the facet counts"""
+    if not profile.is_public:
+        return []
+    keys = [("total", "")]
+    if profile.content_type is not None:
+        keys.append(("content_type", ContentTypeEnum(profile.content_type).value))
+    if profile.creator_type is not None:
+        keys.append(("creator_type", CreatorTypeEnum(profile.creator_type).value))
+    if profile.location:
+        keys.append(("location", profile.location))
+    keys.extend(("tag", tag) for tag in sorted(set(profile.tags or [])))
+    return keys
+
+def _apply_creator_facet_deltas(db: Session, before: List[tuple], after: List[tuple]) -> None:
+    """Add the difference between two facet key sets to the counts table (in the caller's transaction)"""
+    delta = Counter(after)
+    delta.subtract(before)
+    rows = [
+        {"facet": facet, "value": value, "count": change}
+        for (facet, value), change in delta.items()
+        if change
+    ]
+    if not rows:
+        return
+    statement = insert(CreatorFacetCount).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[CreatorFacetCount.facet, CreatorFacetCount.value],
+        set_={"count": CreatorFacetCount.count + statement.excluded.count}
+    ))
+
+def rebuild_creator_facet_counts(db: Session) -> int:
+    """
+    Recompute the facet counts table from creator_profiles.
+    For initial backfill or repair; normal writes keep it up to date.
+    """
+    counts = Counter()
+    public = db.query(
+        CreatorProfile.is_public,
+        CreatorProfile.content_type,
+        CreatorProfile.creator_type,
+        CreatorProfile.location,
+        CreatorProfile.tags
+    ).filter(CreatorProfile.is_public == True)
+    for row in public.yield_per(5000):
+        counts.update(_creator_facet_keys(row))
+
+    db.query(CreatorFacetCount).delete()
+    db.add_all(
+        CreatorFacetCount(facet=facet, value=value, count=count)
+        for (facet, value), count in counts.items()
+    )
+    db.commit()
+    return len(counts)
 
 def create_creator_profile(db: Session, user_id: str, data: CreatorProfileCreate) -> CreatorProfile:
     """
@@ -11,9 +214,11 @@ def create_creator_profile(db: Session, user_id: str, data: CreatorProfileCreate
     """
     # Convert Pydantic model to dict, handling nested models
     profile_data = data.dict()
+    profile_data["tags"] = normalize_tags(profile_data.get("tags"))
     
     # Create the profile
     profile = CreatorProfile(user_id=user_id, **profile_data)
+    geocode_profile(profile)
     db.add(profile)
     
     # Mark user as having completed onboarding
@@ -21,64 +226,598 @@ def create_creator_profile(db: Session, user_id: str, data: CreatorProfileCreate
     if user:
         user.has_completed_onboarding = True
     
+    # Flush first so column defaults (is_public) are applied before counting
+    db.flush()
+    _apply_creator_facet_deltas(db, [], _creator_facet_keys(profile))
+    _flag_near_duplicates(db, profile)
     db.commit()
     db.refresh(profile)
+    discovery_cache.bump("creator")
+    _index_creator_profile(profile)
+    refresh_creator_matches(db, [profile])
     return profile
 
 def get_creator_profile_by_user_id(db: Session, user_id: str) -> Optional[CreatorProfile]:
     """Get creator profile by user ID"""
     return db.query(CreatorProfile).filter(CreatorProfile.user_id == user_id).first()
 
-def get_creator_profile_by_id(db: Session, profile_id: str) -> Optional[CreatorProfile]:
-    """Get creator profile by profile ID"""
-    return db.query(CreatorProfile).filter(CreatorProfile.id == profile_id).first()
+def get_creator_profile_by_id(db: Session, profile_id: str, columns=None) -> Optional[CreatorProfile]:
+    """Get creator profile by profile ID; columns is a loader option such as PUBLIC_CREATOR_COLUMNS"""
+    query = db.query(CreatorProfile).filter(CreatorProfile.id == profile_id)
+    if columns is not None:
+        query = query.options(columns)
+    return query.first()
 
 def get_creator_profile_by_handle(db: Session, handle: str) -> Optional[CreatorProfile]:
     """Get creator profile by unique handle"""
     return db.query(CreatorProfile).filter(CreatorProfile.handle == handle).first()
 
+def get_creator_profile_version(
+    db: Session,
+    profile_id: Optional[str] = None,
+    user_id: Optional[str] = None
+):
+    """
+    Id, visibility and last-change time of a creator profile, by profile or user ID.
+    Loads no JSON columns; used to answer conditional GETs with 304.
+    """
+    query = db.query(
+        CreatorProfile.id, CreatorProfile.is_public,
+        func.coalesce(CreatorProfile.updated_at, CreatorProfile.created_at).label("changed_at")
+    )
+    if profile_id is not None:
+        query = query.filter(CreatorProfile.id == profile_id)
+    else:
+        query = query.filter(CreatorProfile.user_id == user_id)
+    return query.first()
+
+def get_creator_profiles_by_ids(db: Session, profile_ids: List, public_only: bool = False, columns=None) -> List[CreatorProfile]:
+    """
+    Get creator profiles by ID in one query, returned in the order of profile_ids.
+    ids are bound as one array (id = ANY(:ids)), so the SQL is the same for any count.
+    columns is a loader option such as PUBLIC_CREATOR_COLUMNS.
+    """
+    if not profile_ids:
+        return []
+    query = db.query(CreatorProfile).filter(CreatorProfile.id == any_(literal(list(profile_ids), ARRAY(UUID(as_uuid=True)))))
+    if columns is not None:
+        query = query.options(columns)
+    if public_only:
+        query = query.filter(CreatorProfile.is_public == True)
+    profiles = query.all()
+    by_id = {profile.id: profile for profile in profiles}
+    return [by_id[profile_id] for profile_id in profile_ids if profile_id in by_id]
+
 def update_creator_profile(db: Session, user_id: str, data: CreatorProfileUpdate) -> Optional[CreatorProfile]:
     """Update creator profile with partial data"""
     profile = get_creator_profile_by_user_id(db, user_id)
     if not profile:
         return None
     
+    facets_before = _creator_facet_keys(profile)
+
     # Update only provided fields
     update_data = data.dict(exclude_unset=True)
+    if "tags" in update_data:
+        update_data["tags"] = normalize_tags(update_data["tags"])
     for field, value in update_data.items():
         setattr(profile, field, value)
+    if "location" in update_data:
+        geocode_profile(profile)
+    if XP_PROFILE_FIELDS.intersection(update_data):
+        # Completeness feeds the XP score; the recompute job picks this up
+        profile.xp_dirty = True
     
+    _apply_creator_facet_deltas(db, facets_before, _creator_facet_keys(profile))
+    if DUPLICATE_CHECK_FIELDS.intersection(update_data):
+        _flag_near_duplicates(db, profile)
     db.commit()
     db.refresh(profile)
+    discovery_cache.bump("creator")
+    _index_creator_profile(profile)
+    if MATCH_PROFILE_FIELDS.intersection(update_data):
+        refresh_creator_matches(db, [profile])
     return profile
 
+def _creator_filter_selectivity(name: str, value) -> float:
+    """Estimated fraction of public profiles kept by one discovery filter"""
+    base = CREATOR_FILTER_SELECTIVITY[name]
+    if name == "is_verified":
+        return base if value else 1 - base
+    if name == "tags":
+        # Every tag must match
+        return base ** len(value)
+    if name == "near":
+        return min(1.0, base * (value[2] / NEAR_REFERENCE_RADIUS_KM) ** 2)
+    if isinstance(value, list):
+        return min(1.0, base * len(value))
+    return base
+
+def plan_creator_query(filters: dict, sort_by: str = CreatorSortEnum.XP_SCORE) -> dict:
+    """
+    Plan a creator discovery query.
+    Orders the active filters from most to least selective and picks the index
+    that drives the scan. Strategies:
+    - "index_scan": one ordered index serves filters and sort, stops after N rows
+    - "merge": IN-list on a composite index, one ordered scan per value, merged
+    - "bitmap": GIN tag containment or geohash ranges, then sort the (few) matches
+    """
+    sort_by = CreatorSortEnum(sort_by)
+    active = {name: value for name, value in filters.items() if value not in (None, [], "")}
+    predicates = sorted(active, key=lambda name: (_creator_filter_selectivity(name, active[name]), name))
+
+    plan = {
+        "predicates": predicates,
+        "index": CREATOR_SORT_INDEXES[sort_by],
+        "strategy": "index_scan",
+        "driving_filter": None,
+    }
+
+    # Composite indexes are ordered by xp_score, so they only help that sort
+    if sort_by == CreatorSortEnum.XP_SCORE:
+        for name in predicates:
+            if name in CREATOR_FILTER_INDEXES:
+                plan["index"] = CREATOR_FILTER_INDEXES[name]
+                plan["driving_filter"] = name
+                plan["strategy"] = "merge" if len(active[name]) > 1 else "index_scan"
+                break
+            if name == "is_verified" and active[name]:
+                plan["index"] = "ix_creator_profiles_public_verified_xp"
+                plan["driving_filter"] = name
+                break
+
+    # A very selective tag set or small radius beats walking an ordered index
+    for name, index_name in CREATOR_BITMAP_INDEXES.items():
+        if name not in active:
+            continue
+        selectivity = _creator_filter_selectivity(name, active[name])
+        driving = plan["driving_filter"]
+        driving_selectivity = _creator_filter_selectivity(driving, active[driving]) if driving else 1.0
+        if selectivity <= BITMAP_SELECTIVITY_THRESHOLD and selectivity < driving_selectivity:
+            plan["index"] = index_name
+            plan["driving_filter"] = name
+            plan["strategy"] = "bitmap"
+
+    return plan
+
+def build_public_creator_query(
+    db: Session,
+    skip: int = 0,
+    limit: int = 20,
+    filters: Optional[dict] = None,
+    sort_by: str = CreatorSortEnum.XP_SCORE
+):
+    """
+    Build the discovery query for public creator profiles following plan_creator_query.
+    Predicates are emitted most selective first, matching the chosen index.
+    """
+    filters = filters or {}
+    plan = plan_creator_query(filters, sort_by)
+
+    # Must match the index definitions exactly for a top-N index scan
+    sort_column = CREATOR_SORT_COLUMNS[CreatorSortEnum(sort_by)]
+    order = (sort_column.desc().nulls_last(), CreatorProfile.id)
+
+    if plan["strategy"] == "merge":
+        # One ordered scan per IN-list value, each stopping after skip + limit rows
+        driving = plan["driving_filter"]
+        other_clauses = [
+            CREATOR_FILTER_CLAUSES[name](filters[name])
+            for name in plan["predicates"] if name != driving
+        ]
+        branches = []
+        for value in filters[driving]:
+            branch = (
+                select(CreatorProfile.id)
+                .where(
+                    CreatorProfile.is_public == True,
+                    CREATOR_FILTER_CLAUSES[driving]([value]),
+                    *other_clauses
+                )
+                .order_by(*order)
+                .limit(skip + limit)
+                .subquery()
+            )
+            branches.append(select(branch.c.id))
+        query = db.query(CreatorProfile).filter(CreatorProfile.id.in_(union_all(*branches)))
+    else:
+        query = db.query(CreatorProfile).filter(CreatorProfile.is_public == True)
+        for name in plan["predicates"]:
+            query = query.filter(CREATOR_FILTER_CLAUSES[name](filters[name]))
+
+    return query.options(PUBLIC_CREATOR_COLUMNS).order_by(*order).offset(skip).limit(limit)
+
 def get_public_creator_profiles(
     db: Session, 
     skip: int = 0, 
     limit: int = 20,
-    content_type: Optional[str] = None,
+    content_type: Optional[List[ContentTypeEnum]] = None,
     location: Optional[str] = None,
-    tags: Optional[List[str]] = None
+    tags: Optional[List[str]] = None,
+    sort_by: str = CreatorSortEnum.XP_SCORE,
+    language: Optional[List[str]] = None,
+    creator_type: Optional[List[CreatorTypeEnum]] = None,
+    is_verified: Optional[bool] = None,
+    min_xp: Optional[float] = None,
+    near: Optional[tuple] = None
 ) -> List[CreatorProfile]:
     """
     Get public creator profiles for discovery with filtering.
     Used by brands to find creators for campaigns.
+    List filters match any of the given values; tags must all match.
+    near is (lat, lon, radius_km) against the geocoded location.
+    Results are ordered by sort_by (highest/newest first) with id as tie-breaker.
+    """
+    filters = {
+        "content_type": content_type,
+        "creator_type": creator_type,
+        "language": language,
+        "is_verified": is_verified,
+        "min_xp": min_xp,
+        "tags": tags,
+        "location": location,
+        "near": near,
+    }
+
+    index = _creator_search_index(db)
+    if index is not None:
+        # Filter and rank in memory, then load only the final page
+        page_ids = index.search(filters, sort_by, skip, limit)
+        return [profile for profile in get_creator_profiles_by_ids(db, page_ids, columns=PUBLIC_CREATOR_COLUMNS) if profile.is_public]
+
+    return build_public_creator_query(db, skip, limit, filters, sort_by).all()
+
+def _match_creators_in_batches(db: Session, preferences: Optional[dict], budget_range: Optional[dict], limit: int) -> List[tuple]:
+    """
+    Matching without a resident index: stream public profiles in batches,
+    score each batch through a throwaway index and merge the batch winners.
+    Memory stays bounded by the batch size.
+    """
+    top = TopKMatches(limit)
+    statement = select(*INDEXED_COLUMNS).where(CreatorProfile.is_public == True)
+    result = db.execute(statement.execution_options(yield_per=MATCH_BATCH_ROWS))
+    for partition in result.partitions():
+        batch = CreatorDiscoveryIndex(capacity=len(partition))
+        batch.apply_rows(partition)
+        matches = batch.match(preferences, budget_range, limit)
+        top.push(
+            [score for _, score, _ in matches],
+            lambda i: matches[i][0].int,
+            matches
+        )
+    return [match for _, match in top.results()]
+
+def _match_creators(db: Session, preferences: Optional[dict], budget_range: Optional[dict], limit: int) -> List[tuple]:
+    """Top (creator id, score, components) for a brand's preferences"""
+    index = _creator_search_index(db)
+    if index is not None:
+        return index.match(preferences, budget_range, limit)
+    return _match_creators_in_batches(db, preferences, budget_range, limit)
+
+def get_similar_creators(db: Session, profile_id, limit: int = 10) -> List[dict]:
     """
+    Public creators most similar to profile_id by bio, tags and content type.
+    Returns [{"creator", "similarity"}], most similar first.
+    """
+    creator_similarity_index.refresh_if_stale(db, settings.SIMILARITY_INDEX_REFRESH_SECONDS)
+    neighbours = creator_similarity_index.similar(profile_id, limit)
+    profiles = {profile.id: profile for profile in get_creator_profiles_by_ids(
+        db, [creator_id for creator_id, _ in neighbours], columns=PUBLIC_CREATOR_COLUMNS
+    )}
+    return [
+        {"creator": profiles[creator_id], "similarity": similarity}
+        for creator_id, similarity in neighbours
+        if creator_id in profiles and profiles[creator_id].is_public
+    ]
+
+def get_creator_leaderboard(
+    db: Session,
+    board: tuple,
+    offset: int = 0,
+    limit: int = 20,
+    creator_id=None
+) -> dict:
+    """
+    One page of an XP leaderboard, plus creator_id's own rank when given.
+    Ranks come from the in-memory leaderboards; profiles are loaded in one query.
+    """
+    creator_leaderboards.refresh_if_stale(db, settings.LEADERBOARD_REFRESH_SECONDS)
+    total, entries = creator_leaderboards.top(board, offset, limit)
+    profiles = {
+        str(profile.id): profile
+        for profile in get_creator_profiles_by_ids(
+            db, [uuid.UUID(ref) for _, ref, _ in entries], public_only=True, columns=PUBLIC_CREATOR_COLUMNS
+        )
+    }
+    me = creator_leaderboards.rank(board, creator_id) if creator_id is not None else None
+    return {
+        "dimension": board[0],
+        "value": board[1] or None,
+        "total": total,
+        "items": [
+            {"rank": rank, "xp_score": xp_score, "creator": profiles[ref]}
+            for rank, ref, xp_score in entries
+            if ref in profiles
+        ],
+        "me": {"rank": me[0], "xp_score": me[1]} if me else None,
+    }
+
+def _mark_matches_built(db: Session, brand_id, built: bool = True, only_unbuilt: bool = False) -> bool:
+    """
+    Set the brand's matches_built_at to now (or clear it), leaving updated_at
+    alone since the profile itself did not change. With only_unbuilt the row
+    is claimed only if no list was built yet; returns whether a row was updated.
+    """
+    statement = update(BrandProfile) \
+        .where(BrandProfile.id == brand_id) \
+        .values(matches_built_at=func.now() if built else None, updated_at=BrandProfile.updated_at) \
+        .execution_options(synchronize_session=False)
+    if only_unbuilt:
+        statement = statement.where(BrandProfile.matches_built_at.is_(None))
+    return db.execute(statement).rowcount > 0
+
+def rebuild_brand_matches(db: Session, brand_id, preferences: Optional[dict], budget_range: Optional[dict]) -> int:
+    """
+    Replace a brand's persisted recommendation list with a fresh top-N and
+    record when it was built. Called when the brand's preferences or budget change.
+    """
+    matches = _match_creators(db, preferences, budget_range, settings.BRAND_MATCH_LIST_SIZE)
+    db.query(BrandCreatorMatch).filter(BrandCreatorMatch.brand_id == brand_id).delete(synchronize_session=False)
+    db.add_all(
+        BrandCreatorMatch(brand_id=brand_id, creator_id=creator_id, score=score, components=components)
+        for creator_id, score, components in matches
+    )
+    _mark_matches_built(db, brand_id)
+    db.commit()
+    return len(matches)
+
+def refresh_creator_matches(db: Session, profiles: List[CreatorProfile]) -> None:
+    """
+    Re-score written creators against every brand with preferences in one pass:
+    one brand load, one query each for the list stats and the creators' current
+    entries, one upsert and one commit. Only lists the creators enter, stay in
+    or leave are touched; a brand is rebuilt from the catalog only when a
+    listed creator falls to the bottom of its list (a creator outside the list
+    may now outrank it).
+    """
+    profiles = list({profile.id: profile for profile in profiles}.values())
+    if not profiles:
+        return
+    listed = {
+        (brand_id, creator_id): score
+        for brand_id, creator_id, score in db.query(
+            BrandCreatorMatch.brand_id, BrandCreatorMatch.creator_id, BrandCreatorMatch.score
+        ).filter(BrandCreatorMatch.creator_id == any_(literal([profile.id for profile in profiles], ARRAY(UUID(as_uuid=True)))))
+    }
+    public = [profile for profile in profiles if profile.is_public]
+    if not public and not listed:
+        # Private creators on no list cannot enter one
+        return
+
+    # Brands without a built list get a full build on their first read
+    brands = db.query(
+        BrandProfile.id, BrandProfile.campaign_preferences, BrandProfile.budget_range
+    ).filter(
+        or_(BrandProfile.campaign_preferences.isnot(None), BrandProfile.budget_range.isnot(None)),
+        BrandProfile.matches_built_at.isnot(None)
+    ).all()
+    if not brands:
+        return
+    list_stats = {
+        brand_id: (count, floor)
+        for brand_id, count, floor in db.query(
+            BrandCreatorMatch.brand_id, func.count(), func.min(BrandCreatorMatch.score)
+        ).filter(
+            BrandCreatorMatch.brand_id == any_(literal([brand.id for brand in brands], ARRAY(UUID(as_uuid=True))))
+        ).group_by(BrandCreatorMatch.brand_id)
+    }
+
+    # Score the written creators through a small index, same maths as a full match
+    scorer = CreatorDiscoveryIndex(capacity=max(len(public), 1))
+    scorer.apply_rows(public)
+    rows, overflow, rebuild = [], set(), []
+    for brand in brands:
+        scores = {
+            creator_id: (score, components)
+            for creator_id, score, components in scorer.match(brand.campaign_preferences, brand.budget_range, len(public))
+        } if public else {}
+        count, floor = list_stats.get(brand.id, (0, None))
+        entries = []
+        for profile in profiles:
+            score, components = scores.get(profile.id, (None, None))
+            current = listed.get((brand.id, profile.id))
+            if current is not None:
+                if score is None or (score < current and score <= floor):
+                    rebuild.append(brand)
+                    break
+            elif score is None or (count >= settings.BRAND_MATCH_LIST_SIZE and score <= floor):
+                continue
+            else:
+                count += 1
+            entries.append({"brand_id": brand.id, "creator_id": profile.id, "score": score, "components": components})
+        else:
+            rows.extend(entries)
+            if count > settings.BRAND_MATCH_LIST_SIZE:
+                overflow.add(brand.id)
+
+    if rows:
+        statement = insert(BrandCreatorMatch).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[BrandCreatorMatch.brand_id, BrandCreatorMatch.creator_id],
+            set_={"score": statement.excluded.score, "components": statement.excluded.components, "updated_at": func.now()}
+        ))
+    if overflow:
+        # Entrants pushed the lowest entries out: keep each list at N
+        db.execute(_trim_brand_matches(overflow))
+    db.commit()
+
+    for brand in rebuild:
+        rebuild_brand_matches(db, brand.id, brand.campaign_preferences, brand.budget_range)
+
+def _trim_brand_matches(brand_ids):
+    """DELETE the entries ranked below BRAND_MATCH_LIST_SIZE in each brand's list"""
+    ranked = select(
+        BrandCreatorMatch.brand_id,
+        BrandCreatorMatch.creator_id,
+        func.row_number().over(
+            partition_by=BrandCreatorMatch.brand_id,
+            order_by=(BrandCreatorMatch.score.desc(), BrandCreatorMatch.creator_id)
+        ).label("rank")
+    ).where(BrandCreatorMatch.brand_id == any_(literal(list(brand_ids), ARRAY(UUID(as_uuid=True))))).subquery()
+    return delete(BrandCreatorMatch).where(
+        tuple_(BrandCreatorMatch.brand_id, BrandCreatorMatch.creator_id).in_(
+            select(ranked.c.brand_id, ranked.c.creator_id).where(ranked.c.rank > settings.BRAND_MATCH_LIST_SIZE)
+        )
+    )
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, for the planner's row estimate"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def _estimate_row_count(db: Session, statement) -> int:
+    """Planner row estimate for a SELECT, without running it"""
+    plan = db.execute(Explain(statement)).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def _public_creator_filter_query(db: Session, filters: dict):
+    """Public profiles matching the discovery filters, without ordering or paging"""
+    plan = plan_creator_query(filters)
     query = db.query(CreatorProfile).filter(CreatorProfile.is_public == True)
+    for name in plan["predicates"]:
+        query = query.filter(CREATOR_FILTER_CLAUSES[name](filters[name]))
+    return query
+
+def _facet_value(facet: str, value: str) -> str:
+    """Map enum names stored by the Enum columns back to API values"""
+    if facet == "content_type":
+        return ContentTypeEnum[value].value
+    if facet == "creator_type":
+        return CreatorTypeEnum[value].value
+    return value
+
+def _top_facet_counts(rows, facet_limit: int, enum_names: bool = False) -> dict:
+    """
+    Group (facet, value, count) rows into the highest-count values per facet.
+    creator_facet_counts rows already hold API values; set enum_names for rows
+    read from the Enum columns (build_creator_facet_query), which hold names.
+    """
+    grouped = {facet: [] for facet in CREATOR_FACETS}
+    for facet, value, count in rows:
+        if facet in grouped and value is not None and count > 0:
+            if enum_names:
+                value = _facet_value(facet, value)
+            grouped[facet].append({"value": value, "count": int(count)})
+    return {
+        facet: sorted(values, key=lambda item: (-item["count"], item["value"]))[:facet_limit]
+        for facet, values in grouped.items()
+    }
+
+def build_creator_facet_query(db: Session, filters: dict):
+    """(facet, value, count) rows for a filtered result set, grouped per facet over one CTE of matches"""
+    matches = _public_creator_filter_query(db, filters).with_entities(
+        CreatorProfile.content_type,
+        CreatorProfile.creator_type,
+        CreatorProfile.location,
+        CreatorProfile.tags
+    ).cte("matches")
+    tag = func.unnest(matches.c.tags).table_valued("tag").render_derived()
+
+    def grouped(facet: str, column):
+        return select(literal(facet).label("facet"), column.label("value"), func.count().label("count")) \
+            .where(column.isnot(None)).group_by(column)
+
+    return union_all(
+        grouped("content_type", cast(matches.c.content_type, String)).select_from(matches),
+        grouped("creator_type", cast(matches.c.creator_type, String)).select_from(matches),
+        grouped("location", matches.c.location).select_from(matches),
+        grouped("tag", tag.c.tag).select_from(matches).join(tag, true()),
+    )
+
+def get_creator_discovery_stats(
+    db: Session,
+    include_total: bool = True,
+    include_facets: bool = False,
+    facet_limit: int = 20,
+    **criteria
+) -> dict:
+    """
+    Result-set total and facet counts for creator discovery.
+    Served from the in-memory index when available (exact). Otherwise unfiltered
+    requests read the maintained creator_facet_counts table; filtered totals are
+    exact for selective filters and a planner estimate for broad ones
+    (total_is_estimate tells the client which).
+    """
+    filters = {name: value for name, value in criteria.items() if value not in (None, [], "")}
+    result = {"total": None, "total_is_estimate": False, "facets": None}
     
-    # Apply filters
-    if content_type:
-        query = query.filter(CreatorProfile.content_type == content_type)
+    index = _creator_search_index(db)
+    if index is not None:
+        stats = index.stats(filters, facet_limit)
+        result["total"] = stats["total"] if include_total else None
+        result["facets"] = stats["facets"] if include_facets else None
+        return result
     
-    if location:
-        query = query.filter(CreatorProfile.location.ilike(f"%{location}%"))
+    if not filters:
+        rows = db.query(CreatorFacetCount.facet, CreatorFacetCount.value, CreatorFacetCount.count).all()
+        if include_total:
+            result["total"] = next((int(count) for facet, _, count in rows if facet == "total"), 0)
+        if include_facets:
+            result["facets"] = _top_facet_counts(rows, facet_limit)
+        return result
     
-    if tags:
-        # Filter by tags (PostgreSQL array contains)
-        for tag in tags:
-            query = query.filter(CreatorProfile.tags.any(tag))
+    if include_total:
+        selectivity = 1.0
+        for name, value in filters.items():
+            selectivity *= _creator_filter_selectivity(name, value)
+        query = _public_creator_filter_query(db, filters)
+        if selectivity >= COUNT_ESTIMATE_SELECTIVITY:
+            result["total"] = _estimate_row_count(db, query.with_entities(CreatorProfile.id).statement)
+            result["total_is_estimate"] = True
+        else:
+            result["total"] = query.with_entities(func.count(CreatorProfile.id)).scalar()
+    if include_facets:
+        result["facets"] = _top_facet_counts(
+            db.execute(build_creator_facet_query(db, filters)).all(), facet_limit, enum_names=True
+        )
+    return result
+
+def build_creator_metrics_update(
+    user_id,
+    campaigns_completed: int = 0,
+    earnings_added: float = 0.0,
+    engagement_rate: Optional[float] = None
+):
+    """
+    UPDATE ... RETURNING applying one creator's metric deltas. Returns the
+    updated row plus its XP score from before the update.
+    """
+    total_campaigns = func.coalesce(CreatorProfile.total_campaigns, 0) + campaigns_completed
+    total_earnings = func.coalesce(CreatorProfile.total_earnings, 0.0) + earnings_added
+    avg_engagement_rate = CreatorProfile.avg_engagement_rate if engagement_rate is None else literal(engagement_rate)
     
-    return query.offset(skip).limit(limit).all()
+    # The row's XP score before the update, locked so it is not stale
+    previous = select(CreatorProfile.id, CreatorProfile.xp_score) \
+        .where(CreatorProfile.user_id == user_id) \
+        .with_for_update() \
+        .cte("previous")
+    return update(CreatorProfile) \
+        .where(CreatorProfile.id == previous.c.id) \
+        .values(
+            total_campaigns=total_campaigns,
+            total_earnings=total_earnings,
+            avg_engagement_rate=avg_engagement_rate,
+            # SET expressions read the old row, so score the new values explicitly
+            xp_score=xp_score_sql(total_campaigns, total_earnings, avg_engagement_rate),
+            xp_dirty=False
+        ) \
+        .returning(CreatorProfile, previous.c.xp_score)
 
 def update_creator_metrics(
     db: Session, 
@@ -90,23 +829,24 @@ def update_creator_metrics(
     """
     Update creator performance metrics.
     Called when campaigns are completed or metrics are recalculated.
+    One UPDATE ... RETURNING: the increments and the XP score are computed
+    by the database from the current row, so concurrent updates never lose
+    each other's deltas. Brand match lists are re-scored only if XP changed.
     """
-    profile = get_creator_profile_by_user_id(db, user_id)
-    if not profile:
+    statement = build_creator_metrics_update(user_id, campaigns_completed, earnings_added, engagement_rate)
+    row = db.execute(statement, execution_options={"synchronize_session": False}).one_or_none()
+    if row is None:
+        db.rollback()
         return None
-    
-    # Update metrics
-    profile.total_campaigns += campaigns_completed
-    profile.total_earnings += earnings_added
-    
-    if engagement_rate is not None:
-        profile.avg_engagement_rate = engagement_rate
-    
-    # Calculate XP score based on performance
-    profile.xp_score = calculate_xp_score(profile)
-    
+    profile, previous_xp_score = row
+    # Detached instances are not expired on commit, so the RETURNING row is kept
+    db.expunge(profile)
     db.commit()
-    db.refresh(profile)
+    discovery_cache.bump("creator")
+    _index_creator_profile(profile)
+    # XP is the only match input a metrics update writes
+    if profile.xp_score != previous_xp_score:
+        refresh_creator_matches(db, [profile])
     return profile
 
 def calculate_xp_score(profile: CreatorProfile) -> float:
@@ -136,6 +876,45 @@ def calculate_xp_score(profile: CreatorProfile) -> float:
     
     return round(base_score, 2)
 
+def _is_filled(column, kind: str):
+    """SQL truthiness of a profile field, matching `if field` in Python"""
+    if kind == "text":
+        return func.coalesce(column, "") != ""
+    if kind == "array":
+        return func.coalesce(func.cardinality(column), 0) > 0
+    # JSON: NULL, JSON null and empty containers are all "not filled"
+    return func.coalesce(cast(column, Text), "null").notin_(["null", "[]", "{}"])
+
+def profile_completeness_sql():
+    """calculate_profile_completeness as a SQL expression over the row"""
+    fields = [
+        _is_filled(CreatorProfile.bio, "text"),
+        _is_filled(CreatorProfile.profile_image_url, "text"),
+        _is_filled(CreatorProfile.platforms, "json"),
+        _is_filled(CreatorProfile.pricing_info, "json"),
+        _is_filled(CreatorProfile.tags, "array"),
+        _is_filled(CreatorProfile.location, "text"),
+    ]
+    return sum(case((filled, 1.0), else_=0.0) for filled in fields) / len(fields)
+
+def xp_score_sql(
+    total_campaigns=CreatorProfile.total_campaigns,
+    total_earnings=CreatorProfile.total_earnings,
+    avg_engagement_rate=CreatorProfile.avg_engagement_rate
+):
+    """
+    calculate_xp_score as a SQL expression. The metric inputs can be given
+    as expressions (e.g. old value + delta) for use in an UPDATE.
+    """
+    score = (
+        func.coalesce(total_campaigns, 0) * 10
+        + func.least(func.coalesce(total_earnings, 0.0) / 100, 500)
+        + func.coalesce(avg_engagement_rate, 0.0) * 1000
+        + case((CreatorProfile.is_verified == True, 100.0), else_=0.0)
+        + profile_completeness_sql() * 50
+    )
+    return cast(func.round(cast(score, Numeric), 2), Float)
+
 def calculate_profile_completeness(profile: CreatorProfile) -> float:
     """Calculate profile completeness percentage (0.0 to 1.0)"""
     fields_to_check = [
@@ -0,0 +1,76 @@
+import argparse
+import sys
+import time
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from typing import Dict, List, Tuple
+from app.db.models.creator import CreatorProfile, CreatorDuplicateFlag
+from app.utils.near_duplicates import NearDuplicateIndex, near_duplicate_index
+
+# Flag rows written per INSERT
+DUPLICATE_FLAG_INSERT_ROWS = 5000
+
+def _is_newer(created: Dict, profile_id, other_id) -> bool:
+    """Whether profile_id was created after other_id (ties broken by id)"""
+    return (created.get(profile_id) or 0, str(profile_id)) > (created.get(other_id) or 0, str(other_id))
+
+def find_duplicate_pairs(index: NearDuplicateIndex, created: Dict) -> List[Tuple]:
+    """
+    (creator id, duplicate of id, similarity) for every near-duplicate pair
+    in the index, flagging the newer profile of each pair once.
+    """
+    pairs = []
+    for profile_id in index.profile_ids():
+        signature = index.signature(profile_id)
+        if signature is None:
+            continue
+        for other_id, similarity in index.find_signature(signature, exclude=profile_id):
+            if _is_newer(created, profile_id, other_id):
+                pairs.append((profile_id, other_id, similarity))
+    return pairs
+
+def rebuild_duplicate_flags(db: Session) -> dict:
+    """
+    Rebuild this process's near-duplicate index from the whole table and
+    replace every duplicate flag with what it finds, in one transaction.
+    For initial backfill or after changing the signature parameters;
+    profile writes keep the flags up to date.
+    """
+    started = time.monotonic()
+    stats = {"profiles": near_duplicate_index.rebuild(db)}
+    stats["indexed"] = len(near_duplicate_index)
+    created = {
+        row.id: row.created_at.timestamp() if row.created_at else 0
+        for row in db.query(CreatorProfile.id, CreatorProfile.created_at).yield_per(5000)
+    }
+    pairs = find_duplicate_pairs(near_duplicate_index, created)
+
+    db.query(CreatorDuplicateFlag).delete(synchronize_session=False)
+    for start in range(0, len(pairs), DUPLICATE_FLAG_INSERT_ROWS):
+        db.execute(insert(CreatorDuplicateFlag).values([
+            {"creator_id": creator_id, "duplicate_of_id": duplicate_of_id, "similarity": similarity}
+            for creator_id, duplicate_of_id, similarity in pairs[start:start + DUPLICATE_FLAG_INSERT_ROWS]
+        ]))
+    db.commit()
+
+    stats["flags"] = len(pairs)
+    stats["flagged_profiles"] = len({creator_id for creator_id, _, _ in pairs})
+    stats["seconds"] = round(time.monotonic() - started, 2)
+    return stats
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild near-duplicate creator flags over the whole table")
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = rebuild_duplicate_flags(db)
+    finally:
+        db.close()
+    print(
+        f"[duplicates] indexed {result['indexed']} of {result['profiles']} profiles, "
+        f"{result['flags']} flags on {result['flagged_profiles']} profiles ({result['seconds']}s)",
+        file=sys.stderr
+    )
\ No newline at end of file
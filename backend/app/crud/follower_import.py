@@ -0,0 +1,306 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import random
+import sys
+import time
+from sqlalchemy import JSON, Boolean, Float, String, any_, cast, column, literal, or_, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+from app.crud.creator import _apply_creator_facet_deltas, rebuild_brand_matches
+from app.crud.xp import _rescore_chunk
+from app.db.models.brand import BrandProfile
+from app.db.models.creator import CreatorProfile, CreatorTypeEnum
+from app.utils.discovery_index import total_followers
+from app.utils.result_cache import discovery_cache
+
+# Distinct handles per database round trip (one SELECT and one UPDATE)
+IMPORT_BATCH_HANDLES = 2000
+
+# Total followers at which each tier starts, highest first (see CreatorTypeEnum)
+CREATOR_TYPE_THRESHOLDS = (
+    (1_000_000, CreatorTypeEnum.CELEBRITY),
+    (100_000, CreatorTypeEnum.MACRO),
+    (10_000, CreatorTypeEnum.MICRO),
+    (1, CreatorTypeEnum.NANO),
+)
+
+class SnapshotRow(NamedTuple):
+    handle: str
+    platform: str
+    followers: int
+    engagement_rate: Optional[float]
+
+def classify_creator_type(followers: int) -> Optional[CreatorTypeEnum]:
+    """Tier for a total follower count, None without followers"""
+    for threshold, creator_type in CREATOR_TYPE_THRESHOLDS:
+        if followers >= threshold:
+            return creator_type
+    return None
+
+def weighted_engagement_rate(platforms) -> Optional[float]:
+    """Follower-weighted mean engagement over platforms that report one"""
+    weighted = reach = 0.0
+    for platform in platforms or []:
+        followers = int(platform.get("followers") or 0)
+        if platform.get("engagement_rate") is not None and followers > 0:
+            weighted += followers * float(platform["engagement_rate"])
+            reach += followers
+    return round(weighted / reach, 6) if reach else None
+
+def read_snapshot_records(source: TextIO, fmt: str) -> Iterator[dict]:
+    """Raw records from a CSV (with header) or NDJSON stream"""
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield {}
+
+def _engagement(value) -> Optional[float]:
+    """Fraction from "0.034", 0.034 or "3.4%"; ValueError if outside 0-1"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.strip().endswith("%"):
+        rate = float(value.strip()[:-1]) / 100
+    else:
+        rate = float(value)
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(value)
+    return rate
+
+def parse_snapshot_records(records: Iterable[dict], stats: dict) -> Iterator[SnapshotRow]:
+    """Validated rows; malformed records are counted in stats["invalid"] and skipped"""
+    for record in records:
+        stats["rows"] += 1
+        try:
+            handle = str(record["handle"]).strip().lstrip("@")
+            platform = str(record["platform"]).strip().lower()
+            followers = int(float(record["followers"]))
+            engagement_rate = _engagement(record.get("engagement", record.get("engagement_rate")))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            stats["invalid"] += 1
+            continue
+        if not handle or not platform or followers < 0:
+            stats["invalid"] += 1
+            continue
+        yield SnapshotRow(handle, platform, followers, engagement_rate)
+
+def batch_by_handle(rows: Iterable[SnapshotRow], batch_handles: int) -> Iterator[Dict[str, Dict[str, SnapshotRow]]]:
+    """
+    handle -> platform -> row, batch_handles handles at a time. A later row
+    for the same handle and platform replaces an earlier one in the batch.
+    """
+    batch: Dict[str, Dict[str, SnapshotRow]] = {}
+    for row in rows:
+        if row.handle not in batch and len(batch) >= batch_handles:
+            yield batch
+            batch = {}
+        batch.setdefault(row.handle, {})[row.platform] = row
+    if batch:
+        yield batch
+
+def merge_platforms(platforms, snapshot: Dict[str, SnapshotRow]) -> List[dict]:
+    """
+    The creator's platforms JSON with followers and engagement replaced for
+    snapshot platforms (matched case-insensitively) and new platforms appended.
+    Other keys on an entry are kept.
+    """
+    merged, seen = [], set()
+    for entry in platforms or []:
+        entry = dict(entry)
+        name = str(entry.get("platform", "")).lower()
+        row = snapshot.get(name)
+        if row is not None and name not in seen:
+            entry["followers"] = row.followers
+            if row.engagement_rate is not None:
+                entry["engagement_rate"] = row.engagement_rate
+            seen.add(name)
+        merged.append(entry)
+    for name, row in snapshot.items():
+        if name not in seen:
+            merged.append({"platform": name, "followers": row.followers, "engagement_rate": row.engagement_rate})
+    return merged
+
+def _creator_type(value) -> Optional[CreatorTypeEnum]:
+    return None if value is None else CreatorTypeEnum(value)
+
+def apply_snapshot_batch(db: Session, batch: Dict[str, Dict[str, SnapshotRow]]) -> dict:
+    """
+    Merge one batch of snapshot rows into creator profiles: one SELECT of
+    the handles, one UPDATE ... FROM (VALUES ...) of the profiles that
+    changed (platforms, follower-weighted avg_engagement_rate, creator_type
+    tier) with their facet count changes, then a set-based XP rescore.
+    """
+    existing = db.execute(
+        select(
+            CreatorProfile.id, CreatorProfile.handle, CreatorProfile.is_public, CreatorProfile.platforms,
+            CreatorProfile.avg_engagement_rate, CreatorProfile.creator_type
+        ).where(CreatorProfile.handle == any_(literal(list(batch), ARRAY(String))))
+    ).all()
+
+    changes, before, after = [], [], []
+    for profile in existing:
+        platforms = merge_platforms(profile.platforms, batch[profile.handle])
+        engagement_rate = weighted_engagement_rate(platforms)
+        if engagement_rate is None:
+            engagement_rate = profile.avg_engagement_rate
+        old_type = _creator_type(profile.creator_type)
+        creator_type = classify_creator_type(total_followers(platforms)) or old_type
+        if (platforms, engagement_rate, creator_type) == (profile.platforms, profile.avg_engagement_rate, old_type):
+            continue
+        changes.append((profile.id, platforms, engagement_rate, creator_type))
+        if profile.is_public and creator_type != old_type:
+            if old_type is not None:
+                before.append(("creator_type", old_type.value))
+            after.append(("creator_type", creator_type.value))
+
+    if changes:
+        creator_type_type = CreatorProfile.__table__.c.creator_type.type
+        table = values(
+            column("id", UUID(as_uuid=True)),
+            column("platforms", JSON),
+            column("avg_engagement_rate", Float),
+            column("creator_type", creator_type_type),
+            name="snapshot"
+        ).data(sorted(changes, key=lambda change: str(change[0])))
+        db.execute(
+            update(CreatorProfile)
+            .where(CreatorProfile.id == cast(table.c.id, UUID(as_uuid=True)))
+            .values(
+                platforms=cast(table.c.platforms, JSON),
+                avg_engagement_rate=cast(table.c.avg_engagement_rate, Float),
+                creator_type=cast(table.c.creator_type, creator_type_type),
+                # Cleared by the rescore below; left set if this run stops in between
+                xp_dirty=literal(True, Boolean)
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        _apply_creator_facet_deltas(db, before, after)
+    db.commit()
+    if changes:
+        _rescore_chunk(db, [change[0] for change in changes])
+
+    return {"matched": len(existing), "updated": len(changes)}
+
+def import_follower_snapshot(
+    db: Session,
+    source: TextIO,
+    fmt: str = "csv",
+    batch_handles: int = IMPORT_BATCH_HANDLES,
+    rebuild_matches: bool = True,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Stream a follower/engagement snapshot (handle, platform, followers,
+    engagement) into creator profiles, batch by batch. Memory is bounded by
+    one batch. Unknown handles are counted and skipped. Brand match lists
+    are rebuilt at the end when any profile changed.
+    """
+    started = time.monotonic()
+    stats = {"rows": 0, "invalid": 0, "handles": 0, "matched": 0, "updated": 0, "batches": 0}
+    rows = parse_snapshot_records(read_snapshot_records(source, fmt), stats)
+    for batch in batch_by_handle(rows, batch_handles):
+        result = apply_snapshot_batch(db, batch)
+        stats["handles"] += len(batch)
+        stats["matched"] += result["matched"]
+        stats["updated"] += result["updated"]
+        stats["batches"] += 1
+        _update_rate(stats, started)
+        if progress is not None:
+            progress(dict(stats))
+
+    stats["unknown_handles"] = stats["handles"] - stats["matched"]
+    if stats["updated"]:
+        discovery_cache.bump("creator")
+        if rebuild_matches:
+            for brand in db.query(
+                BrandProfile.id, BrandProfile.campaign_preferences, BrandProfile.budget_range
+            ).filter(or_(BrandProfile.campaign_preferences.isnot(None), BrandProfile.budget_range.isnot(None))).all():
+                rebuild_brand_matches(db, brand.id, brand.campaign_preferences, brand.budget_range)
+    _update_rate(stats, started)
+    return stats
+
+def _update_rate(stats: dict, started: float) -> None:
+    elapsed = time.monotonic() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_second"] = round(stats["rows"] / elapsed, 1) if elapsed else 0.0
+
+def synthetic_snapshot(rows: int, handles: int, fmt: str = "csv", seed: int = 1) -> io.StringIO:
+    """In-memory snapshot file of random rows, for benchmarking the pipeline"""
+    rng = random.Random(seed)
+    platforms = ("instagram", "youtube", "tiktok", "x")
+    out = io.StringIO()
+    if fmt == "csv":
+        out.write("handle,platform,followers,engagement\n")
+    for _ in range(rows):
+        record = (f"creator{rng.randrange(handles)}", rng.choice(platforms), rng.randrange(500, 5_000_000), f"{rng.random() * 12:.2f}%")
+        if fmt == "csv":
+            out.write(",".join(map(str, record)) + "\n")
+        else:
+            out.write(json.dumps(dict(zip(("handle", "platform", "followers", "engagement"), record))) + "\n")
+    out.seek(0)
+    return out
+
+def benchmark_parse(rows: int, fmt: str = "csv", batch_handles: int = IMPORT_BATCH_HANDLES) -> dict:
+    """Rows/sec of read + parse + batch + merge on synthetic data, without a database"""
+    source = synthetic_snapshot(rows, max(rows // 3, 1), fmt)
+    stats = {"rows": 0, "invalid": 0, "handles": 0, "batches": 0}
+    started = time.monotonic()
+    for batch in batch_by_handle(parse_snapshot_records(read_snapshot_records(source, fmt), stats), batch_handles):
+        for snapshot in batch.values():
+            platforms = merge_platforms(None, snapshot)
+            classify_creator_type(total_followers(platforms))
+            weighted_engagement_rate(platforms)
+        stats["handles"] += len(batch)
+        stats["batches"] += 1
+    _update_rate(stats, started)
+    return stats
+
+def _open_snapshot(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="", encoding="utf-8")
+    return open(path, newline="", encoding="utf-8")
+
+def _print_progress(stats: dict) -> None:
+    print(
+        f"[followers] rows {stats['rows']} handles {stats.get('handles', 0)} updated {stats.get('updated', 0)} "
+        f"invalid {stats['invalid']} ({stats['rows_per_second']} rows/s, {stats['seconds']}s)",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a follower/engagement snapshot (CSV or NDJSON, optionally .gz)")
+    parser.add_argument("path", nargs="?", help="Snapshot file, or - for stdin")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None, help="Default: from the file name")
+    parser.add_argument("--batch-handles", type=int, default=IMPORT_BATCH_HANDLES)
+    parser.add_argument("--skip-matches", action="store_true", help="Do not rebuild brand match lists afterwards")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="Benchmark the parse pipeline on synthetic rows")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        _print_progress(benchmark_parse(args.benchmark, args.format or "csv", args.batch_handles))
+        raise SystemExit(0)
+    if not args.path:
+        parser.error("path is required unless --benchmark is given")
+
+    from app.db.session import SessionLocal
+
+    fmt = args.format or ("ndjson" if ".ndjson" in args.path or ".jsonl" in args.path else "csv")
+    db = SessionLocal()
+    try:
+        with _open_snapshot(args.path) as source:
+            result = import_follower_snapshot(
+                db, source, fmt, args.batch_handles, rebuild_matches=not args.skip_matches, progress=_print_progress
+            )
+    finally:
+        db.close()
+    _print_progress(result)
\ No newline at end of file
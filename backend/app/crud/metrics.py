@@ -0,0 +1,152 @@
+from sqlalchemy import Float, Integer, cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Session
+from typing import Dict, List
+from app.core.config import settings
+from app.crud.brand import _index_brand_profile
+from app.crud.creator import _index_creator_profile, refresh_creator_matches, xp_score_sql
+from app.db.models.agency import AgencyProfile
+from app.db.models.brand import BrandProfile
+from app.db.models.creator import CreatorProfile
+from app.db.models.metric_event import ProcessedMetricEvent
+from app.db.session import SessionLocal
+from app.schemas.shared.metrics import MetricEvent
+from app.utils.metric_ingest import MetricIngestWorker
+from app.utils.result_cache import discovery_cache
+
+# Per-profile delta columns, in VALUES order after user_id
+DELTA_COLUMNS = ("campaigns", "earnings", "spend", "engagement_rate")
+
+def aggregate_metric_events(events: List[MetricEvent]) -> Dict[str, Dict]:
+    """
+    profile type -> user id -> summed deltas. The last engagement_rate
+    given for a profile wins.
+    """
+    deltas: Dict[str, Dict] = {}
+    for event in events:
+        profile = deltas.setdefault(event.profile_type, {}).setdefault(
+            event.user_id, {"campaigns": 0, "earnings": 0.0, "spend": 0.0, "engagement_rate": None}
+        )
+        profile["campaigns"] += event.campaigns
+        profile["earnings"] += event.earnings
+        profile["spend"] += event.spend
+        if event.engagement_rate is not None:
+            profile["engagement_rate"] = event.engagement_rate
+    return deltas
+
+def _deltas_table(profiles: Dict):
+    """
+    The batch's deltas as a VALUES list, ordered by user id so concurrent
+    batches lock profile rows in the same order.
+    """
+    table = values(
+        column("user_id", UUID(as_uuid=True)),
+        column("campaigns", Integer),
+        column("earnings", Float),
+        column("spend", Float),
+        column("engagement_rate", Float),
+        name="deltas"
+    ).data([
+        (user_id, *(profiles[user_id][name] for name in DELTA_COLUMNS))
+        for user_id in sorted(profiles, key=str)
+    ])
+    # Bound parameters inside VALUES arrive untyped; cast them for the SET expressions
+    return table, {
+        "user_id": cast(table.c.user_id, UUID(as_uuid=True)),
+        "campaigns": cast(table.c.campaigns, Integer),
+        "earnings": cast(table.c.earnings, Float),
+        "spend": cast(table.c.spend, Float),
+        "engagement_rate": cast(table.c.engagement_rate, Float),
+    }
+
+def build_metric_batch_update(profile_type: str, profiles: Dict):
+    """One UPDATE ... FROM (VALUES ...) ... RETURNING applying every profile's deltas"""
+    table, delta = _deltas_table(profiles)
+    if profile_type == "creator":
+        total_campaigns = func.coalesce(CreatorProfile.total_campaigns, 0) + delta["campaigns"]
+        total_earnings = func.coalesce(CreatorProfile.total_earnings, 0.0) + delta["earnings"]
+        avg_engagement_rate = func.coalesce(delta["engagement_rate"], CreatorProfile.avg_engagement_rate)
+        return update(CreatorProfile) \
+            .where(CreatorProfile.user_id == delta["user_id"]) \
+            .values(
+                total_campaigns=total_campaigns,
+                total_earnings=total_earnings,
+                avg_engagement_rate=avg_engagement_rate,
+                xp_score=xp_score_sql(total_campaigns, total_earnings, avg_engagement_rate),
+                xp_dirty=False
+            ) \
+            .returning(CreatorProfile)
+    if profile_type == "brand":
+        return update(BrandProfile) \
+            .where(BrandProfile.user_id == delta["user_id"]) \
+            .values(
+                total_campaigns=func.coalesce(BrandProfile.total_campaigns, 0) + delta["campaigns"],
+                total_spend=func.coalesce(BrandProfile.total_spend, 0.0) + delta["spend"]
+            ) \
+            .returning(BrandProfile)
+    return update(AgencyProfile) \
+        .where(AgencyProfile.user_id == delta["user_id"]) \
+        .values(
+            total_campaigns_run=func.coalesce(AgencyProfile.total_campaigns_run, 0) + delta["campaigns"],
+            total_earnings=func.coalesce(AgencyProfile.total_earnings, 0.0) + delta["earnings"],
+            total_spend_managed=func.coalesce(AgencyProfile.total_spend_managed, 0.0) + delta["spend"]
+        ) \
+        .returning(AgencyProfile)
+
+def apply_metric_events(db: Session, events: List[MetricEvent]) -> dict:
+    """
+    Apply a batch of metric events in one transaction: record their ids,
+    drop those already applied, then one UPDATE per profile type with the
+    summed deltas. Events for unknown profiles are recorded and dropped.
+    """
+    unique = list({event.event_id: event for event in events}.values())
+    new_ids = set(db.execute(
+        insert(ProcessedMetricEvent)
+        .values([{"event_id": event.event_id} for event in unique])
+        .on_conflict_do_nothing(index_elements=["event_id"])
+        .returning(ProcessedMetricEvent.event_id)
+    ).scalars())
+    fresh = [event for event in unique if event.event_id in new_ids]
+
+    updated = {}
+    for profile_type, profiles in aggregate_metric_events(fresh).items():
+        updated[profile_type] = db.execute(
+            build_metric_batch_update(profile_type, profiles),
+            execution_options={"synchronize_session": False}
+        ).scalars().all()
+        # Detached instances keep the RETURNING values through the commit
+        for profile in updated[profile_type]:
+            db.expunge(profile)
+    db.commit()
+
+    for profile_type, profiles in updated.items():
+        if profiles:
+            discovery_cache.bump(profile_type)
+    for profile in updated.get("creator", []):
+        _index_creator_profile(profile)
+    # One pass for the whole batch: one brand load, one stats query, one commit
+    refresh_creator_matches(db, updated.get("creator", []))
+    for profile in updated.get("brand", []):
+        _index_brand_profile(profile)
+
+    return {
+        "applied": len(fresh),
+        "already_processed": len(events) - len(fresh),
+        "profiles_updated": sum(len(profiles) for profiles in updated.values()),
+    }
+
+def _apply_metric_batch(events: List[MetricEvent]) -> dict:
+    """Worker entry point: apply a batch on its own session"""
+    db = SessionLocal()
+    try:
+        return apply_metric_events(db, events)
+    finally:
+        db.close()
+
+metric_ingest_worker = MetricIngestWorker(
+    _apply_metric_batch,
+    window_seconds=settings.METRIC_INGEST_WINDOW_MS / 1000,
+    max_batch=settings.METRIC_INGEST_MAX_BATCH,
+    max_pending=settings.METRIC_INGEST_MAX_PENDING,
+    max_attempts=settings.METRIC_INGEST_MAX_ATTEMPTS
+)
\ No newline at end of file
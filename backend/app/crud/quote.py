@@ -0,0 +1,94 @@
+from sqlalchemy import any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from app.db.models.creator import CreatorProfile
+from app.utils.currency import convert, currency_rates
+
+def _price_key(platform, content_type) -> tuple:
+    return (str(platform or "").strip().lower(), str(content_type or "").strip().lower())
+
+def _cheapest_prices(pricing_info, currency: str, rates: Dict[str, float]) -> Dict[tuple, tuple]:
+    """
+    (platform, content type) -> (unit price in currency, listed price, listed
+    currency) for the cheapest convertible offer; None when every offer for
+    the key has an unknown currency.
+    """
+    prices: Dict[tuple, Optional[tuple]] = {}
+    for item in pricing_info or []:
+        if not isinstance(item, dict) or item.get("price") is None:
+            continue
+        key = _price_key(item.get("platform"), item.get("content_type"))
+        listed_currency = str(item.get("currency") or "USD").upper()
+        unit_price = convert(float(item["price"]), listed_currency, currency, rates)
+        if unit_price is None:
+            prices.setdefault(key, None)
+        elif prices.get(key) is None or unit_price < prices[key][0]:
+            prices[key] = (unit_price, float(item["price"]), listed_currency)
+    return prices
+
+def build_campaign_quote(db: Session, creator_ids: List, deliverables: List, currency: str) -> dict:
+    """
+    Price every deliverable for every public creator in creator_ids from one
+    query over their pricing_info, converted into currency. A creator
+    without a convertible price for a deliverable gets a missing entry
+    instead of a line item.
+    """
+    currency = currency.upper()
+    rates = currency_rates.get(db)
+    creator_ids = list(dict.fromkeys(creator_ids))
+    rows = db.execute(
+        select(CreatorProfile.id, CreatorProfile.display_name, CreatorProfile.handle, CreatorProfile.pricing_info)
+        .where(CreatorProfile.id == any_(literal(creator_ids, ARRAY(UUID(as_uuid=True)))))
+        .where(CreatorProfile.is_public == True)
+    ).all()
+    by_id = {row.id: row for row in rows}
+
+    creators, incomplete, used = [], [], set()
+    for creator_id in creator_ids:
+        row = by_id.get(creator_id)
+        if row is None:
+            continue
+        prices = _cheapest_prices(row.pricing_info, currency, rates)
+        line_items, missing = [], []
+        for deliverable in deliverables:
+            key = _price_key(deliverable.platform, deliverable.content_type)
+            price = prices.get(key)
+            if price is None:
+                missing.append({
+                    "platform": deliverable.platform,
+                    "content_type": deliverable.content_type,
+                    "reason": "unknown_currency" if key in prices else "no_price",
+                })
+                continue
+            unit_price, listed_price, listed_currency = price
+            used.add(listed_currency)
+            line_items.append({
+                "platform": deliverable.platform,
+                "content_type": deliverable.content_type,
+                "quantity": deliverable.quantity,
+                "unit_price": round(unit_price, 2),
+                "subtotal": round(unit_price * deliverable.quantity, 2),
+                "price": listed_price,
+                "price_currency": listed_currency,
+            })
+        if missing:
+            incomplete.append(row.id)
+        creators.append({
+            "creator_id": row.id,
+            "display_name": row.display_name,
+            "handle": row.handle,
+            "line_items": line_items,
+            "missing": missing,
+            "subtotal": round(sum(item["subtotal"] for item in line_items), 2),
+        })
+
+    return {
+        "currency": currency,
+        "creators": creators,
+        "total": round(sum(creator["subtotal"] for creator in creators), 2),
+        "incomplete": incomplete,
+        "not_found": [creator_id for creator_id in creator_ids if creator_id not in by_id],
+        # Rates in quote currency per listed currency unit, for the currencies priced
+        "rates_used": {code: round(convert(1.0, code, currency, rates), 6) for code in sorted(used)},
+    }
\ No newline at end of file
@@ -0,0 +1,116 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+from typing import Optional, List
+from app.core.config import settings
+from app.db.models.agency import AgencyProfile
+from app.db.models.brand import BrandProfile
+from app.db.models.creator import CreatorProfile
+from app.db.session import SessionLocal
+from app.schemas.agency.profile import AgencyProfilePublic
+from app.schemas.brand.profile import BrandProfilePublic
+from app.schemas.creator.profile import CreatorProfilePublic
+from app.utils.geo import within_radius_clause
+from app.utils.projection import load_schema_columns
+from app.utils.suggest import suggest_index
+
+# Cross-entity search runs each source on its own connection; this bounds the
+# connections search can hold at once across concurrent requests
+_search_executor = ThreadPoolExecutor(max_workers=settings.SEARCH_MAX_WORKERS, thread_name_prefix="search")
+
+def get_suggestions(db: Session, prefix: str, limit: int = 10, kinds: Optional[List[str]] = None) -> List[dict]:
+    """
+    Typeahead suggestions for a search box prefix.
+    Served from the in-memory prefix index, which polls for changes.
+    """
+    suggest_index.refresh_if_stale(db, settings.SUGGEST_INDEX_REFRESH_SECONDS)
+    return suggest_index.suggest(prefix, limit, kinds)
+
+def is_handle_available(db: Session, handle: str) -> bool:
+    """
+    Whether a creator handle is free. A handle the in-memory index saw is
+    reported taken without a query; every other answer comes from the
+    database, because the index trails writes made through other workers.
+    The answer is advisory: creation relies on the unique constraint.
+    """
+    suggest_index.refresh_if_stale(db, settings.SUGGEST_INDEX_REFRESH_SECONDS)
+    if suggest_index.has_handle(handle):
+        return False
+    return db.query(CreatorProfile.id).filter(CreatorProfile.handle == handle).first() is None
+
+def _search_profiles(db: Session, model, name_columns, public_only: bool, sort_column, q, location, near, limit, schema=None):
+    """Profiles whose name columns contain q, filtered like discovery; only schema's columns are loaded"""
+    query = db.query(model).filter(or_(*[column.ilike(f"%{q}%") for column in name_columns]))
+    if schema is not None:
+        query = query.options(load_schema_columns(model, schema))
+    if public_only:
+        query = query.filter(model.is_public == True)
+    if location:
+        query = query.filter(model.location.ilike(f"%{location}%"))
+    if near:
+        query = query.filter(within_radius_clause(model, *near))
+    return query.order_by(sort_column.desc().nulls_last(), model.id).limit(limit).all()
+
+# section -> (model, name columns, public only, sort column, public schema)
+SEARCH_SOURCES = {
+    "creators": (
+        CreatorProfile, (CreatorProfile.display_name, CreatorProfile.handle), True,
+        CreatorProfile.xp_score, CreatorProfilePublic
+    ),
+    "brands": (
+        BrandProfile, (BrandProfile.brand_name,), False,
+        BrandProfile.total_campaigns, BrandProfilePublic
+    ),
+    "agencies": (
+        AgencyProfile, (AgencyProfile.agency_name,), False,
+        AgencyProfile.total_campaigns_run, AgencyProfilePublic
+    ),
+}
+
+def _run_search_source(section: str, deadline: float, q, location, near, limit) -> list:
+    """One search section on its own session, cut off by the database at the deadline"""
+    model, name_columns, public_only, sort_column, schema = SEARCH_SOURCES[section]
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise TimeoutError(section)
+    db = SessionLocal()
+    try:
+        # Abandoned queries must not keep running after the response is sent
+        db.execute(text(f"SET LOCAL statement_timeout = {remaining_ms}"))
+        profiles = _search_profiles(db, model, name_columns, public_only, sort_column, q, location, near, limit, schema)
+        # Serialize here, while the session that loaded the rows is still open
+        return [schema.model_validate(profile) for profile in profiles]
+    finally:
+        db.close()
+
+def search_all(
+    q: str,
+    limit: int = 5,
+    location: Optional[str] = None,
+    near: Optional[tuple] = None,
+    deadline_ms: Optional[int] = None
+) -> dict:
+    """
+    Search creators, brands and agencies by name concurrently, each on its
+    own connection. Sections not finished by the deadline (or that fail) are
+    returned empty and listed in incomplete, so one slow source only costs
+    its own section.
+    """
+    deadline_ms = deadline_ms or settings.SEARCH_DEADLINE_MS
+    deadline = time.monotonic() + deadline_ms / 1000
+    futures = {
+        section: _search_executor.submit(_run_search_source, section, deadline, q, location, near, limit)
+        for section in SEARCH_SOURCES
+    }
+    wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+    result = {section: [] for section in SEARCH_SOURCES}
+    result["incomplete"] = []
+    for section, future in futures.items():
+        if future.done() and future.exception() is None:
+            result[section] = future.result()
+        else:
+            future.cancel()
+            result["incomplete"].append(section)
+    return result
\ No newline at end of file
@@ -0,0 +1,106 @@
+import argparse
+import sys
+import time
+from sqlalchemy import any_, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+from typing import Callable, List, Optional
+from app.crud.creator import refresh_creator_matches, xp_score_sql
+from app.db.models.creator import CreatorProfile
+from app.utils.result_cache import discovery_cache
+
+# Profiles scored per UPDATE; each chunk is its own short transaction
+XP_RECOMPUTE_CHUNK_ROWS = 5000
+
+def _next_chunk(db: Session, full: bool, after, chunk_rows: int) -> List:
+    """Next chunk of creator ids in primary key order (only stale ones unless full)"""
+    query = select(CreatorProfile.id).order_by(CreatorProfile.id).limit(chunk_rows)
+    if not full:
+        query = query.where(CreatorProfile.xp_dirty == True)
+    if after is not None:
+        query = query.where(CreatorProfile.id > after)
+    return list(db.execute(query).scalars())
+
+def _rescore_chunk(db: Session, ids: List) -> List[CreatorProfile]:
+    """
+    Recompute xp_score for ids in one set-based UPDATE and return the updated
+    profiles. Rows whose score is unchanged and not marked stale are left
+    alone, so a full run after a no-op formula change writes nothing.
+    """
+    score = xp_score_sql()
+    statement = update(CreatorProfile) \
+        .where(CreatorProfile.id == any_(literal(ids, ARRAY(UUID(as_uuid=True))))) \
+        .where(or_(CreatorProfile.xp_dirty == True, CreatorProfile.xp_score.is_distinct_from(score))) \
+        .values(xp_score=score, xp_dirty=False) \
+        .returning(CreatorProfile)
+    updated = db.execute(statement, execution_options={"synchronize_session": False}).scalars().all()
+    # Detached instances keep the RETURNING values through the commit
+    for profile in updated:
+        db.expunge(profile)
+    db.commit()
+    return updated
+
+def _update_rate(stats: dict, started: float) -> None:
+    elapsed = time.monotonic() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_second"] = round(stats["scanned"] / elapsed, 1) if elapsed else 0.0
+
+def recompute_xp_scores(
+    db: Session,
+    full: bool = False,
+    chunk_rows: int = XP_RECOMPUTE_CHUNK_ROWS,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Recompute creator XP scores with the SQL form of calculate_xp_score.
+    Incremental mode walks only profiles marked xp_dirty; full mode walks
+    every profile (run it after changing the formula). Rows are keyset-paged
+    by id in chunks, each scored and written by one UPDATE, and progress(stats)
+    is called after every chunk. Changed rows get a new updated_at, so
+    workers' in-process indexes pick up the new scores on their next poll;
+    each chunk's rescored creators are re-ranked in the brand match lists
+    and the cached creator discovery pages are invalidated.
+    """
+    started = time.monotonic()
+    stats = {"mode": "full" if full else "dirty", "scanned": 0, "updated": 0, "chunks": 0}
+    after = None
+    while True:
+        ids = _next_chunk(db, full, after, chunk_rows)
+        if not ids:
+            break
+        updated = _rescore_chunk(db, ids)
+        if updated:
+            discovery_cache.bump("creator")
+            refresh_creator_matches(db, updated)
+        stats["updated"] += len(updated)
+        stats["scanned"] += len(ids)
+        stats["chunks"] += 1
+        after = ids[-1]
+        _update_rate(stats, started)
+        if progress is not None:
+            progress(dict(stats))
+
+    _update_rate(stats, started)
+    return stats
+
+def _print_progress(stats: dict) -> None:
+    print(
+        f"[xp {stats['mode']}] scanned {stats['scanned']} updated {stats['updated']} "
+        f"({stats['rows_per_second']} rows/s, {stats['seconds']}s)",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Recompute creator XP scores")
+    parser.add_argument("--full", action="store_true", help="Rescore every creator, not only stale ones")
+    parser.add_argument("--chunk-rows", type=int, default=XP_RECOMPUTE_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = recompute_xp_scores(db, full=args.full, chunk_rows=args.chunk_rows, progress=_print_progress)
+    finally:
+        db.close()
+    _print_progress(result)
\ No newline at end of file
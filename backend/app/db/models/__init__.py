@@ -1,18 +1,26 @@
 from .user import User, UserRole
 from .otp import UserOTP
-from .creator import CreatorProfile, ContentTypeEnum, CreatorTypeEnum
-from .brand import BrandProfile, BrandTypeEnum
-from .agency import AgencyProfile, AgencyTypeEnum
+from .creator import CreatorProfile, CreatorFacetCount, CreatorDuplicateFlag, ContentTypeEnum, CreatorTypeEnum
+from .brand import BrandProfile, BrandCreatorMatch, BrandTypeEnum
+from .agency import AgencyProfile, AgencyRosterInvite, AgencyTypeEnum
+from .metric_event import ProcessedMetricEvent
+from .currency import CurrencyRate
 
 __all__ = [
     "User", 
     "UserRole",
     "UserOTP",
     "CreatorProfile", 
+    "CreatorFacetCount",
+    "CreatorDuplicateFlag",
     "ContentTypeEnum", 
     "CreatorTypeEnum",
     "BrandProfile", 
+    "BrandCreatorMatch",
     "BrandTypeEnum",
     "AgencyProfile", 
-    "AgencyTypeEnum"
+    "AgencyRosterInvite",
+    "AgencyTypeEnum",
+    "ProcessedMetricEvent",
+    "CurrencyRate"
 ]
\ No newline at end of file
@@ -2,7 +2,7 @@ import uuid
 import enum
 from sqlalchemy import (
     Column, String, Text, Boolean, DateTime, ForeignKey,
-    JSON, Integer, Float, Enum
+    JSON, Integer, Float, Enum, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -41,6 +41,10 @@ class AgencyProfile(Base):
     language = Column(String, comment="Primary business language")
     contact_email = Column(String, comment="Business contact email")
     contact_phone = Column(String, comment="Business phone number")
+    # Geocoded from location against the bundled gazetteer (app/utils/geo.py)
+    latitude = Column(Float, nullable=True, comment="Latitude of the geocoded location")
+    longitude = Column(Float, nullable=True, comment="Longitude of the geocoded location")
+    geohash = Column(String(12), nullable=True, comment="Geohash of latitude/longitude for radius search")
     
     # Social presence
     social_links = Column(JSON, nullable=True, comment="Agency social media links")
@@ -63,4 +67,46 @@ class AgencyProfile(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship back to user
-    user = relationship("User", backref="agency_profile")
\ No newline at end of file
+    user = relationship("User", backref="agency_profile")
+
+# Discovery sort indexes (agencies have no is_public flag, so these are full indexes)
+Index(
+    "ix_agency_profiles_total_campaigns_run",
+    AgencyProfile.total_campaigns_run.desc().nulls_last(), AgencyProfile.id
+)
+Index(
+    "ix_agency_profiles_created_at",
+    AgencyProfile.created_at.desc().nulls_last(), AgencyProfile.id
+)
+# Radius search: geohash prefix ranges (LIKE 'prefix%')
+Index(
+    "ix_agency_profiles_geohash",
+    AgencyProfile.geohash,
+    postgresql_ops={"geohash": "varchar_pattern_ops"}
+)
+
+class AgencyRosterInvite(Base):
+    """
+    An agency's request to manage a creator or brand. The profile only joins
+    the roster (agency_id set) when its owner accepts from their own account.
+    """
+    __tablename__ = "agency_roster_invites"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    agency_id = Column(UUID(as_uuid=True), ForeignKey("agency_profiles.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(16), nullable=False, comment="Roster kind: creators or brands")
+    profile_id = Column(UUID(as_uuid=True), nullable=False, comment="Invited creator or brand profile ID")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    agency = relationship("AgencyProfile")
+
+# One pending invite per agency and profile; the owner lists theirs by (kind, profile_id)
+Index(
+    "ix_agency_roster_invites_agency_profile",
+    AgencyRosterInvite.agency_id, AgencyRosterInvite.kind, AgencyRosterInvite.profile_id,
+    unique=True
+)
+Index(
+    "ix_agency_roster_invites_profile",
+    AgencyRosterInvite.kind, AgencyRosterInvite.profile_id, AgencyRosterInvite.created_at
+)
\ No newline at end of file
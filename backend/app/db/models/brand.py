@@ -2,7 +2,7 @@ import uuid
 import enum
 from sqlalchemy import (
     Column, String, Text, Boolean, DateTime, ForeignKey,
-    JSON, Integer, Float, Enum
+    JSON, Integer, Float, Enum, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -40,6 +40,10 @@ class BrandProfile(Base):
     location = Column(String, comment="Brand headquarters location")
     language = Column(String, comment="Primary business language")
     contact_email = Column(String, comment="Business contact email")
+    # Geocoded from location against the bundled gazetteer (app/utils/geo.py)
+    latitude = Column(Float, nullable=True, comment="Latitude of the geocoded location")
+    longitude = Column(Float, nullable=True, comment="Longitude of the geocoded location")
+    geohash = Column(String(12), nullable=True, comment="Geohash of latitude/longitude for radius search")
 
     # Campaign preferences and targeting
     campaign_preferences = Column(JSON, nullable=True, comment="Preferred platforms, niches: {'platforms': ['instagram'], 'niches': ['fashion']}")
@@ -59,10 +63,56 @@ class BrandProfile(Base):
     # Agency relationship (if managed by an agency)
     agency_id = Column(UUID(as_uuid=True), ForeignKey("agency_profiles.id"), nullable=True, comment="Managing agency ID if applicable")
 
+    # Persisted creator recommendations (brand_creator_matches)
+    matches_built_at = Column(DateTime(timezone=True), nullable=True, comment="When the match list was last built; NULL until the first build")
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     user = relationship("User", backref="brand_profile")
-    # agency = relationship("AgencyProfile", backref="managed_brands")
\ No newline at end of file
+    agency = relationship("AgencyProfile", backref="managed_brands")
+
+class BrandCreatorMatch(Base):
+    """
+    Persisted top-N creator recommendations per brand.
+    Rebuilt when the brand's preferences change; a creator write re-scores
+    only that creator against each brand's list.
+    """
+    __tablename__ = "brand_creator_matches"
+
+    brand_id = Column(UUID(as_uuid=True), ForeignKey("brand_profiles.id", ondelete="CASCADE"), primary_key=True)
+    creator_id = Column(UUID(as_uuid=True), ForeignKey("creator_profiles.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, comment="Match score (0-1)")
+    components = Column(JSON, nullable=True, comment="Per-component score breakdown")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# Dashboard read: one brand's list, best first
+Index(
+    "ix_brand_creator_matches_brand_score",
+    BrandCreatorMatch.brand_id, BrandCreatorMatch.score.desc(), BrandCreatorMatch.creator_id
+)
+
+# Discovery sort indexes (brands have no is_public flag, so these are full indexes)
+Index(
+    "ix_brand_profiles_total_campaigns",
+    BrandProfile.total_campaigns.desc().nulls_last(), BrandProfile.id
+)
+Index(
+    "ix_brand_profiles_created_at",
+    BrandProfile.created_at.desc().nulls_last(), BrandProfile.id
+)
+# Agency roster: keyset pages ordered by (brand_name, id) per agency
+Index(
+    "ix_brand_profiles_agency_roster",
+    BrandProfile.agency_id, BrandProfile.brand_name, BrandProfile.id,
+    postgresql_where=BrandProfile.agency_id.isnot(None)
+)
+
+# Radius search: geohash prefix ranges (LIKE 'prefix%')
+Index(
+    "ix_brand_profiles_geohash",
+    BrandProfile.geohash,
+    postgresql_ops={"geohash": "varchar_pattern_ops"}
+)
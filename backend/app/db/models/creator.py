@@ -1,10 +1,10 @@
 import uuid
 import enum
 from sqlalchemy import (
-    Column, String, Text, Boolean, DateTime, Enum, ForeignKey, JSON, Integer, Float, ARRAY
+    Column, String, Text, Boolean, DateTime, Enum, ForeignKey, JSON, Integer, Float, Index
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.sql import func, true
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -45,6 +45,10 @@ class CreatorProfile(Base):
     platforms = Column(JSON, nullable=True, comment="Platform data: [{'platform': 'instagram', 'followers': 50000}]")
     location = Column(String, comment="Geographic location")
     language = Column(String, comment="Primary language")
+    # Geocoded from location against the bundled gazetteer (app/utils/geo.py)
+    latitude = Column(Float, nullable=True, comment="Latitude of the geocoded location")
+    longitude = Column(Float, nullable=True, comment="Longitude of the geocoded location")
+    geohash = Column(String(12), nullable=True, comment="Geohash of latitude/longitude for radius search")
     
     # Pricing and business information
     pricing_info = Column(JSON, nullable=True, comment="Pricing structure: [{'platform': 'instagram', 'type': 'post', 'price': 500}]")
@@ -62,6 +66,10 @@ class CreatorProfile(Base):
     total_campaigns = Column(Integer, default=0, comment="Total campaigns completed")
     total_earnings = Column(Float, default=0.0, comment="Total earnings from platform")
     xp_score = Column(Float, default=0.0, comment="Experience/reputation score")
+    xp_dirty = Column(
+        Boolean, default=True, server_default=true(), nullable=False,
+        comment="xp_score is stale; recomputed by python -m app.crud.xp"
+    )
     creator_type = Column(Enum(CreatorTypeEnum), nullable=True, comment="Creator tier classification")
 
     # Additional profile enhancements
@@ -70,9 +78,123 @@ class CreatorProfile(Base):
     portfolio_items = Column(JSON, nullable=True, comment="Portfolio items: [{'title': 'Campaign Name', 'url': 'link'}]")
     tags = Column(ARRAY(String), nullable=True, comment="Skill/niche tags for discovery")
 
+    # Agency relationship (if managed by an agency)
+    agency_id = Column(UUID(as_uuid=True), ForeignKey("agency_profiles.id"), nullable=True, comment="Managing agency ID if applicable")
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationship back to user
-    user = relationship("User", backref="creator_profile")
\ No newline at end of file
+    # Relationships
+    user = relationship("User", backref="creator_profile")
+    agency = relationship("AgencyProfile", backref="managed_creators")
+
+class CreatorFacetCount(Base):
+    """
+    Incrementally maintained count of public creator profiles per facet value.
+    Facets are content_type, creator_type, location and tag, plus ("total", "").
+    Updated in the same transaction as every creator profile write.
+    """
+    __tablename__ = "creator_facet_counts"
+
+    facet = Column(String, primary_key=True, comment="Facet name")
+    value = Column(String, primary_key=True, comment="Facet value (enum values as shown in the API)")
+    count = Column(Integer, nullable=False, default=0, comment="Number of public profiles with this value")
+
+class CreatorDuplicateFlag(Base):
+    """
+    A creator profile whose bio, handle and social links nearly duplicate an
+    older profile's, for moderation. Recorded when the profile is written
+    (app/utils/near_duplicates.py) and rebuilt by python -m app.crud.duplicates.
+    """
+    __tablename__ = "creator_duplicate_flags"
+
+    creator_id = Column(UUID(as_uuid=True), ForeignKey("creator_profiles.id", ondelete="CASCADE"), primary_key=True)
+    duplicate_of_id = Column(UUID(as_uuid=True), ForeignKey("creator_profiles.id", ondelete="CASCADE"), primary_key=True)
+    similarity = Column(Float, nullable=False, comment="Estimated Jaccard similarity (0-1)")
+    flagged_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+# Discovery sort indexes. Each one is partial on is_public = true and ends with
+# the primary key as a tie-breaker, so "top N by <column>" over public profiles
+# is an index scan that stops after N rows instead of a full scan and sort.
+Index(
+    "ix_creator_profiles_public_xp_score",
+    CreatorProfile.xp_score.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+Index(
+    "ix_creator_profiles_public_engagement",
+    CreatorProfile.avg_engagement_rate.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+Index(
+    "ix_creator_profiles_public_total_campaigns",
+    CreatorProfile.total_campaigns.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+Index(
+    "ix_creator_profiles_public_created_at",
+    CreatorProfile.created_at.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+
+# Composite discovery filter indexes: (filter column, xp_score DESC, id) on public
+# rows. The planner in app/crud/creator.py drives the query from whichever of
+# these matches the most selective filter.
+Index(
+    "ix_creator_profiles_public_content_type_xp",
+    CreatorProfile.content_type, CreatorProfile.xp_score.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+Index(
+    "ix_creator_profiles_public_creator_type_xp",
+    CreatorProfile.creator_type, CreatorProfile.xp_score.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+Index(
+    "ix_creator_profiles_public_language_xp",
+    CreatorProfile.language, CreatorProfile.xp_score.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=CreatorProfile.is_public == True
+)
+Index(
+    "ix_creator_profiles_public_verified_xp",
+    CreatorProfile.xp_score.desc().nulls_last(), CreatorProfile.id,
+    postgresql_where=(CreatorProfile.is_public == True) & (CreatorProfile.is_verified == True)
+)
+Index(
+    "ix_creator_profiles_public_tags",
+    CreatorProfile.tags,
+    postgresql_using="gin",
+    postgresql_where=CreatorProfile.is_public == True
+)
+
+# Radius search: geohash prefix ranges (LIKE 'prefix%') over public profiles
+Index(
+    "ix_creator_profiles_public_geohash",
+    CreatorProfile.geohash,
+    postgresql_ops={"geohash": "varchar_pattern_ops"},
+    postgresql_where=CreatorProfile.is_public == True
+)
+
+# Agency roster: keyset pages ordered by (display_name, id) per agency
+Index(
+    "ix_creator_profiles_agency_roster",
+    CreatorProfile.agency_id, CreatorProfile.display_name, CreatorProfile.id,
+    postgresql_where=CreatorProfile.agency_id.isnot(None)
+)
+
+# Incremental XP recompute walks only the stale profiles
+Index(
+    "ix_creator_profiles_xp_dirty",
+    CreatorProfile.id,
+    postgresql_where=CreatorProfile.xp_dirty == True
+)
+
+# Moderation queue: most recently flagged first
+Index("ix_creator_duplicate_flags_flagged_at", CreatorDuplicateFlag.flagged_at.desc())
+
+# Change-feed index: the discovery index polls for rows changed since its watermark
+Index(
+    "ix_creator_profiles_changed_at",
+    func.coalesce(CreatorProfile.updated_at, CreatorProfile.created_at)
+)
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Float, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class CurrencyRate(Base):
+    """
+    Exchange rate overrides for quotes. Currencies not listed here use the
+    bundled defaults in app/data/currency_rates.csv.
+    """
+    __tablename__ = "currency_rates"
+
+    code = Column(String(3), primary_key=True, comment="ISO 4217 currency code")
+    usd_per_unit = Column(Float, nullable=False, comment="Value of one unit in US dollars")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
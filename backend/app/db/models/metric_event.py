@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ProcessedMetricEvent(Base):
+    """
+    Ids of metric events already applied to profile metrics.
+    Written in the same transaction as the metric update, so a replayed
+    event is recognised and skipped.
+    """
+    __tablename__ = "processed_metric_events"
+
+    event_id = Column(String(128), primary_key=True, comment="Producer-assigned unique event id")
+    processed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+# Lets old ids be pruned once producers can no longer replay them
+Index("ix_processed_metric_events_processed_at", ProcessedMetricEvent.processed_at)
\ No newline at end of file
@@ -1,11 +1,21 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
 from app.api.auth import router as auth_router
 from app.api.creator.profile import router as creator_profile_router
+from app.api.creator.leaderboard import router as creator_leaderboard_router
 from app.api.brand.profile import router as brand_profile_router
+from app.api.brand.quote import router as brand_quote_router
 from app.api.agency.profile import router as agency_profile_router
+from app.api.search.suggest import router as suggest_router
+from app.api.search.search import router as search_router
+from app.api.metrics.events import router as metric_events_router
+from app.crud.metrics import metric_ingest_worker
 from app.db.base import Base
 from app.db.session import engine
+from app.utils.compression import CompressionMiddleware
+from app.utils.result_cache import discovery_cache
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -43,6 +53,7 @@ app = FastAPI(
     license_info={
         "name": "MIT",
     },
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -54,11 +65,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression; discovery cache hits arrive already encoded and pass through
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 # Include routers
 app.include_router(auth_router, prefix="/auth")
 app.include_router(creator_profile_router, prefix="/api")
+app.include_router(creator_leaderboard_router, prefix="/api")
 app.include_router(brand_profile_router, prefix="/api")
+app.include_router(brand_quote_router, prefix="/api")
 app.include_router(agency_profile_router, prefix="/api")
+app.include_router(suggest_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
+app.include_router(metric_events_router, prefix="/api")
+
+@app.on_event("shutdown")
+def flush_metric_events():
+    """Apply buffered metric events before the worker exits"""
+    metric_ingest_worker.stop(timeout=10)
 
 @app.get("/")
 async def root():
@@ -89,6 +113,14 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for this worker process"""
+    return {
+        "discovery_cache": discovery_cache.stats(),
+        "metric_ingest": metric_ingest_worker.stats()
+    }
+
 @app.get("/api/version")
 async def api_version():
     """API version endpoint for auto-refresh functionality"""
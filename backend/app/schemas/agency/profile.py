@@ -1,7 +1,15 @@
+import enum
 from pydantic import BaseModel, HttpUrl, UUID4, EmailStr
 from typing import Optional, Dict, List
 from datetime import datetime
 from app.db.models.agency import AgencyTypeEnum
+from app.schemas.brand.profile import BrandProfilePublic
+from app.schemas.creator.profile import CreatorProfilePublic
+
+class AgencySortEnum(str, enum.Enum):
+    """Discovery sort orders for agencies (highest/newest first)"""
+    TOTAL_CAMPAIGNS = "total_campaigns"
+    CREATED_AT = "created_at"
 
 class TeamMember(BaseModel):
     """Team member information"""
@@ -70,8 +78,32 @@ class AgencyProfilePublic(BaseModel):
     logo_url: Optional[str] = None
     website_url: Optional[HttpUrl] = None
     location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     total_campaigns_run: int = 0
     is_verified: bool = False
 
+    class Config:
+        from_attributes = True
+
+class CreatorRosterPage(BaseModel):
+    """One keyset page of an agency's creator roster"""
+    items: List[CreatorProfilePublic]
+    next_cursor: Optional[str] = None
+
+class BrandRosterPage(BaseModel):
+    """One keyset page of an agency's brand roster"""
+    items: List[BrandProfilePublic]
+    next_cursor: Optional[str] = None
+
+class RosterInviteOut(BaseModel):
+    """A pending request from an agency to manage a creator or brand"""
+    id: UUID4
+    agency_id: UUID4
+    kind: str  # creators or brands
+    profile_id: UUID4
+    created_at: Optional[datetime] = None
+    agency: Optional[AgencyProfilePublic] = None
+
     class Config:
         from_attributes = True
\ No newline at end of file
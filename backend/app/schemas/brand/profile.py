@@ -1,7 +1,14 @@
+import enum
 from pydantic import BaseModel, HttpUrl, UUID4, EmailStr
 from typing import Optional, Dict, List
 from datetime import datetime
 from app.db.models.brand import BrandTypeEnum
+from app.schemas.creator.profile import CreatorProfilePublic
+
+class BrandSortEnum(str, enum.Enum):
+    """Discovery sort orders for brands (highest/newest first)"""
+    TOTAL_CAMPAIGNS = "total_campaigns"
+    CREATED_AT = "created_at"
 
 class BudgetRange(BaseModel):
     """Budget range for campaigns"""
@@ -72,8 +79,16 @@ class BrandProfilePublic(BaseModel):
     logo_url: Optional[str] = None
     website_url: Optional[HttpUrl] = None
     location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     total_campaigns: int = 0
     is_verified: bool = False
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CreatorMatch(BaseModel):
+    """A creator scored against the brand's campaign preferences"""
+    creator: CreatorProfilePublic
+    score: float  # 0-1, weighted mean of the components
+    components: Dict[str, float]  # niche, tier, content_type, platform, price, xp
@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+from uuid import UUID
+from app.schemas.shared.batch import MAX_BATCH_IDS
+
+class QuoteDeliverable(BaseModel):
+    """A deliverable every selected creator is quoted for, e.g. 2 instagram reels"""
+    platform: str = Field(..., min_length=1, max_length=50)
+    content_type: str = Field(..., min_length=1, max_length=50)
+    quantity: int = Field(1, ge=1, le=100)
+
+class QuoteRequest(BaseModel):
+    creator_ids: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+    deliverables: List[QuoteDeliverable] = Field(..., min_length=1, max_length=20)
+    currency: str = Field("USD", min_length=3, max_length=3, description="Currency for the quote")
+
+class QuoteLineItem(BaseModel):
+    """One deliverable priced from the creator's pricing_info, in the quote currency"""
+    platform: str
+    content_type: str
+    quantity: int
+    unit_price: float
+    subtotal: float
+    price: float  # as listed by the creator
+    price_currency: str
+
+class MissingPrice(BaseModel):
+    """A deliverable the creator could not be quoted for"""
+    platform: str
+    content_type: str
+    reason: str  # no_price or unknown_currency
+
+class CreatorQuote(BaseModel):
+    creator_id: UUID
+    display_name: str
+    handle: str
+    line_items: List[QuoteLineItem]
+    missing: List[MissingPrice]
+    subtotal: float
+
+class CampaignQuote(BaseModel):
+    """
+    Quote for a set of creators and deliverables. total only sums priced
+    line items; creators with missing prices are listed in incomplete.
+    Unknown or private creator IDs are listed in not_found. rates_used gives
+    the conversion applied per listed currency (quote currency per unit).
+    """
+    currency: str
+    creators: List[CreatorQuote]
+    total: float
+    incomplete: List[UUID]
+    not_found: List[UUID]
+    rates_used: Dict[str, float] = {}
\ No newline at end of file
@@ -1,8 +1,16 @@
+import enum
 from pydantic import BaseModel, HttpUrl, UUID4
 from typing import List, Optional, Dict
 from datetime import datetime
 from app.db.models.creator import ContentTypeEnum, CreatorTypeEnum
 
+class CreatorSortEnum(str, enum.Enum):
+    """Discovery sort orders for creators (highest/newest first)"""
+    XP_SCORE = "xp_score"
+    AVG_ENGAGEMENT_RATE = "avg_engagement_rate"
+    TOTAL_CAMPAIGNS = "total_campaigns"
+    CREATED_AT = "created_at"
+
 class PlatformInfo(BaseModel):
     """Platform follower information for creators"""
     platform: str
@@ -88,6 +96,8 @@ class CreatorProfilePublic(BaseModel):
     content_type: ContentTypeEnum
     platforms: Optional[List[PlatformInfo]] = None
     location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     profile_image_url: Optional[str] = None
     cover_image_url: Optional[str] = None
     creator_type: Optional[CreatorTypeEnum] = None
@@ -98,4 +108,43 @@ class CreatorProfilePublic(BaseModel):
     is_verified: bool = False
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SimilarCreator(BaseModel):
+    """A public creator similar to the requested one"""
+    creator: CreatorProfilePublic
+    similarity: float  # cosine similarity of bio/tags/content type vectors, 0-1
+
+class FacetCount(BaseModel):
+    """Number of matching profiles for one facet value"""
+    value: str
+    count: int
+
+class CreatorDiscoveryPage(BaseModel):
+    """Discovery page with the totals/facets requested via include="""
+    items: List[CreatorProfilePublic]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+class LeaderboardEntry(BaseModel):
+    """A creator's position on a leaderboard"""
+    rank: int
+    xp_score: float
+    creator: CreatorProfilePublic
+
+class LeaderboardRank(BaseModel):
+    rank: int
+    xp_score: float
+
+class CreatorLeaderboardPage(BaseModel):
+    """
+    One page of a top-creators-by-XP board. dimension is overall,
+    content_type, creator_type or tag; me is the caller's own rank on the
+    board (None if the caller is not a public creator on it).
+    """
+    dimension: str
+    value: Optional[str] = None
+    total: int
+    items: List[LeaderboardEntry]
+    me: Optional[LeaderboardRank] = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import List
+from uuid import UUID
+
+# Largest id list a batch profile request accepts
+MAX_BATCH_IDS = 200
+
+class ProfileBatchRequest(BaseModel):
+    """Profile IDs to fetch in one request (e.g. a shortlist or roster page)"""
+    ids: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
\ No newline at end of file
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from uuid import UUID
+
+# Largest number of events one ingestion request accepts
+MAX_INGEST_EVENTS = 1000
+
+class MetricEvent(BaseModel):
+    """
+    One metric change for a profile, identified by its owner's user id.
+    Deltas are added to the profile's totals; engagement_rate replaces the
+    creator's average. Which deltas apply depends on profile_type:
+    creator (campaigns, earnings, engagement_rate), brand (campaigns, spend),
+    agency (campaigns, earnings, spend).
+    """
+    event_id: str = Field(..., min_length=1, max_length=128, description="Unique id; replays are ignored")
+    profile_type: Literal["creator", "brand", "agency"]
+    user_id: UUID
+    campaigns: int = Field(0, ge=0, description="Campaigns completed (creator, agency) or launched (brand)")
+    earnings: float = Field(0.0, ge=0)
+    spend: float = Field(0.0, ge=0)
+    engagement_rate: Optional[float] = Field(None, ge=0, le=1)
+
+class MetricEventBatch(BaseModel):
+    events: List[MetricEvent] = Field(..., min_length=1, max_length=MAX_INGEST_EVENTS)
+
+class MetricIngestAccepted(BaseModel):
+    """Events queued for the next batch; duplicates were already queued"""
+    accepted: int
+    duplicates: int
+    pending: int
\ No newline at end of file
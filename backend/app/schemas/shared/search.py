@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.agency.profile import AgencyProfilePublic
+from app.schemas.brand.profile import BrandProfilePublic
+from app.schemas.creator.profile import CreatorProfilePublic
+
+class Suggestion(BaseModel):
+    """One typeahead suggestion; id is the profile ID (None for tags)"""
+    kind: str
+    text: str
+    id: Optional[str] = None
+
+class HandleAvailability(BaseModel):
+    """available is advisory; profile creation enforces unique handles"""
+    handle: str
+    available: bool
+
+class SearchResults(BaseModel):
+    """
+    Blended cross-entity search results, one section per profile type.
+    Sections named in incomplete missed the deadline and are empty.
+    """
+    creators: List[CreatorProfilePublic] = []
+    brands: List[BrandProfilePublic] = []
+    agencies: List[AgencyProfilePublic] = []
+    incomplete: List[str] = []
\ No newline at end of file
@@ -0,0 +1,205 @@
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Optional codecs: offered only when the module is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Media types worth compressing (prefix match); images, archives etc. are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+class _GzipStream:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class _ZstdStream:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+# Content-Encoding -> streaming compressor, in server preference order
+STREAMS = {"gzip": _GzipStream}
+if brotli is not None:
+    STREAMS = {"br": _BrotliStream, **STREAMS}
+if zstandard is not None:
+    STREAMS = {"zstd": _ZstdStream, **STREAMS}
+
+def available_encodings() -> List[str]:
+    return list(STREAMS)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Whole body in one go"""
+    stream = STREAMS[encoding]()
+    return stream.compress(data) + stream.finish()
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Best supported Content-Encoding for an Accept-Encoding header, or None for
+    identity. Highest q-value wins; ties go to the server's preference order.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    wildcard = weights.get("*")
+    best, best_q = None, 0.0
+    for encoding in STREAMS:
+        q = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+def _vary_on_encoding(headers: MutableHeaders) -> None:
+    if "accept-encoding" not in headers.get("vary", "").lower():
+        headers.add_vary_header("Accept-Encoding")
+
+def weak_etag(etag: str) -> str:
+    """Encoded bodies differ byte for byte, so a strong validator becomes weak"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best encoding the client accepts
+    (zstd, br or gzip, as installed). Bodies under minimum_size, already
+    encoded responses (e.g. compressed cache hits) and non-text media types
+    pass through. Streaming responses are compressed chunk by chunk and
+    flushed after every chunk, so each one reaches the client immediately.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+class _CompressingResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start: Optional[Message] = None
+        self.stream = None
+        # None until the first body message decides whether to compress
+        self.compressing: Optional[bool] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _should_compress(self, body: bytes, more_body: bool) -> bool:
+        headers = Headers(raw=self.start["headers"])
+        if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+            return False
+        return more_body or len(body) >= self.minimum_size
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        _vary_on_encoding(headers)
+        if "etag" in headers:
+            headers["ETag"] = weak_etag(headers["etag"])
+        return headers
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressing is None:
+            self.compressing = self._should_compress(body, more_body)
+            if not self.compressing:
+                if is_compressible(Headers(raw=self.start["headers"]).get("content-type")):
+                    _vary_on_encoding(MutableHeaders(raw=self.start["headers"]))
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.stream = STREAMS[self.encoding]()
+            headers = self._encoded_headers()
+            if more_body:
+                del headers["Content-Length"]
+                chunk = self.stream.compress(body) + self.stream.flush()
+            else:
+                chunk = self.stream.compress(body) + self.stream.finish()
+                headers["Content-Length"] = str(len(chunk))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        if not self.compressing:
+            await self.send(message)
+            return
+        chunk = self.stream.compress(body) + (self.stream.flush() if more_body else self.stream.finish())
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
\ No newline at end of file
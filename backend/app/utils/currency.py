@@ -0,0 +1,58 @@
+import csv
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.currency import CurrencyRate
+
+# Bundled default rates: code,usd_per_unit
+CURRENCY_RATES_PATH = Path(__file__).resolve().parent.parent / "data" / "currency_rates.csv"
+
+@lru_cache(maxsize=1)
+def load_default_rates() -> Dict[str, float]:
+    """Currency code -> US dollars per unit, from the bundled table"""
+    with open(CURRENCY_RATES_PATH, newline="", encoding="utf-8") as f:
+        return {record["code"].upper(): float(record["usd_per_unit"]) for record in csv.DictReader(f)}
+
+def convert(amount: float, source: str, target: str, rates: Dict[str, float]) -> Optional[float]:
+    """amount in source currency expressed in target, None if either rate is unknown"""
+    source_rate, target_rate = rates.get(source.upper()), rates.get(target.upper())
+    if source_rate is None or target_rate is None:
+        return None
+    return amount * source_rate / target_rate
+
+class CurrencyRateCache:
+    """
+    Exchange rates for this worker: the bundled defaults overlaid by the
+    currency_rates table, reloaded at most every ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._rates: Optional[Dict[str, float]] = None
+        self._loaded_at = 0.0
+
+    def get(self, db: Session) -> Dict[str, float]:
+        """Currency code -> US dollars per unit"""
+        with self._lock:
+            if self._rates is None or time.monotonic() - self._loaded_at >= self.ttl_seconds:
+                overrides = {
+                    code.upper(): rate
+                    for code, rate in db.query(CurrencyRate.code, CurrencyRate.usd_per_unit)
+                    if rate and rate > 0
+                }
+                self._rates = {**load_default_rates(), **overrides}
+                self._loaded_at = time.monotonic()
+            return self._rates
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rates = None
+
+currency_rates = CurrencyRateCache(settings.CURRENCY_RATE_CACHE_SECONDS)
\ No newline at end of file
@@ -0,0 +1,450 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.creator import CreatorProfile, ContentTypeEnum, CreatorTypeEnum
+from app.schemas.creator.profile import CreatorSortEnum
+from app.utils.geo import haversine_km
+from app.utils.matching import (
+    MATCH_BATCH_ROWS,
+    TopKMatches,
+    enum_preference_codes,
+    min_price,
+    score_creators
+)
+
+# Re-read rows changed slightly before the watermark on every poll, so rows
+# committed late by a concurrent transaction are not missed
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+CONTENT_TYPE_CODES = {member: code for code, member in enumerate(ContentTypeEnum)}
+CREATOR_TYPE_CODES = {member: code for code, member in enumerate(CreatorTypeEnum)}
+
+INDEXED_COLUMNS = (
+    CreatorProfile.id,
+    CreatorProfile.is_public,
+    CreatorProfile.is_verified,
+    CreatorProfile.content_type,
+    CreatorProfile.creator_type,
+    CreatorProfile.location,
+    CreatorProfile.latitude,
+    CreatorProfile.longitude,
+    CreatorProfile.language,
+    CreatorProfile.tags,
+    CreatorProfile.platforms,
+    CreatorProfile.pricing_info,
+    CreatorProfile.xp_score,
+    CreatorProfile.avg_engagement_rate,
+    CreatorProfile.total_campaigns,
+    CreatorProfile.created_at,
+    CreatorProfile.updated_at,
+)
+
+def total_followers(platforms) -> int:
+    """Sum follower counts across a creator's platforms JSON"""
+    if not platforms:
+        return 0
+    return sum(int(platform.get("followers") or 0) for platform in platforms)
+
+def platform_names(platforms) -> List[str]:
+    """Lower-cased platform names from a creator's platforms JSON"""
+    return [str(platform["platform"]).lower() for platform in platforms or [] if platform.get("platform")]
+
+class CreatorDiscoveryIndex:
+    """
+    In-process columnar snapshot of public creator profiles for discovery.
+    Holds one NumPy array per filter/sort field, tags as a bitset matrix and
+    locations/languages as ids into small string tables. Answers filter and
+    top-k queries with vectorized masks and returns profile ids; callers
+    hydrate only the final page from the database.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._size = 0
+        self._ids: List[uuid.UUID] = []
+        self._rows: Dict[uuid.UUID, int] = {}
+        self._tag_bits: Dict[str, int] = {}
+        self._location_ids: Dict[str, int] = {}
+        self._language_ids: Dict[str, int] = {}
+        # Platform name -> bit in the platforms bitmask (first 64 platforms seen)
+        self._platform_bits: Dict[str, int] = {}
+        self.watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+        self._allocate(capacity, 1)
+
+    def _allocate(self, capacity: int, tag_words: int):
+        """(Re)allocate column arrays, keeping existing rows"""
+        def grow(old, shape, dtype, fill):
+            new = np.full(shape, fill, dtype=dtype)
+            if old is not None:
+                new[tuple(slice(0, dim) for dim in old.shape)] = old
+            return new
+
+        self._alive = grow(getattr(self, "_alive", None), capacity, bool, False)
+        self._verified = grow(getattr(self, "_verified", None), capacity, bool, False)
+        self._content_type = grow(getattr(self, "_content_type", None), capacity, np.int8, -1)
+        self._creator_type = grow(getattr(self, "_creator_type", None), capacity, np.int8, -1)
+        self._location = grow(getattr(self, "_location", None), capacity, np.int32, -1)
+        self._language = grow(getattr(self, "_language", None), capacity, np.int32, -1)
+        self._latitude = grow(getattr(self, "_latitude", None), capacity, np.float64, np.nan)
+        self._longitude = grow(getattr(self, "_longitude", None), capacity, np.float64, np.nan)
+        self._tags = grow(getattr(self, "_tags", None), (capacity, tag_words), np.uint64, 0)
+        self._followers = grow(getattr(self, "_followers", None), capacity, np.int64, 0)
+        self._platforms = grow(getattr(self, "_platforms", None), capacity, np.uint64, 0)
+        self._min_price = grow(getattr(self, "_min_price", None), capacity, np.float64, np.nan)
+        self._id_hi = grow(getattr(self, "_id_hi", None), capacity, np.uint64, 0)
+        self._id_lo = grow(getattr(self, "_id_lo", None), capacity, np.uint64, 0)
+        # Sort keys: NULL is stored as -inf so DESC NULLS LAST falls out naturally
+        self._sort_keys = {
+            sort_by: grow(getattr(self, "_sort_keys", {}).get(sort_by), capacity, np.float64, -np.inf)
+            for sort_by in CreatorSortEnum
+        }
+
+    def __len__(self) -> int:
+        return int(self._alive[:self._size].sum())
+
+    def _string_id(self, table: Dict[str, int], value: Optional[str]) -> int:
+        if not value:
+            return -1
+        return table.setdefault(value, len(table))
+
+    def _tag_bit(self, tag: str) -> int:
+        bit = self._tag_bits.setdefault(tag, len(self._tag_bits))
+        if bit // 64 >= self._tags.shape[1]:
+            self._allocate(len(self._alive), self._tags.shape[1] * 2)
+        return bit
+
+    def _platform_mask(self, names: List[str], add: bool = False) -> np.uint64:
+        """Bitmask for platform names; unknown names are registered only when add is set"""
+        mask = 0
+        for name in names:
+            bit = self._platform_bits.get(name)
+            if bit is None and add and len(self._platform_bits) < 64:
+                bit = self._platform_bits[name] = len(self._platform_bits)
+            if bit is not None:
+                mask |= 1 << bit
+        return np.uint64(mask)
+
+    def apply_rows(self, rows) -> int:
+        """
+        Upsert rows (objects with the INDEXED_COLUMNS attributes) into the index.
+        Private profiles are kept as dead rows so they drop out of results.
+        Returns the number of rows applied.
+        """
+        applied = 0
+        with self._lock:
+            for row in rows:
+                position = self._rows.get(row.id)
+                if position is None:
+                    if self._size == len(self._alive):
+                        self._allocate(self._size * 2, self._tags.shape[1])
+                    position = self._size
+                    self._size += 1
+                    self._ids.append(row.id)
+                    self._rows[row.id] = position
+                    self._id_hi[position] = row.id.int >> 64
+                    self._id_lo[position] = row.id.int & 0xFFFFFFFFFFFFFFFF
+
+                self._alive[position] = bool(row.is_public)
+                self._verified[position] = bool(row.is_verified)
+                self._content_type[position] = CONTENT_TYPE_CODES.get(row.content_type, -1)
+                self._creator_type[position] = CREATOR_TYPE_CODES.get(row.creator_type, -1)
+                self._location[position] = self._string_id(self._location_ids, row.location)
+                self._language[position] = self._string_id(self._language_ids, row.language)
+                self._latitude[position] = np.nan if row.latitude is None else row.latitude
+                self._longitude[position] = np.nan if row.longitude is None else row.longitude
+                self._followers[position] = total_followers(row.platforms)
+                self._platforms[position] = self._platform_mask(platform_names(row.platforms), add=True)
+                self._min_price[position] = min_price(row.pricing_info)
+
+                self._tags[position] = 0
+                for tag in row.tags or []:
+                    word, bit = divmod(self._tag_bit(tag), 64)
+                    self._tags[position, word] |= np.uint64(1) << np.uint64(bit)
+
+                keys = self._sort_keys
+                keys[CreatorSortEnum.XP_SCORE][position] = sort_key(row.xp_score)
+                keys[CreatorSortEnum.AVG_ENGAGEMENT_RATE][position] = sort_key(row.avg_engagement_rate)
+                keys[CreatorSortEnum.TOTAL_CAMPAIGNS][position] = sort_key(row.total_campaigns)
+                keys[CreatorSortEnum.CREATED_AT][position] = sort_key(
+                    row.created_at.timestamp() if row.created_at else None
+                )
+
+                changed_at = row.updated_at or row.created_at
+                if changed_at and (self.watermark is None or changed_at > self.watermark):
+                    self.watermark = changed_at
+                applied += 1
+        return applied
+
+    def refresh(self, db: Session) -> int:
+        """
+        Incrementally load rows changed since the watermark (all rows on first call).
+        Uses the coalesce(updated_at, created_at) change-feed index.
+        """
+        changed_at = func.coalesce(CreatorProfile.updated_at, CreatorProfile.created_at)
+        query = db.query(*INDEXED_COLUMNS)
+        if self.watermark is not None:
+            query = query.filter(changed_at > self.watermark - REFRESH_OVERLAP)
+        applied = self.apply_rows(query.yield_per(5000))
+        self.last_refresh = time.monotonic()
+        return applied
+
+    def refresh_if_stale(self, db: Session, max_age_seconds: float) -> None:
+        """Poll for changes if the last refresh is older than max_age_seconds"""
+        if time.monotonic() - self.last_refresh >= max_age_seconds:
+            self.refresh(db)
+
+    def _tag_mask(self, tag: str, n: int) -> Optional[np.ndarray]:
+        """Rows carrying tag, or None for an unknown tag"""
+        bit = self._tag_bits.get(tag)
+        if bit is None:
+            return None
+        word, bit = divmod(bit, 64)
+        return (self._tags[:n, word] & (np.uint64(1) << np.uint64(bit))) != 0
+
+    def _id_at(self, position: int) -> uuid.UUID:
+        return self._ids[position]
+
+    def _tag_vocabulary(self):
+        return self._tag_bits.keys()
+
+    def _mask(self, filters: dict) -> np.ndarray:
+        """Boolean mask over rows matching the discovery filters"""
+        n = self._size
+        mask = self._alive[:n].copy()
+
+        if filters.get("content_type"):
+            codes = [CONTENT_TYPE_CODES[ContentTypeEnum(value)] for value in filters["content_type"]]
+            mask &= np.isin(self._content_type[:n], codes)
+
+        if filters.get("creator_type"):
+            codes = [CREATOR_TYPE_CODES[CreatorTypeEnum(value)] for value in filters["creator_type"]]
+            mask &= np.isin(self._creator_type[:n], codes)
+
+        if filters.get("language"):
+            ids = [self._language_ids[value] for value in filters["language"] if value in self._language_ids]
+            mask &= np.isin(self._language[:n], ids)
+
+        if filters.get("is_verified") is not None:
+            mask &= self._verified[:n] == bool(filters["is_verified"])
+
+        if filters.get("min_xp") is not None:
+            mask &= self._sort_keys[CreatorSortEnum.XP_SCORE][:n] >= filters["min_xp"]
+
+        for tag in filters.get("tags") or []:
+            tag_mask = self._tag_mask(tag, n)
+            if tag_mask is None:
+                mask[:] = False
+                break
+            mask &= tag_mask
+
+        if filters.get("location"):
+            # Same semantics as ilike '%location%', resolved once over the string table
+            needle = filters["location"].lower()
+            ids = [location_id for location, location_id in self._location_ids.items() if needle in location.lower()]
+            mask &= np.isin(self._location[:n], ids)
+
+        if filters.get("near"):
+            # (lat, lon, radius_km); rows without coordinates compare False on NaN
+            latitude, longitude, radius_km = filters["near"]
+            rows = np.flatnonzero(mask)
+            distance = haversine_km(latitude, longitude, self._latitude[rows], self._longitude[rows])
+            mask[rows[~(distance <= radius_km)]] = False
+
+        return mask
+
+    def search(
+        self,
+        filters: Optional[dict] = None,
+        sort_by: str = CreatorSortEnum.XP_SCORE,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[uuid.UUID]:
+        """
+        Return the ids of one discovery page, ordered like the SQL path:
+        sort key DESC NULLS LAST, then id.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._mask(filters or {}))
+            keys = self._sort_keys[CreatorSortEnum(sort_by)]
+            page = top_k_rows(rows, keys, self._id_hi, self._id_lo, skip, limit)
+            return [self._id_at(position) for position in page]
+
+    def match(self, preferences: Optional[dict], budget_range: Optional[dict], limit: int = 20) -> List[tuple]:
+        """
+        Score every public creator against a brand's campaign preferences and
+        budget (see app/utils/matching.py) and return the top `limit` as
+        (creator id, score, components), best first, ties by id.
+        Rows are scored in vectorized batches merged through a top-k heap.
+        """
+        with self._lock:
+            n = self._size
+            score = self._match_scorer(preferences or {}, (budget_range or {}).get("max"), n)
+            top = TopKMatches(limit)
+            for start in range(0, n, MATCH_BATCH_ROWS):
+                rows = np.flatnonzero(self._alive[start:min(start + MATCH_BATCH_ROWS, n)]) + start
+                if len(rows):
+                    top.push(
+                        score(rows)["score"],
+                        lambda i: (int(self._id_hi[rows[i]]) << 64) | int(self._id_lo[rows[i]]),
+                        rows
+                    )
+            winners = top.results()
+            if not winners:
+                return []
+            # Recompute the per-component breakdown for the winners only
+            components = score(np.array([position for _, position in winners]))
+            return [
+                (
+                    self._id_at(position),
+                    round(float(components["score"][i]), 4),
+                    {name: round(float(values[i]), 4) for name, values in components.items() if name != "score"}
+                )
+                for i, (_, position) in enumerate(winners)
+            ]
+
+    def _match_scorer(self, preferences: dict, budget_max: Optional[float], n: int):
+        """Resolve brand preferences against this index once; returns rows -> match components"""
+        niches = {str(niche).strip().lower() for niche in preferences.get("niches") or []}
+        niche_masks = [self._tag_mask(tag, n) for tag in self._tag_vocabulary() if tag.lower() in niches]
+        tier_codes = enum_preference_codes(preferences.get("creator_tiers"), CREATOR_TYPE_CODES)
+        content_codes = enum_preference_codes(preferences.get("content_types"), CONTENT_TYPE_CODES)
+        if content_codes:
+            # Creators producing "All" content types satisfy any content preference
+            content_codes.append(CONTENT_TYPE_CODES[ContentTypeEnum.ALL])
+        platforms = [str(name).lower() for name in preferences.get("platforms") or []]
+        platform_bits = self._platform_mask(platforms)
+        xp = self._sort_keys[CreatorSortEnum.XP_SCORE]
+
+        def score(rows: np.ndarray) -> dict:
+            return score_creators(
+                niche_hits=sum(mask[rows].astype(np.int16) for mask in niche_masks) if niche_masks else np.zeros(len(rows)),
+                niche_count=len(niches),
+                tier_hit=np.isin(self._creator_type[rows], tier_codes) if tier_codes else None,
+                content_hit=np.isin(self._content_type[rows], content_codes) if content_codes else None,
+                platform_hit=(self._platforms[rows] & platform_bits) != 0 if platforms else None,
+                prices=self._min_price[rows],
+                budget_max=budget_max,
+                xp=xp[rows]
+            )
+        return score
+
+    def stats(self, filters: Optional[dict] = None, facet_limit: int = 20) -> dict:
+        """
+        Exact total and facet counts (content_type, creator_type, location, tag)
+        for a filter set, computed in one vectorized pass over the mask.
+        """
+        with self._lock:
+            mask = self._mask(filters or {})
+            n = self._size
+            content_counts = np.bincount(self._content_type[:n][mask & (self._content_type[:n] >= 0)], minlength=len(ContentTypeEnum))
+            creator_counts = np.bincount(self._creator_type[:n][mask & (self._creator_type[:n] >= 0)], minlength=len(CreatorTypeEnum))
+            location_counts = np.bincount(self._location[:n][mask & (self._location[:n] >= 0)], minlength=len(self._location_ids))
+            locations = _string_table(self._location_ids)
+            return {
+                "total": int(mask.sum()),
+                "facets": {
+                    "content_type": _top_facets({member.value: int(content_counts[code]) for member, code in CONTENT_TYPE_CODES.items()}, facet_limit),
+                    "creator_type": _top_facets({member.value: int(creator_counts[code]) for member, code in CREATOR_TYPE_CODES.items()}, facet_limit),
+                    "location": _top_facets({locations[i]: int(count) for i, count in enumerate(location_counts)}, facet_limit),
+                    "tag": _top_facets(self._tag_counts(mask), facet_limit),
+                },
+            }
+
+    def _tag_counts(self, mask: np.ndarray, chunk_rows: int = 65536) -> Dict[str, int]:
+        """Per-tag counts over masked rows, unpacking the bitsets in bounded chunks"""
+        rows = np.flatnonzero(mask)
+        totals = np.zeros(self._tags.shape[1] * 64, dtype=np.int64)
+        for start in range(0, len(rows), chunk_rows):
+            words = self._tags[rows[start:start + chunk_rows]].astype("<u8")
+            bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")
+            totals += bits.sum(axis=0, dtype=np.int64)
+        return {tag: int(totals[bit]) for tag, bit in self._tag_bits.items()}
+
+    def export(self) -> dict:
+        """Columns, string tables and tag postings for writing a discovery snapshot"""
+        with self._lock:
+            n = self._size
+            columns = {
+                "alive": self._alive[:n],
+                "is_verified": self._verified[:n],
+                "content_type": self._content_type[:n],
+                "creator_type": self._creator_type[:n],
+                "location": self._location[:n],
+                "language": self._language[:n],
+                "latitude": self._latitude[:n],
+                "longitude": self._longitude[:n],
+                "followers": self._followers[:n],
+                "platforms": self._platforms[:n],
+                "min_price": self._min_price[:n],
+                "id_hi": self._id_hi[:n],
+                "id_lo": self._id_lo[:n],
+            }
+            for sort_by, keys in self._sort_keys.items():
+                columns[f"sort_{sort_by.value}"] = keys[:n]
+            return {
+                "rows": n,
+                "columns": {name: column.copy() for name, column in columns.items()},
+                "strings": {
+                    "location": _string_table(self._location_ids),
+                    "language": _string_table(self._language_ids),
+                    "platform": _string_table(self._platform_bits),
+                },
+                "postings": {"tags": self._tag_postings(n)},
+            }
+
+    def _tag_postings(self, n: int):
+        """Invert the tag bitsets into (tags, offsets, rows) postings, rows ascending per tag"""
+        tags = _string_table(self._tag_bits)
+        row_parts, bit_parts = [], []
+        for word in range(self._tags.shape[1]):
+            column = self._tags[:n, word]
+            rows = np.flatnonzero(column)
+            if not len(rows):
+                continue
+            bits = np.unpackbits(column[rows].astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+            hit_rows, hit_bits = np.nonzero(bits)
+            row_parts.append(rows[hit_rows])
+            bit_parts.append(hit_bits + word * 64)
+        rows = np.concatenate(row_parts) if row_parts else np.zeros(0, dtype=np.int64)
+        bits = np.concatenate(bit_parts) if bit_parts else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((rows, bits))
+        counts = np.bincount(bits, minlength=len(tags))
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.uint64)
+        return tags, offsets, rows[order].astype(np.uint32)
+
+def top_k_rows(rows: np.ndarray, keys: np.ndarray, id_hi: np.ndarray, id_lo: np.ndarray, skip: int, limit: int) -> np.ndarray:
+    """
+    Positions of one page of rows ordered by key DESC (NULL stored as -inf), then id.
+    Uses a partition instead of a full sort; rows tied with the k-th key are kept.
+    """
+    keys = keys[rows]
+    window = skip + limit
+    if len(rows) > window:
+        threshold = np.partition(keys, len(keys) - window)[len(keys) - window]
+        keep = keys >= threshold
+        rows, keys = rows[keep], keys[keep]
+    order = np.lexsort((id_lo[rows], id_hi[rows], -keys))
+    return rows[order][skip:window]
+
+def _top_facets(counts: Dict[str, int], limit: int) -> List[dict]:
+    """Non-zero facet values, highest count first"""
+    ranked = sorted(((value, count) for value, count in counts.items() if count), key=lambda item: (-item[1], item[0]))
+    return [{"value": value, "count": count} for value, count in ranked[:limit]]
+
+def _string_table(ids: Dict[str, int]) -> List[str]:
+    """Strings ordered by their id"""
+    return sorted(ids, key=ids.get)
+
+def sort_key(value) -> float:
+    """Float sort key with NULL as -inf (DESC NULLS LAST)"""
+    return -np.inf if value is None else float(value)
+
+creator_discovery_index = CreatorDiscoveryIndex()
\ No newline at end of file
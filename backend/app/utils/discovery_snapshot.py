@@ -0,0 +1,421 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.brand import BrandProfile, BrandTypeEnum
+from app.db.models.agency import AgencyProfile, AgencyTypeEnum
+from app.schemas.brand.profile import BrandSortEnum
+from app.schemas.agency.profile import AgencySortEnum
+from app.schemas.creator.profile import CreatorSortEnum
+from app.utils.discovery_index import CreatorDiscoveryIndex, top_k_rows, sort_key
+from app.utils.geo import haversine_km
+
+# File layout: MAGIC, u64 directory length, JSON directory (padded to 8 bytes),
+# then 8-byte aligned column blobs. Offsets in the directory are relative to
+# the first blob, so every column is a zero-copy NumPy view over the mmap.
+MAGIC = b"IBZSNAP\x01"
+SNAPSHOT_VERSION = 1
+
+BRAND_TYPE_CODES = {member: code for code, member in enumerate(BrandTypeEnum)}
+AGENCY_TYPE_CODES = {member: code for code, member in enumerate(AgencyTypeEnum)}
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+def write_snapshot(path: str, sections: Dict[str, dict]) -> None:
+    """
+    Write sections ({"rows", "columns", "strings", "postings"}) to path atomically.
+    The file is fully written and fsynced under a temporary name, then renamed
+    over path, so readers only ever map a complete snapshot.
+    """
+    blobs = []
+    offset = 0
+
+    def add(array: np.ndarray) -> dict:
+        nonlocal offset
+        array = np.ascontiguousarray(array)
+        descriptor = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        blobs.append(array)
+        offset += _align(array.nbytes)
+        return descriptor
+
+    def add_strings(values: List[str]) -> dict:
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        offsets[1:] = np.cumsum([len(value) for value in encoded]) if encoded else []
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return {"offsets": add(offsets), "data": add(data)}
+
+    directory = {"version": SNAPSHOT_VERSION, "built_at": datetime.utcnow().isoformat(), "sections": {}}
+    for name, section in sections.items():
+        directory["sections"][name] = {
+            "rows": section["rows"],
+            "columns": {column: add(array) for column, array in section["columns"].items()},
+            "strings": {column: add_strings(values) for column, values in section.get("strings", {}).items()},
+            "postings": {
+                column: {
+                    "keys": add_strings(keys),
+                    "offsets": add(offsets.astype("<u8")),
+                    "rows": add(rows.astype("<u4")),
+                }
+                for column, (keys, offsets, rows) in section.get("postings", {}).items()
+            },
+        }
+
+    header = json.dumps(directory).encode("utf-8")
+    header += b" " * (_align(len(header)) - len(header))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for array in blobs:
+            f.write(array.tobytes())
+            f.write(b"\0" * (_align(array.nbytes) - array.nbytes))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class DiscoverySnapshot:
+    """
+    Read-only view of a snapshot file. The file is mmapped once, so every
+    worker shares the same page-cache memory and opening costs no warm-up.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a discovery snapshot")
+        (header_length,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.directory = json.loads(self._mmap[header_start:header_start + header_length])
+        self._data_start = header_start + header_length
+        self._strings: Dict[tuple, List[str]] = {}
+        self._postings: Dict[tuple, Dict[str, np.ndarray]] = {}
+
+    def _array(self, descriptor: dict) -> np.ndarray:
+        shape = tuple(descriptor["shape"])
+        return np.frombuffer(
+            self._mmap,
+            dtype=np.dtype(descriptor["dtype"]),
+            count=int(np.prod(shape)),
+            offset=self._data_start + descriptor["offset"]
+        ).reshape(shape)
+
+    def _decode_strings(self, descriptor: dict) -> List[str]:
+        offsets = self._array(descriptor["offsets"])
+        data = self._array(descriptor["data"])
+        return [bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def rows(self, section: str) -> int:
+        return self.directory["sections"][section]["rows"]
+
+    def column(self, section: str, name: str) -> np.ndarray:
+        return self._array(self.directory["sections"][section]["columns"][name])
+
+    def strings(self, section: str, name: str) -> List[str]:
+        """Decoded string table (cached per snapshot)"""
+        key = (section, name)
+        if key not in self._strings:
+            self._strings[key] = self._decode_strings(self.directory["sections"][section]["strings"][name])
+        return self._strings[key]
+
+    def postings(self, section: str, name: str) -> Dict[str, np.ndarray]:
+        """Key -> ascending row positions; row arrays are views into the mmap"""
+        key = (section, name)
+        if key not in self._postings:
+            descriptor = self.directory["sections"][section]["postings"][name]
+            keys = self._decode_strings(descriptor["keys"])
+            offsets = self._array(descriptor["offsets"])
+            rows = self._array(descriptor["rows"])
+            self._postings[key] = {
+                value: rows[offsets[i]:offsets[i + 1]] for i, value in enumerate(keys)
+            }
+        return self._postings[key]
+
+class SnapshotCreatorIndex(CreatorDiscoveryIndex):
+    """Read-only creator discovery index over the creator section of a snapshot"""
+
+    def __init__(self, snapshot: DiscoverySnapshot):
+        column = lambda name: snapshot.column("creator", name)
+        self._lock = threading.Lock()
+        self._size = snapshot.rows("creator")
+        self._alive = column("alive")
+        self._verified = column("is_verified")
+        self._content_type = column("content_type")
+        self._creator_type = column("creator_type")
+        self._location = column("location")
+        self._language = column("language")
+        self._latitude = column("latitude")
+        self._longitude = column("longitude")
+        self._followers = column("followers")
+        self._platforms = column("platforms")
+        self._min_price = column("min_price")
+        self._id_hi = column("id_hi")
+        self._id_lo = column("id_lo")
+        self._sort_keys = {sort_by: column(f"sort_{sort_by.value}") for sort_by in CreatorSortEnum}
+        self._location_ids = {value: i for i, value in enumerate(snapshot.strings("creator", "location"))}
+        self._language_ids = {value: i for i, value in enumerate(snapshot.strings("creator", "language"))}
+        self._platform_bits = {value: i for i, value in enumerate(snapshot.strings("creator", "platform"))}
+        self._tag_rows = snapshot.postings("creator", "tags")
+
+    def _tag_mask(self, tag: str, n: int) -> Optional[np.ndarray]:
+        rows = self._tag_rows.get(tag)
+        if rows is None:
+            return None
+        mask = np.zeros(n, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _id_at(self, position: int) -> uuid.UUID:
+        return uuid.UUID(int=(int(self._id_hi[position]) << 64) | int(self._id_lo[position]))
+
+    def _tag_vocabulary(self):
+        return self._tag_rows.keys()
+
+    def _tag_counts(self, mask: np.ndarray, chunk_rows: int = 65536) -> Dict[str, int]:
+        return {tag: int(np.count_nonzero(mask[rows])) for tag, rows in self._tag_rows.items()}
+
+    def apply_rows(self, rows) -> int:
+        raise TypeError("Snapshot indexes are read-only; rebuild the snapshot instead.")
+
+def _search_section(
+    snapshot: DiscoverySnapshot,
+    section: str,
+    substring_filters: Dict[str, Optional[str]],
+    code_filters: Dict[str, Optional[int]],
+    sort_column: str,
+    skip: int,
+    limit: int,
+    near: Optional[tuple] = None
+) -> List[uuid.UUID]:
+    """Filter one brand/agency section and return a page of ids"""
+    n = snapshot.rows(section)
+    mask = np.ones(n, dtype=bool)
+    for name, needle in substring_filters.items():
+        if needle:
+            # Same semantics as ilike '%needle%', resolved once over the string table
+            needle = needle.lower()
+            ids = [i for i, value in enumerate(snapshot.strings(section, name)) if needle in value.lower()]
+            mask &= np.isin(snapshot.column(section, name), ids)
+    for name, code in code_filters.items():
+        if code is not None:
+            mask &= snapshot.column(section, name) == code
+    if near:
+        latitude, longitude, radius_km = near
+        rows = np.flatnonzero(mask)
+        distance = haversine_km(
+            latitude, longitude,
+            snapshot.column(section, "latitude")[rows], snapshot.column(section, "longitude")[rows]
+        )
+        mask[rows[~(distance <= radius_km)]] = False
+    id_hi, id_lo = snapshot.column(section, "id_hi"), snapshot.column(section, "id_lo")
+    page = top_k_rows(np.flatnonzero(mask), snapshot.column(section, sort_column), id_hi, id_lo, skip, limit)
+    return [uuid.UUID(int=(int(id_hi[p]) << 64) | int(id_lo[p])) for p in page]
+
+def _enum_code(codes: dict, enum_cls, value) -> Optional[int]:
+    """Code for an enum filter value; -2 (matches nothing) for unknown values"""
+    if value is None:
+        return None
+    try:
+        return codes[enum_cls(value)]
+    except ValueError:
+        return -2
+
+def search_brand_snapshot(
+    snapshot: DiscoverySnapshot,
+    skip: int = 0,
+    limit: int = 20,
+    industry: Optional[str] = None,
+    location: Optional[str] = None,
+    brand_type: Optional[str] = None,
+    sort_by: str = BrandSortEnum.CREATED_AT,
+    near: Optional[tuple] = None
+) -> List[uuid.UUID]:
+    """Brand discovery page ids from a snapshot, same filters as get_public_brand_profiles"""
+    return _search_section(
+        snapshot, "brand",
+        {"industry": industry, "location": location},
+        {"brand_type": _enum_code(BRAND_TYPE_CODES, BrandTypeEnum, brand_type)},
+        f"sort_{BrandSortEnum(sort_by).value}",
+        skip, limit, near
+    )
+
+def search_agency_snapshot(
+    snapshot: DiscoverySnapshot,
+    skip: int = 0,
+    limit: int = 20,
+    agency_type: Optional[str] = None,
+    industry: Optional[str] = None,
+    location: Optional[str] = None,
+    sort_by: str = AgencySortEnum.CREATED_AT,
+    near: Optional[tuple] = None
+) -> List[uuid.UUID]:
+    """Agency discovery page ids from a snapshot, same filters as get_public_agency_profiles"""
+    return _search_section(
+        snapshot, "agency",
+        {"industry": industry, "location": location},
+        {"agency_type": _enum_code(AGENCY_TYPE_CODES, AgencyTypeEnum, agency_type)},
+        f"sort_{AgencySortEnum(sort_by).value}",
+        skip, limit, near
+    )
+
+class SnapshotHandle:
+    """
+    The current snapshot for this worker. Checks the file at most every
+    check_seconds and remaps it when the builder has swapped in a new one;
+    a refresh is just a reference swap.
+    """
+
+    def __init__(self, path: str, check_seconds: float = 1.0):
+        self.path = path
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._key = None
+        self._checked = 0.0
+        self.snapshot: Optional[DiscoverySnapshot] = None
+        self.creator_index: Optional[SnapshotCreatorIndex] = None
+
+    def get(self) -> Optional[DiscoverySnapshot]:
+        now = time.monotonic()
+        if now - self._checked >= self.check_seconds:
+            with self._lock:
+                self._checked = now
+                try:
+                    stat = os.stat(self.path)
+                except FileNotFoundError:
+                    return self.snapshot
+                key = (stat.st_ino, stat.st_mtime_ns)
+                if key != self._key:
+                    snapshot = DiscoverySnapshot(self.path)
+                    creator_index = (
+                        SnapshotCreatorIndex(snapshot) if "creator" in snapshot.directory["sections"] else None
+                    )
+                    # Old mappings are released once in-flight requests drop them
+                    self.snapshot, self.creator_index = snapshot, creator_index
+                    self._key = key
+        return self.snapshot
+
+def _uuid_columns(ids: List[uuid.UUID]) -> Dict[str, np.ndarray]:
+    return {
+        "id_hi": np.array([value.int >> 64 for value in ids], dtype=np.uint64),
+        "id_lo": np.array([value.int & 0xFFFFFFFFFFFFFFFF for value in ids], dtype=np.uint64),
+    }
+
+def _string_column(values: List[Optional[str]]):
+    """String ids column (-1 for NULL) and its string table"""
+    table: Dict[str, int] = {}
+    ids = np.array([table.setdefault(value, len(table)) if value else -1 for value in values], dtype=np.int32)
+    return ids, sorted(table, key=table.get)
+
+def _profile_section(rows, enum_column: str, enum_codes: dict, sort_columns: Dict[str, str]) -> dict:
+    """Section for brand/agency rows loaded as column tuples"""
+    ids = [row.id for row in rows]
+    industry, industry_table = _string_column([row.industry for row in rows])
+    location, location_table = _string_column([row.location for row in rows])
+    columns = {
+        **_uuid_columns(ids),
+        "industry": industry,
+        "location": location,
+        "latitude": np.array([np.nan if row.latitude is None else row.latitude for row in rows], dtype=np.float64),
+        "longitude": np.array([np.nan if row.longitude is None else row.longitude for row in rows], dtype=np.float64),
+        enum_column: np.array([enum_codes.get(getattr(row, enum_column), -1) for row in rows], dtype=np.int8),
+        "is_verified": np.array([bool(row.is_verified) for row in rows], dtype=bool),
+    }
+    for sort_value, attribute in sort_columns.items():
+        values = [getattr(row, attribute) for row in rows]
+        columns[f"sort_{sort_value}"] = np.array(
+            [sort_key(value.timestamp() if isinstance(value, datetime) else value) for value in values],
+            dtype=np.float64
+        )
+    return {
+        "rows": len(ids),
+        "columns": columns,
+        "strings": {"industry": industry_table, "location": location_table},
+    }
+
+def build_discovery_snapshot(db: Session, path: str, creator_index: CreatorDiscoveryIndex) -> None:
+    """
+    Write a snapshot of creator (from the incrementally refreshed index),
+    brand and agency discovery data to path.
+    """
+    brands = db.query(
+        BrandProfile.id, BrandProfile.industry, BrandProfile.location, BrandProfile.brand_type,
+        BrandProfile.latitude, BrandProfile.longitude,
+        BrandProfile.is_verified, BrandProfile.total_campaigns, BrandProfile.created_at
+    ).all()
+    agencies = db.query(
+        AgencyProfile.id, AgencyProfile.industry, AgencyProfile.location, AgencyProfile.agency_type,
+        AgencyProfile.latitude, AgencyProfile.longitude,
+        AgencyProfile.is_verified, AgencyProfile.total_campaigns_run, AgencyProfile.created_at
+    ).all()
+    write_snapshot(path, {
+        "creator": creator_index.export(),
+        "brand": _profile_section(brands, "brand_type", BRAND_TYPE_CODES, {
+            BrandSortEnum.TOTAL_CAMPAIGNS.value: "total_campaigns",
+            BrandSortEnum.CREATED_AT.value: "created_at",
+        }),
+        "agency": _profile_section(agencies, "agency_type", AGENCY_TYPE_CODES, {
+            AgencySortEnum.TOTAL_CAMPAIGNS.value: "total_campaigns_run",
+            AgencySortEnum.CREATED_AT.value: "created_at",
+        }),
+    })
+
+def _profiles_fingerprint(db: Session, model) -> tuple:
+    """Row count and latest change time, to detect brand/agency changes cheaply"""
+    return db.query(func.count(model.id), func.max(func.coalesce(model.updated_at, model.created_at))).one()
+
+def snapshot_builder_pass(db: Session, path: str, creator_index: CreatorDiscoveryIndex, fingerprints=None):
+    """
+    One builder poll. Rewrites the snapshot only if the creator watermark
+    advanced or the brand/agency fingerprints changed; rows the refresh
+    re-reads inside REFRESH_OVERLAP alone do not trigger a rebuild.
+    Returns the fingerprints for the next pass.
+    """
+    watermark = creator_index.watermark
+    creator_index.refresh(db)
+    current = (_profiles_fingerprint(db, BrandProfile), _profiles_fingerprint(db, AgencyProfile))
+    if creator_index.watermark != watermark or current != fingerprints or not os.path.exists(path):
+        build_discovery_snapshot(db, path, creator_index)
+    return current
+
+def run_snapshot_builder(path: str, interval_seconds: float) -> None:
+    """
+    Builder loop: run exactly one of these per host. Polls for changes and
+    rewrites the snapshot only when creator, brand or agency data changed.
+    """
+    from app.db.session import SessionLocal
+
+    creator_index = CreatorDiscoveryIndex()
+    fingerprints = None
+    while True:
+        db = SessionLocal()
+        try:
+            fingerprints = snapshot_builder_pass(db, path, creator_index, fingerprints)
+        finally:
+            db.close()
+        time.sleep(interval_seconds)
+
+# Set in every API worker when a snapshot builder is running
+discovery_snapshot = (
+    SnapshotHandle(settings.DISCOVERY_SNAPSHOT_PATH, settings.DISCOVERY_SNAPSHOT_CHECK_SECONDS)
+    if settings.DISCOVERY_SNAPSHOT_PATH else None
+)
+
+if __name__ == "__main__":
+    if not settings.DISCOVERY_SNAPSHOT_PATH:
+        raise SystemExit("Set DISCOVERY_SNAPSHOT_PATH to build a discovery snapshot.")
+    run_snapshot_builder(settings.DISCOVERY_SNAPSHOT_PATH, settings.DISCOVERY_INDEX_REFRESH_SECONDS)
\ No newline at end of file
@@ -0,0 +1,192 @@
+import argparse
+import enum
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Annotated, Any, Callable, List, Optional, Union, get_args, get_origin
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+
+# Field types whose database values are already what the JSON body needs
+PASSTHROUGH_TYPES = (str, bool, uuid.UUID, datetime, date)
+
+class UnsupportedField(TypeError):
+    """A schema field the trusted encoder cannot project without validation"""
+
+def _unwrap(annotation):
+    """(inner type, optional) for Optional[X] / Annotated[X, ...]"""
+    optional = False
+    while True:
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            annotation = get_args(annotation)[0]
+        elif origin is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) != 1:
+                raise UnsupportedField(annotation)
+            optional = True
+            annotation = args[0]
+        else:
+            return annotation, optional
+
+def _to_int(value):
+    return int(value)
+
+def _to_float(value):
+    return float(value)
+
+def _converter(annotation) -> Optional[Callable[[Any], Any]]:
+    """Function turning a stored value into its JSON-ready form, None to pass it through"""
+    annotation, _ = _unwrap(annotation)
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        item = _converter(get_args(annotation)[0])
+        if item is None:
+            return None
+        return lambda values: [None if value is None else item(value) for value in values]
+    if origin is dict:
+        key, item = get_args(annotation)
+        if key is not str:
+            raise UnsupportedField(annotation)
+        if _converter(item) is not None:
+            raise UnsupportedField(annotation)
+        return None
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _projector(annotation)
+        if issubclass(annotation, enum.Enum) or issubclass(annotation, PASSTHROUGH_TYPES):
+            return None
+        if issubclass(annotation, int):
+            return _to_int
+        if issubclass(annotation, float):
+            return _to_float
+    raise UnsupportedField(annotation)
+
+def _projector(schema) -> Callable[[Any], dict]:
+    """Function building the schema's JSON dict from an object or dict, without validation"""
+    fields = []
+    for name, field in schema.model_fields.items():
+        _, optional = _unwrap(field.annotation)
+        default = None if optional or field.default is PydanticUndefined else field.default
+        fields.append((field.alias or name, name, default, _converter(field.annotation)))
+
+    def project(source) -> dict:
+        read = source.get if isinstance(source, dict) else lambda name, default=None: getattr(source, name, default)
+        data = {}
+        for key, name, default, convert in fields:
+            value = read(name, None)
+            if value is None:
+                data[key] = default
+            else:
+                data[key] = value if convert is None else convert(value)
+        return data
+
+    return project
+
+@lru_cache(maxsize=None)
+def list_adapter(schema) -> TypeAdapter:
+    """Prebuilt TypeAdapter for List[schema]"""
+    return TypeAdapter(List[schema])
+
+@lru_cache(maxsize=None)
+def trusted_encoder(schema) -> Optional[Callable[[Any], dict]]:
+    """Projector for schema, or None if a field needs validation (e.g. HttpUrl)"""
+    try:
+        return _projector(schema)
+    except UnsupportedField:
+        return None
+
+def encode_items(schema, items) -> list:
+    """
+    JSON-ready dicts of items as schema would render them. Trusted rows (our
+    own database rows, written through validated schemas) are projected onto
+    the schema's fields without running validation; schemas with fields that
+    need it go through a prebuilt TypeAdapter.
+    """
+    encoder = trusted_encoder(schema)
+    if encoder is not None:
+        return [encoder(item) for item in items]
+    adapter = list_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(list(items), from_attributes=True), mode="json")
+
+def render_json(payload) -> bytes:
+    """Render a JSON body like ORJSONResponse does"""
+    return orjson.dumps(payload, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+def _legacy_render(schema, items) -> bytes:
+    """The previous path: validate every item, jsonable_encoder, stdlib json"""
+    payload = jsonable_encoder([schema.model_validate(item) for item in items])
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def synthetic_creators(count: int, seed: int = 1) -> list:
+    """Unsaved CreatorProfile rows with realistic public fields, for benchmarking"""
+    from app.db.models.creator import CreatorProfile, ContentTypeEnum, CreatorTypeEnum
+
+    rng = random.Random(seed)
+    platforms = ("instagram", "youtube", "tiktok", "x")
+    return [
+        CreatorProfile(
+            id=uuid.UUID(int=rng.getrandbits(128), version=4),
+            display_name=f"Creator {i}",
+            handle=f"creator_{i}",
+            bio="Food, travel and lifestyle stories from around the world. " * 3,
+            content_type=rng.choice(list(ContentTypeEnum)),
+            platforms=[
+                {"platform": platform, "followers": rng.randrange(1_000, 2_000_000), "engagement_rate": round(rng.random() * 0.1, 4)}
+                for platform in rng.sample(platforms, 3)
+            ],
+            location="Mumbai",
+            latitude=19.076,
+            longitude=72.8777,
+            profile_image_url=f"https://cdn.example.com/creators/{i}.jpg",
+            creator_type=rng.choice(list(CreatorTypeEnum)),
+            tags=["food", "travel", "lifestyle"],
+            avg_engagement_rate=round(rng.random() * 0.1, 4),
+            total_campaigns=rng.randrange(100),
+            xp_score=round(rng.random() * 1000, 2),
+            is_verified=rng.random() < 0.2,
+        )
+        for i in range(count)
+    ]
+
+def _timings(render: Callable[[], bytes], iterations: int) -> dict:
+    cpu, wall = [], []
+    for _ in range(iterations):
+        cpu_started, wall_started = time.process_time_ns(), time.perf_counter_ns()
+        render()
+        cpu.append(time.process_time_ns() - cpu_started)
+        wall.append(time.perf_counter_ns() - wall_started)
+    wall.sort()
+    return {
+        "cpu_ms_per_page": round(sum(cpu) / iterations / 1e6, 3),
+        "p50_ms": round(wall[iterations // 2] / 1e6, 3),
+        "p99_ms": round(wall[min(int(iterations * 0.99), iterations - 1)] / 1e6, 3),
+    }
+
+def benchmark_discovery_render(items: int = 100, iterations: int = 2000) -> dict:
+    """CPU time and latency of rendering one discovery page, before and after the fast path"""
+    from app.schemas.creator.profile import CreatorProfilePublic
+
+    rows = synthetic_creators(items)
+    before = _timings(lambda: _legacy_render(CreatorProfilePublic, rows), iterations)
+    after = _timings(lambda: render_json(encode_items(CreatorProfilePublic, rows)), iterations)
+    return {
+        "items": items,
+        "iterations": iterations,
+        "before": before,
+        "after": after,
+        "cpu_speedup": round(before["cpu_ms_per_page"] / after["cpu_ms_per_page"], 1) if after["cpu_ms_per_page"] else None,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark discovery page serialization")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(benchmark_discovery_render(args.items, args.iterations), indent=2))
\ No newline at end of file
@@ -0,0 +1,170 @@
+import csv
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_
+
+# Offline gazetteer bundled with the app: name,country,latitude,longitude,aliases
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "gazetteer.csv"
+
+# Stored geohash precision (7 chars ~ 150 m cells)
+GEOHASH_PRECISION = 7
+# Radius queries use the finest precision whose cover stays within this many cells
+MAX_COVER_CELLS = 16
+
+EARTH_RADIUS_KM = 6371.0088
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+# Country words dropped when matching "City, Country" style input
+_COUNTRY_WORDS = {
+    "in", "india", "us", "usa", "united states", "uk", "gb", "united kingdom",
+    "uae", "ae", "united arab emirates",
+}
+
+class Place(NamedTuple):
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+
+def _location_key(text: str) -> str:
+    """Lower-case, strip punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+@lru_cache(maxsize=1)
+def load_gazetteer() -> Dict[str, Place]:
+    """Normalized name/alias -> place"""
+    places: Dict[str, Place] = {}
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            place = Place(record["name"], record["country"], float(record["latitude"]), float(record["longitude"]))
+            for alias in [record["name"]] + [alias for alias in (record["aliases"] or "").split("|") if alias]:
+                places.setdefault(_location_key(alias), place)
+    return places
+
+def geocode(location: Optional[str]) -> Optional[Place]:
+    """
+    Resolve free-text location ("Bangalore, IN", "BLR", "Mumbai, Maharashtra")
+    or a "lat,lon" pair to a place. Returns None when nothing matches.
+    """
+    if not location or not location.strip():
+        return None
+    match = _COORDINATES.match(location)
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return Place(location.strip(), "", latitude, longitude)
+        return None
+
+    gazetteer = load_gazetteer()
+    whole = _location_key(location)
+    if whole in gazetteer:
+        return gazetteer[whole]
+    for part in location.split(","):
+        key = _location_key(part)
+        if key and key not in _COUNTRY_WORDS and key in gazetteer:
+            return gazetteer[key]
+    return None
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base-32 geohash"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(lat, lon) size in degrees of a geohash cell"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def geohash_cover(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover the circle's bounding box,
+    at the finest precision that needs at most MAX_COVER_CELLS cells.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    widest = max(abs(min_lat), abs(max_lat))
+    lon_delta = 180.0 if widest >= 89.9 else min(180.0, lat_delta / math.cos(math.radians(widest)))
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lon_size = _cell_size(precision)
+        lat_steps = math.floor(max_lat / lat_size) - math.floor(min_lat / lat_size) + 1
+        lon_steps = min(math.ceil(2 * lon_delta / lon_size) + 1, math.ceil(360.0 / lon_size))
+        if lat_steps * lon_steps <= MAX_COVER_CELLS or precision == 1:
+            break
+
+    cells = set()
+    for i in range(lat_steps):
+        lat = min(min_lat + i * lat_size, max_lat)
+        for j in range(lon_steps):
+            lon = longitude - lon_delta + j * lon_size
+            lon = (lon + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lon, precision))
+    # Make sure the far edges are included
+    for lat in (min_lat, max_lat):
+        for lon in (longitude - lon_delta, longitude + lon_delta):
+            cells.add(geohash_encode(lat, (lon + 180.0) % 360.0 - 180.0, precision))
+    return sorted(cells)
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance; works on floats and NumPy arrays"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def within_radius_clause(model, latitude: float, longitude: float, radius_km: float):
+    """
+    SQL filter for profiles within radius_km: geohash prefix ranges (served by
+    the geohash index) narrowed by an exact haversine distance check.
+    """
+    cells = or_(*[model.geohash.like(f"{cell}%") for cell in geohash_cover(latitude, longitude, radius_km)])
+    lat1, lat2 = func.radians(model.latitude), math.radians(latitude)
+    a = func.power(func.sin((lat2 - lat1) / 2), 2) + \
+        func.cos(lat1) * math.cos(lat2) * func.power(func.sin((math.radians(longitude) - func.radians(model.longitude)) / 2), 2)
+    distance = 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))
+    return and_(cells, distance <= radius_km)
+
+def geocode_profile(profile) -> None:
+    """Set latitude/longitude/geohash on a profile from its location text"""
+    place = geocode(profile.location)
+    if place is None:
+        profile.latitude = profile.longitude = profile.geohash = None
+    else:
+        profile.latitude = place.latitude
+        profile.longitude = place.longitude
+        profile.geohash = geohash_encode(place.latitude, place.longitude)
+
+def parse_near(near: Optional[str], radius_km: float) -> Optional[Tuple[float, float, float]]:
+    """Resolve the near= discovery parameter to (lat, lon, radius_km), 400 if unknown"""
+    if not near:
+        return None
+    place = geocode(near)
+    if place is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown location for near: {near}. Use a city name or 'lat,lon'."
+        )
+    return (place.latitude, place.longitude, radius_km)
\ No newline at end of file
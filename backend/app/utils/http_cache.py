@@ -0,0 +1,43 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Cache-Control policies per route type
+PUBLIC_PROFILE_CACHE_CONTROL = "public, max-age=60"
+DISCOVERY_CACHE_CONTROL = "public, max-age=15"
+# Own profile: only the client may store it, and it must revalidate every time
+PRIVATE_PROFILE_CACHE_CONTROL = "private, no-cache"
+
+def profile_etag(representation: str, profile_id, changed_at: Optional[datetime]) -> str:
+    """
+    Strong ETag for one representation of a profile (e.g. "creator-public", "creator-me").
+    Derived from coalesce(updated_at, created_at), which every write bumps.
+    """
+    stamp = changed_at.isoformat() if changed_at else ""
+    digest = hashlib.sha1(f"{representation}:{profile_id}:{stamp}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a rendered response body"""
+    return f'"{hashlib.sha1(body).hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    etag = etag[2:] if etag.startswith("W/") else etag
+    return etag in [candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates]
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 response carrying the validators"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
\ No newline at end of file
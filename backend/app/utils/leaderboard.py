@@ -0,0 +1,273 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.creator import CreatorProfile, ContentTypeEnum, CreatorTypeEnum
+from app.utils.discovery_index import REFRESH_OVERLAP
+
+# Leaderboard dimensions besides "overall"; a board is (dimension, value)
+LEADERBOARD_DIMENSIONS = ("content_type", "creator_type", "tag")
+
+# Target block size of RankedList; blocks split at twice this
+BLOCK_SIZE = 512
+
+# Above this many additions to one board in one apply call, rebuild it from
+# a single sort instead of inserting entry by entry
+BULK_REBUILD_ENTRIES = 1024
+
+LEADERBOARD_COLUMNS = (
+    CreatorProfile.id,
+    CreatorProfile.is_public,
+    CreatorProfile.content_type,
+    CreatorProfile.creator_type,
+    CreatorProfile.tags,
+    CreatorProfile.xp_score,
+    CreatorProfile.created_at,
+    CreatorProfile.updated_at,
+)
+
+class RankedList:
+    """
+    Sorted multiset with O(log n) rank and position lookups: sorted blocks of
+    at most 2 * BLOCK_SIZE entries, the last key of each block for bisecting,
+    and a Fenwick tree over block lengths for positions. Inserts and removals
+    shift at most one block.
+    """
+
+    def __init__(self, keys=()):
+        self._rebuild(sorted(keys))
+
+    def _rebuild(self, keys: list) -> None:
+        self._blocks = [keys[start:start + BLOCK_SIZE] for start in range(0, len(keys), BLOCK_SIZE)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+        self._build_tree()
+
+    def _build_tree(self) -> None:
+        tree = [0] + [len(block) for block in self._blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, block: int, delta: int) -> None:
+        i = block + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _before_block(self, block: int) -> int:
+        """Number of entries in blocks before this one"""
+        total, i = 0, block
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """(block, offset) of the entry at position, by descending the Fenwick tree"""
+        block, remaining = 0, position
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            following = block + step
+            if following < len(self._tree) and self._tree[following] <= remaining:
+                block = following
+                remaining -= self._tree[following]
+            step >>= 1
+        return block, remaining
+
+    def __len__(self) -> int:
+        return self._len
+
+    def keys(self) -> list:
+        return [key for block in self._blocks for key in block]
+
+    def add(self, key) -> None:
+        if not self._blocks:
+            self._rebuild([key])
+            return
+        block = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        insort(self._blocks[block], key)
+        self._maxes[block] = self._blocks[block][-1]
+        self._len += 1
+        if len(self._blocks[block]) > 2 * BLOCK_SIZE:
+            half = self._blocks[block][BLOCK_SIZE:]
+            del self._blocks[block][BLOCK_SIZE:]
+            self._blocks.insert(block + 1, half)
+            self._maxes[block] = self._blocks[block][-1]
+            self._maxes.insert(block + 1, half[-1])
+            self._build_tree()
+        else:
+            self._tree_add(block, 1)
+
+    def remove(self, key) -> None:
+        """Remove one occurrence of key; KeyError if absent"""
+        block = bisect_left(self._maxes, key)
+        if block == len(self._blocks):
+            raise KeyError(key)
+        entries = self._blocks[block]
+        offset = bisect_left(entries, key)
+        if offset == len(entries) or entries[offset] != key:
+            raise KeyError(key)
+        del entries[offset]
+        self._len -= 1
+        if entries:
+            self._maxes[block] = entries[-1]
+            self._tree_add(block, -1)
+        else:
+            del self._blocks[block]
+            del self._maxes[block]
+            self._build_tree()
+
+    def index(self, key) -> int:
+        """Position of key (number of smaller entries); KeyError if absent"""
+        block = bisect_left(self._maxes, key)
+        if block < len(self._blocks):
+            offset = bisect_left(self._blocks[block], key)
+            if offset < len(self._blocks[block]) and self._blocks[block][offset] == key:
+                return self._before_block(block) + offset
+        raise KeyError(key)
+
+    def slice(self, start: int, stop: int) -> list:
+        """Entries at positions [start, stop)"""
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return []
+        block, offset = self._locate(start)
+        entries = []
+        while len(entries) < stop - start:
+            entries.extend(self._blocks[block][offset:offset + stop - start - len(entries)])
+            block, offset = block + 1, 0
+        return entries
+
+    def update(self, added: list, removed: list) -> None:
+        """Apply many changes; large ones rebuild from one sort"""
+        if len(added) > BULK_REBUILD_ENTRIES:
+            gone = Counter(removed)
+            kept = []
+            for key in self.keys():
+                if gone[key]:
+                    gone[key] -= 1
+                else:
+                    kept.append(key)
+            if +gone:
+                raise KeyError(next(iter(+gone)))
+            self._rebuild(sorted(kept + added))
+            return
+        for key in removed:
+            self.remove(key)
+        for key in added:
+            self.add(key)
+
+def _entry_key(xp_score, creator_id) -> tuple:
+    """Sort key: highest XP first, ties by id"""
+    return (-float(xp_score or 0.0), str(creator_id))
+
+def creator_boards(row) -> List[Tuple[str, str]]:
+    """Boards a public creator appears on"""
+    boards = [("overall", "")]
+    if row.content_type is not None:
+        boards.append(("content_type", ContentTypeEnum(row.content_type).value))
+    if row.creator_type is not None:
+        boards.append(("creator_type", CreatorTypeEnum(row.creator_type).value))
+    boards.extend(("tag", tag) for tag in sorted(set(row.tags or [])))
+    return boards
+
+class CreatorLeaderboards:
+    """
+    Top-creators-by-XP boards for public creators: overall and per content
+    type, creator type and tag. Every board is a RankedList, so rank lookups
+    and pages at any offset cost O(log n). Refreshed incrementally from
+    creator_profiles; local writes are applied immediately.
+    Ranks are positions: creators with equal XP are ordered by id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards: Dict[Tuple[str, str], RankedList] = {}
+        # creator id -> (sort key, boards) for every ranked creator
+        self._members: Dict[str, tuple] = {}
+        self.watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def apply_rows(self, rows) -> int:
+        """Upsert rows (objects with the LEADERBOARD_COLUMNS attributes); private creators drop out"""
+        applied = 0
+        with self._lock:
+            changes: Dict[Tuple[str, str], Tuple[list, list]] = {}
+            for row in rows:
+                ref = str(row.id)
+                old_key, old_boards = self._members.pop(ref, (None, ()))
+                for board in old_boards:
+                    changes.setdefault(board, ([], []))[1].append(old_key)
+                if row.is_public:
+                    key = _entry_key(row.xp_score, ref)
+                    boards = creator_boards(row)
+                    self._members[ref] = (key, boards)
+                    for board in boards:
+                        changes.setdefault(board, ([], []))[0].append(key)
+
+                changed_at = row.updated_at or row.created_at
+                if changed_at and (self.watermark is None or changed_at > self.watermark):
+                    self.watermark = changed_at
+                applied += 1
+
+            for board, (added, removed) in changes.items():
+                # A key both removed and re-added (unchanged row) cancels out
+                if added and removed:
+                    common = set(added) & set(removed)
+                    added = [key for key in added if key not in common]
+                    removed = [key for key in removed if key not in common]
+                ranked = self._boards.setdefault(board, RankedList())
+                ranked.update(added, removed)
+                if not len(ranked):
+                    del self._boards[board]
+        return applied
+
+    def refresh(self, db: Session) -> int:
+        """Incrementally load rows changed since the watermark (all rows on first call)"""
+        query = db.query(*LEADERBOARD_COLUMNS)
+        if self.watermark is not None:
+            changed_at = func.coalesce(CreatorProfile.updated_at, CreatorProfile.created_at)
+            query = query.filter(changed_at > self.watermark - REFRESH_OVERLAP)
+        applied = self.apply_rows(query.yield_per(5000))
+        self.last_refresh = time.monotonic()
+        return applied
+
+    def refresh_if_stale(self, db: Session, max_age_seconds: float) -> None:
+        """Poll for changes if the last refresh is older than max_age_seconds"""
+        if time.monotonic() - self.last_refresh >= max_age_seconds:
+            self.refresh(db)
+
+    def top(self, board: Tuple[str, str], offset: int = 0, limit: int = 20) -> Tuple[int, List[tuple]]:
+        """(board size, [(rank, creator id, xp score)]) for ranks offset+1 .. offset+limit"""
+        with self._lock:
+            ranked = self._boards.get(board)
+            if ranked is None:
+                return 0, []
+            entries = ranked.slice(offset, offset + limit)
+            return len(ranked), [
+                (offset + i + 1, creator_id, -negative_xp)
+                for i, (negative_xp, creator_id) in enumerate(entries)
+            ]
+
+    def rank(self, board: Tuple[str, str], creator_id) -> Optional[Tuple[int, float]]:
+        """(1-based rank, xp score) of a creator on a board, None if not on it"""
+        with self._lock:
+            member = self._members.get(str(creator_id))
+            ranked = self._boards.get(board)
+            if member is None or ranked is None or board not in member[1]:
+                return None
+            return ranked.index(member[0]) + 1, -member[0][0]
+
+creator_leaderboards = CreatorLeaderboards()
\ No newline at end of file
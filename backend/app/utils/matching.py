@@ -0,0 +1,113 @@
+import heapq
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Relative weight of each match component. Components the brand has no
+# preference for are left out and the remaining weights are renormalized.
+MATCH_WEIGHTS = {
+    "niche": 0.35,
+    "tier": 0.15,
+    "content_type": 0.15,
+    "platform": 0.10,
+    "price": 0.15,
+    "xp": 0.10,
+}
+
+# XP score at which the xp component reaches 0.5 (it saturates towards 1)
+XP_HALF_SCORE = 500.0
+
+# Price fit for creators without pricing_info
+UNKNOWN_PRICE_FIT = 0.5
+
+# Rows scored per batch; bounds temporary arrays when matching large indexes
+MATCH_BATCH_ROWS = 65536
+
+def enum_preference_codes(values: Optional[List[str]], codes: dict) -> List[int]:
+    """Case-insensitive preference strings (e.g. "nano", "reels") -> enum codes"""
+    wanted = {str(value).strip().lower() for value in values or []}
+    return [code for member, code in codes.items() if member.value.lower() in wanted]
+
+def min_price(pricing_info) -> float:
+    """Cheapest listed price in a creator's pricing_info JSON, NaN if none"""
+    prices = [
+        float(item["price"])
+        for item in pricing_info or []
+        if isinstance(item, dict) and item.get("price") is not None
+    ]
+    return min(prices) if prices else np.nan
+
+def price_fit(prices: np.ndarray, budget_max: float) -> np.ndarray:
+    """1 when the cheapest offer fits the budget, decaying as budget/price above it"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fit = np.where(prices <= budget_max, 1.0, budget_max / prices)
+    return np.where(np.isnan(prices), UNKNOWN_PRICE_FIT, fit)
+
+def score_creators(
+    niche_hits: Optional[np.ndarray],
+    niche_count: int,
+    tier_hit: Optional[np.ndarray],
+    content_hit: Optional[np.ndarray],
+    platform_hit: Optional[np.ndarray],
+    prices: Optional[np.ndarray],
+    budget_max: Optional[float],
+    xp: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized match components for a batch of creators, each in [0, 1].
+    Inputs left as None (no brand preference) produce no component.
+    Returns the components plus "score", their weighted mean.
+    """
+    components = {}
+    if niche_hits is not None and niche_count:
+        components["niche"] = niche_hits / niche_count
+    if tier_hit is not None:
+        components["tier"] = tier_hit.astype(np.float64)
+    if content_hit is not None:
+        components["content_type"] = content_hit.astype(np.float64)
+    if platform_hit is not None:
+        components["platform"] = platform_hit.astype(np.float64)
+    if prices is not None and budget_max is not None:
+        components["price"] = price_fit(prices, budget_max)
+    xp = np.maximum(np.nan_to_num(xp, neginf=0.0), 0.0)
+    components["xp"] = xp / (xp + XP_HALF_SCORE)
+
+    total_weight = sum(MATCH_WEIGHTS[name] for name in components)
+    score = sum(MATCH_WEIGHTS[name] * values for name, values in components.items()) / total_weight
+    components["score"] = score
+    return components
+
+class TopKMatches:
+    """
+    Running top-k over scored batches: each batch is cut down to its own top k
+    with a partition, then merged into a size-k min-heap. Ties keep the lower id.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[tuple] = []
+
+    def push(self, scores: np.ndarray, id_of: Callable[[int], int], payloads) -> None:
+        """
+        Offer a batch. id_of(i) gives the integer creator id of batch item i
+        (only called for candidates); payloads[i] is returned with winners.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if self.k <= 0 or not len(scores):
+            return
+        candidates = np.arange(len(scores))
+        if len(scores) > self.k:
+            # Keep everything tied with the k-th score so the id tie-break is exact
+            kth = -np.partition(-scores, self.k - 1)[self.k - 1]
+            candidates = np.flatnonzero(scores >= kth)
+        for i in candidates:
+            entry = (float(scores[i]), -id_of(i), payloads[i])
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+    def results(self) -> List[tuple]:
+        """(score, payload) pairs, best first"""
+        ranked = sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))
+        return [(score, payload) for score, _, payload in ranked]
\ No newline at end of file
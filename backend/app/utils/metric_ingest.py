@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Applied-event rate in stats() is averaged over this many recent seconds
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+class MetricIngestWorker:
+    """
+    Buffers metric events for a short window and hands them to apply() in
+    batches from a background thread. A batch is cut when the oldest buffered
+    event is window_seconds old or max_batch events are waiting. Events are
+    de-duplicated by event_id while buffered; apply() is expected to skip
+    ids it has already applied, so replays and retries are harmless.
+    A batch whose apply() raises is put back and retried after another window,
+    up to max_attempts times. Then its events are applied one at a time:
+    events that fail on their own are logged and dropped, and the rest are
+    applied. If every event fails on its own, the failure is not down to the
+    events (e.g. the database is unreachable), so they are kept and queued
+    behind newer events.
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[list], dict],
+        window_seconds: float,
+        max_batch: int,
+        max_pending: int,
+        max_attempts: int = 3
+    ):
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._apply = apply
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # One batch in apply() at a time, whether flushed by the thread or a caller
+        self._flush_lock = threading.Lock()
+        # event_id -> event, in arrival order
+        self._pending: Dict[str, object] = {}
+        self._oldest: Optional[float] = None
+        # event_id -> failed batch attempts, for events put back after a failure
+        self._attempts: Dict[str, int] = {}
+        # No batch is cut before this time after a failure
+        self._retry_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._started = time.monotonic()
+        # (finished at, events applied) per recent batch
+        self._recent: deque = deque()
+        self._stats = {
+            "received": 0,
+            "duplicates": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "dropped_events": 0,
+            "applied": 0,
+            "already_processed": 0,
+            "profiles_updated": 0,
+        }
+        self._last_batch_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def submit(self, events: list) -> Tuple[int, int]:
+        """
+        Queue events; returns (accepted, duplicates of queued events).
+        Raises BufferError when the buffer is full, leaving it unchanged.
+        """
+        with self._lock:
+            fresh = {}
+            for event in events:
+                if event.event_id not in self._pending:
+                    fresh.setdefault(event.event_id, event)
+            if len(self._pending) + len(fresh) > self.max_pending:
+                raise BufferError(f"{len(self._pending)} metric events already pending")
+            self._pending.update(fresh)
+            if fresh and self._oldest is None:
+                self._oldest = time.monotonic()
+            self._stats["received"] += len(events)
+            self._stats["duplicates"] += len(events) - len(fresh)
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(target=self._run, name="metric-ingest", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+        return len(fresh), len(events) - len(fresh)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopping:
+                    self._wakeup.wait()
+                if not self._pending:
+                    return
+                while not self._stopping:
+                    ready_at = self._oldest + self.window_seconds if len(self._pending) < self.max_batch else 0.0
+                    remaining = max(ready_at, self._retry_at) - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+            if not self.flush() and self._stopping:
+                # Failing while shutting down: keep the events rather than spin
+                return
+
+    def flush(self) -> int:
+        """Apply up to max_batch buffered events now; returns how many were applied"""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending.values())[:self.max_batch]
+                for event in batch:
+                    del self._pending[event.event_id]
+                self._oldest = time.monotonic() if self._pending else None
+            if not batch:
+                return 0
+
+            started = time.monotonic()
+            try:
+                result = self._apply(batch)
+            except Exception as exc:
+                return self._batch_failed(batch, exc)
+            self._record(result, started)
+            with self._lock:
+                for event in batch:
+                    self._attempts.pop(event.event_id, None)
+            return len(batch)
+
+    def _record(self, result: dict, started: float) -> None:
+        finished = time.monotonic()
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["applied"] += result.get("applied", 0)
+            self._stats["already_processed"] += result.get("already_processed", 0)
+            self._stats["profiles_updated"] += result.get("profiles_updated", 0)
+            self._last_batch_ms = round((finished - started) * 1000, 2)
+            self._recent.append((finished, result.get("applied", 0)))
+
+    def _batch_failed(self, batch: list, exc: Exception) -> int:
+        """Put a failed batch back ahead of newer events, or isolate its events once out of attempts"""
+        with self._lock:
+            self._stats["failed_batches"] += 1
+            self._last_error = f"{type(exc).__name__}: {exc}"
+            self._retry_at = time.monotonic() + self.window_seconds
+            attempts = 1 + max(self._attempts.get(event.event_id, 0) for event in batch)
+            if attempts < self.max_attempts:
+                for event in batch:
+                    self._attempts[event.event_id] = attempts
+                self._pending = {**{event.event_id: event for event in batch}, **self._pending}
+                self._oldest = time.monotonic()
+                return 0
+            for event in batch:
+                self._attempts.pop(event.event_id, None)
+        return self._apply_one_by_one(batch)
+
+    def _apply_one_by_one(self, batch: list) -> int:
+        """Apply each event of a failing batch alone; returns how many were applied"""
+        failed = []
+        for event in batch:
+            started = time.monotonic()
+            try:
+                result = self._apply([event])
+            except Exception as exc:
+                failed.append((event, exc))
+                continue
+            self._record(result, started)
+        with self._lock:
+            if len(failed) == len(batch):
+                # Keep them, behind newer events, until something changes
+                self._pending = {**self._pending, **{event.event_id: event for event, _ in failed}}
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                return 0
+            self._stats["dropped_events"] += len(failed)
+            if failed:
+                self._last_error = f"dropped {len(failed)} metric events, last {failed[-1][0].event_id}: {failed[-1][1]}"
+        for event, exc in failed:
+            logger.error("Dropping metric event %s after %d failed batches: %s: %s", event.event_id, self.max_attempts, type(exc).__name__, exc)
+        return len(batch) - len(failed)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush what is buffered and stop the background thread"""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+                self._recent.popleft()
+            span = min(THROUGHPUT_WINDOW_SECONDS, now - self._started) or 1.0
+            return {
+                **self._stats,
+                "pending": len(self._pending),
+                "events_per_second": round(sum(count for _, count in self._recent) / span, 2),
+                "last_batch_ms": self._last_batch_ms,
+                "last_error": self._last_error,
+                "window_seconds": self.window_seconds,
+                "max_batch": self.max_batch,
+                "max_attempts": self.max_attempts,
+            }
\ No newline at end of file
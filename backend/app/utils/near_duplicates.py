@@ -0,0 +1,198 @@
+import re
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.creator import CreatorProfile
+from app.utils.discovery_index import REFRESH_OVERLAP
+
+# MinHash signature length, split into LSH_BANDS bands of equal width. With
+# 16 bands of 8 rows, pairs at Jaccard 0.8 share a band with ~94%
+# probability and pairs at 0.5 with ~6%.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+# Estimated Jaccard similarity at which two profiles are near-duplicates
+DUPLICATE_SIMILARITY = 0.8
+# Profiles with fewer shingles (e.g. no bio) are too short to judge
+MIN_SHINGLES = 20
+
+BIO_SHINGLE_BYTES = 5
+HANDLE_SHINGLE_BYTES = 3
+MINHASH_SEED = 20240715
+# Shingles hashed per vectorized step when signing a batch
+SIGN_BATCH_SHINGLES = 16384
+
+NEAR_DUPLICATE_COLUMNS = (
+    CreatorProfile.id,
+    CreatorProfile.bio,
+    CreatorProfile.handle,
+    CreatorProfile.social_links,
+    CreatorProfile.created_at,
+    CreatorProfile.updated_at,
+)
+
+_rng = np.random.default_rng(MINHASH_SEED)
+# Permutations x -> a * x + b (mod 2^32); odd a makes each one a bijection
+_A = _rng.integers(0, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64).astype(np.uint32) | np.uint32(1)
+_B = _rng.integers(0, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64).astype(np.uint32)
+_EMPTY = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+def _byte_shingles(text: str, size: int, salt: int) -> np.ndarray:
+    """32-bit hashes of every size-byte window of text (packed exactly, then mixed)"""
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    if len(data) < size:
+        return np.empty(0, dtype=np.uint32)
+    count = len(data) - size + 1
+    packed = data[:count].astype(np.uint64)
+    for offset in range(1, size):
+        packed |= data[offset:offset + count].astype(np.uint64) << np.uint64(8 * offset)
+    mixed = (packed ^ np.uint64(salt)) * np.uint64(0x9E3779B97F4A7C15)
+    return (mixed >> np.uint64(32)).astype(np.uint32)
+
+def profile_shingles(bio: Optional[str], handle: Optional[str], social_links) -> np.ndarray:
+    """
+    Distinct 32-bit shingles of a profile: byte 5-grams of the normalized bio,
+    byte 3-grams of the handle and one per social link.
+    """
+    parts = [
+        _byte_shingles(" ".join(re.findall(r"\w+", (bio or "").lower())), BIO_SHINGLE_BYTES, 1),
+        _byte_shingles((handle or "").lower().lstrip("@"), HANDLE_SHINGLE_BYTES, 2),
+    ]
+    links = social_links.values() if isinstance(social_links, dict) else []
+    normalized = {re.sub(r"^(https?://)?(www\.)?", "", str(link).strip().lower()).rstrip("/") for link in links if link}
+    parts.append(np.array([zlib.crc32(f"s:{link}".encode("utf-8")) for link in normalized], dtype=np.uint32))
+    return np.unique(np.concatenate(parts))
+
+def minhash_signatures(shingle_sets: List[np.ndarray]) -> np.ndarray:
+    """(len(shingle_sets), NUM_PERMUTATIONS) MinHash signatures, vectorized per batch of shingles"""
+    signatures = np.tile(_EMPTY, (len(shingle_sets), 1))
+    start = 0
+    while start < len(shingle_sets):
+        # Group whole profiles until the group holds about SIGN_BATCH_SHINGLES shingles
+        stop, total = start, 0
+        while stop < len(shingle_sets) and (stop == start or total + len(shingle_sets[stop]) <= SIGN_BATCH_SHINGLES):
+            total += len(shingle_sets[stop])
+            stop += 1
+        group = [shingles for shingles in shingle_sets[start:stop]]
+        sizes = np.array([len(shingles) for shingles in group])
+        if total:
+            # Permutations along rows keep each profile's shingles contiguous for reduceat
+            hashed = _A[:, None] * np.concatenate(group) + _B[:, None]
+            filled = np.flatnonzero(sizes)
+            offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])[filled]
+            signatures[start + filled] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = stop
+    return signatures
+
+def _band_keys(signature: np.ndarray) -> List[bytes]:
+    return [band.tobytes() for band in signature.reshape(LSH_BANDS, -1)]
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures of creator bios,
+    handles and social links. Each signature is split into LSH_BANDS bands
+    and filed under each band's value, so profiles likely to be similar
+    share a bucket. Finding near-duplicates looks up one bucket per band
+    and compares signatures only with the profiles found there, instead of
+    with every profile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signatures: Dict[uuid.UUID, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[uuid.UUID]]] = [{} for _ in range(LSH_BANDS)]
+        self.watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _unfile(self, profile_id: uuid.UUID) -> None:
+        signature = self._signatures.pop(profile_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(_band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            bucket.discard(profile_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def apply_rows(self, rows) -> int:
+        """Upsert rows (objects with the NEAR_DUPLICATE_COLUMNS attributes)"""
+        rows = list(rows)
+        shingle_sets = [profile_shingles(row.bio, row.handle, row.social_links) for row in rows]
+        signatures = minhash_signatures(shingle_sets)
+        with self._lock:
+            for row, shingles, signature in zip(rows, shingle_sets, signatures):
+                self._unfile(row.id)
+                if len(shingles) >= MIN_SHINGLES:
+                    self._signatures[row.id] = signature
+                    for band, key in enumerate(_band_keys(signature)):
+                        self._buckets[band].setdefault(key, set()).add(row.id)
+                changed_at = row.updated_at or row.created_at
+                if changed_at and (self.watermark is None or changed_at > self.watermark):
+                    self.watermark = changed_at
+        return len(rows)
+
+    def refresh(self, db: Session) -> int:
+        """Incrementally load rows changed since the watermark (all rows on first call)"""
+        query = db.query(*NEAR_DUPLICATE_COLUMNS)
+        if self.watermark is not None:
+            changed_at = func.coalesce(CreatorProfile.updated_at, CreatorProfile.created_at)
+            query = query.filter(changed_at > self.watermark - REFRESH_OVERLAP)
+        applied = 0
+        for partition in query.yield_per(5000).partitions():
+            applied += self.apply_rows(partition)
+        self.last_refresh = time.monotonic()
+        return applied
+
+    def refresh_if_stale(self, db: Session, max_age_seconds: float) -> None:
+        """Poll for changes if the last refresh is older than max_age_seconds"""
+        if time.monotonic() - self.last_refresh >= max_age_seconds:
+            self.refresh(db)
+
+    def rebuild(self, db: Session) -> int:
+        """Drop everything and load the whole table"""
+        with self._lock:
+            self._signatures = {}
+            self._buckets = [{} for _ in range(LSH_BANDS)]
+            self.watermark = None
+        return self.refresh(db)
+
+    def find(self, bio: Optional[str], handle: Optional[str], social_links, exclude=None) -> List[Tuple[uuid.UUID, float]]:
+        """(profile id, estimated Jaccard similarity) of indexed near-duplicates, most similar first"""
+        shingles = profile_shingles(bio, handle, social_links)
+        if len(shingles) < MIN_SHINGLES:
+            return []
+        return self.find_signature(minhash_signatures([shingles])[0], exclude)
+
+    def find_signature(self, signature: np.ndarray, exclude=None) -> List[Tuple[uuid.UUID, float]]:
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(_band_keys(signature)):
+                candidates |= self._buckets[band].get(key, set())
+            candidates.discard(exclude)
+            if not candidates:
+                return []
+            ids = sorted(candidates)
+            stacked = np.stack([self._signatures[profile_id] for profile_id in ids])
+        similarity = (stacked == signature).mean(axis=1)
+        keep = np.flatnonzero(similarity >= DUPLICATE_SIMILARITY)
+        order = keep[np.argsort(-similarity[keep], kind="stable")]
+        return [(ids[i], round(float(similarity[i]), 4)) for i in order]
+
+    def signature(self, profile_id) -> Optional[np.ndarray]:
+        return self._signatures.get(profile_id)
+
+    def profile_ids(self) -> List[uuid.UUID]:
+        with self._lock:
+            return list(self._signatures)
+
+near_duplicate_index = NearDuplicateIndex()
\ No newline at end of file
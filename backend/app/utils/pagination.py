@@ -0,0 +1,20 @@
+import base64
+import json
+import uuid
+from typing import Optional, Tuple
+
+def encode_cursor(sort_value, row_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    raw = json.dumps([sort_value, str(row_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[object, uuid.UUID]]:
+    """(sort value, id) from a cursor; raises ValueError if it is malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return sort_value, uuid.UUID(row_id)
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
\ No newline at end of file
@@ -0,0 +1,21 @@
+from typing import List
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+def schema_columns(model, schema) -> List:
+    """Column attributes of model that the response schema reads, in mapper order"""
+    fields = {field.alias or name for name, field in schema.model_fields.items()}
+    return [
+        getattr(model, attribute.key)
+        for attribute in inspect(model).column_attrs
+        if attribute.key in fields
+    ]
+
+def load_schema_columns(model, schema, *extra):
+    """
+    Loader option selecting only the columns schema (plus extra) needs, e.g.
+    query.options(load_schema_columns(CreatorProfile, CreatorProfilePublic)).
+    The primary key is always loaded; other columns load on first access.
+    """
+    return load_only(*schema_columns(model, schema), *extra)
\ No newline at end of file
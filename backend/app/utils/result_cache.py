@@ -0,0 +1,245 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.utils.compression import compress, negotiate_encoding, weak_etag
+from app.utils.fast_json import encode_items, render_json
+from app.utils.http_cache import (
+    DISCOVERY_CACHE_CONTROL,
+    body_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers
+)
+
+# Send "X-Discovery-Cache: bypass" to skip the cache when debugging
+CACHE_BYPASS_HEADER = "X-Discovery-Cache"
+CACHE_STATUS_HEADER = "X-Cache"
+
+def _normalize(value) -> Any:
+    """Hashable form of a filter value; lists and sets are order-independent"""
+    value = getattr(value, "value", value)
+    if isinstance(value, tuple):
+        return value
+    if isinstance(value, (list, set)):
+        return tuple(sorted(str(getattr(item, "value", item)).strip() for item in value))
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+# Entities with discovery result pages; one generation slot each
+CACHE_ENTITIES = ("creator", "brand", "agency")
+
+class LocalGenerations:
+    """Generation counters for this worker only"""
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+
+    def get(self, entity: str) -> int:
+        return self._counts.get(entity, 0)
+
+    def bump(self, entity: str) -> None:
+        self._counts[entity] = self._counts.get(entity, 0) + 1
+
+class SharedGenerations:
+    """
+    Generation counters in a small memory-mapped file, shared by every worker
+    on the host: a write in one worker invalidates the cached pages of all of
+    them. bump() increments under an exclusive flock; get() is one 8-byte read.
+    """
+
+    def __init__(self, path: str):
+        self._size = 8 * len(CACHE_ENTITIES)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < self._size:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size < self._size:
+                    os.ftruncate(self._fd, self._size)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, self._size)
+
+    def get(self, entity: str) -> int:
+        return struct.unpack_from("<Q", self._map, 8 * CACHE_ENTITIES.index(entity))[0]
+
+    def bump(self, entity: str) -> None:
+        offset = 8 * CACHE_ENTITIES.index(entity)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            value = struct.unpack_from("<Q", self._map, offset)[0]
+            struct.pack_into("<Q", self._map, offset, value + 1)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+class DiscoveryResultCache:
+    """
+    Bounded TTL + LRU cache of discovery result pages.
+    Entries are keyed on the normalized filter set and stamped with the
+    entity's generation counter; create/update writes bump the counter,
+    which invalidates every cached page for that entity at once.
+    Counters are per worker unless generations is a SharedGenerations; the
+    TTL bounds how long a write made elsewhere can go unseen.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, generations=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generations = generations if generations is not None else LocalGenerations()
+        self._stats = {"hits": 0, "misses": 0, "bypasses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(entity: str, filters: dict) -> tuple:
+        normalized = tuple(sorted(
+            (name, _normalize(value))
+            for name, value in filters.items()
+            if value not in (None, [], "")
+        ))
+        return (entity, normalized)
+
+    def generation(self, entity: str) -> int:
+        return self._generations.get(entity)
+
+    def bump(self, entity: str) -> None:
+        """Invalidate all cached pages for entity (called on profile writes)"""
+        with self._lock:
+            self._generations.bump(entity)
+            self._stats["invalidations"] += 1
+
+    def get(self, entity: str, filters: dict) -> Optional[Any]:
+        key = self.key(entity, filters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, expires_at, value = entry
+                if generation == self.generation(entity) and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._entries[key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, entity: str, filters: dict, value: Any, generation: int) -> None:
+        """Store value computed under generation; dropped if a write happened meanwhile"""
+        with self._lock:
+            if generation != self.generation(entity):
+                return
+            key = self.key(entity, filters)
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypasses"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+discovery_cache = DiscoveryResultCache(
+    max_entries=settings.DISCOVERY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.DISCOVERY_CACHE_TTL_SECONDS,
+    generations=SharedGenerations(settings.DISCOVERY_CACHE_GENERATION_PATH)
+    if settings.DISCOVERY_CACHE_GENERATION_PATH else None
+)
+
+def _discovery_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    cache_status: str,
+    encoded: Optional[Dict[str, bytes]] = None
+) -> Response:
+    """
+    200 with the body, or 304 when the client already has this page.
+    encoded holds the cache entry's compressed bodies by Content-Encoding;
+    a missing one is compressed once and kept there, so hits are never
+    recompressed. Without it the compression middleware handles the body.
+    """
+    encoding = None
+    if encoded is not None and len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        etag = weak_etag(etag)
+    if etag_matches(request, etag):
+        response = not_modified(etag, DISCOVERY_CACHE_CONTROL)
+    elif encoding is not None:
+        if encoding not in encoded:
+            encoded[encoding] = compress(body, encoding)
+        response = Response(encoded[encoding], media_type="application/json", headers={"Content-Encoding": encoding})
+        set_cache_headers(response, etag, DISCOVERY_CACHE_CONTROL)
+    else:
+        response = Response(body, media_type="application/json")
+        set_cache_headers(response, etag, DISCOVERY_CACHE_CONTROL)
+    if encoded is not None:
+        response.headers["Vary"] = "Accept-Encoding"
+    response.headers[CACHE_STATUS_HEADER] = cache_status
+    return response
+
+def cached_discovery_response(
+    request: Request,
+    entity: str,
+    filters: dict,
+    load: Callable[[], Union[list, dict]],
+    schema
+) -> Response:
+    """
+    Serve a discovery page from the result cache, or load, serialize with the
+    public response schema (app/utils/fast_json.py) and cache the rendered
+    body with its ETag.
+    load returns the items, or a dict whose "items" are serialized the same way.
+    X-Cache reports HIT, MISS or BYPASS; If-None-Match gets a 304.
+    Compressed bodies are cached next to the plain one, per encoding.
+    """
+    def render() -> tuple:
+        loaded = load()
+        if isinstance(loaded, dict):
+            payload = {**loaded, "items": encode_items(schema, loaded["items"])}
+        else:
+            payload = encode_items(schema, loaded)
+        body = render_json(payload)
+        return body, body_etag(body)
+
+    if request.headers.get(CACHE_BYPASS_HEADER, "").lower() == "bypass":
+        discovery_cache.record_bypass()
+        body, etag = render()
+        return _discovery_response(request, body, etag, "BYPASS")
+
+    cached = discovery_cache.get(entity, filters)
+    if cached is not None:
+        body, etag, encoded = cached
+        return _discovery_response(request, body, etag, "HIT", encoded)
+
+    # Read the generation before loading so a concurrent write is never cached over
+    generation = discovery_cache.generation(entity)
+    body, etag = render()
+    encoded = {}
+    discovery_cache.set(entity, filters, (body, etag, encoded), generation)
+    return _discovery_response(request, body, etag, "MISS", encoded)
\ No newline at end of file
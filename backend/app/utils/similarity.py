@@ -0,0 +1,294 @@
+import hashlib
+import math
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.creator import CreatorProfile, ContentTypeEnum
+from app.utils.discovery_index import REFRESH_OVERLAP
+from app.utils.tags import normalize_tag
+
+# Hashed feature space. Terms are signed-hashed straight into this many dense
+# dimensions, so the vectors need no fixed vocabulary.
+VECTOR_DIMENSIONS = 256
+
+# Inverted-file ANN: vectors are bucketed under their nearest of ~sqrt(n)
+# k-means centroids and a query re-ranks the members of its IVF_PROBES
+# nearest buckets. Below IVF_MIN_ROWS an exact scan is just as fast.
+IVF_MIN_ROWS = 20000
+IVF_PROBES = 24
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 32
+KMEANS_SEED = 20240601
+
+# Rows vectorized together when loading
+EMBED_BATCH_ROWS = 4096
+
+# Relative weight of each field's terms in the vector
+TAG_WEIGHT = 3.0
+CONTENT_TYPE_WEIGHT = 2.0
+BIO_WEIGHT = 1.0
+
+SIMILARITY_COLUMNS = (
+    CreatorProfile.id,
+    CreatorProfile.is_public,
+    CreatorProfile.bio,
+    CreatorProfile.tags,
+    CreatorProfile.content_type,
+    CreatorProfile.created_at,
+    CreatorProfile.updated_at,
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def creator_terms(bio: Optional[str], tags: Optional[List[str]], content_type) -> Dict[str, float]:
+    """Weighted term counts for a creator: bio words and word bigrams, tags, content type"""
+    terms: Dict[str, float] = defaultdict(float)
+    words = [word for word in _WORD.findall((bio or "").lower()) if len(word) > 2]
+    for word in words:
+        terms[f"w:{word}"] += BIO_WEIGHT
+    for first, second in zip(words, words[1:]):
+        terms[f"b:{first}_{second}"] += BIO_WEIGHT
+    for tag in tags or []:
+        terms[f"t:{normalize_tag(tag)}"] += TAG_WEIGHT
+    if content_type is not None:
+        terms[f"c:{ContentTypeEnum(content_type).value.lower()}"] += CONTENT_TYPE_WEIGHT
+    return terms
+
+def term_slot(term: str) -> tuple:
+    """Stable (dimension, sign) for a term, independent of PYTHONHASHSEED"""
+    digest = int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % VECTOR_DIMENSIONS, 1.0 if (digest >> 63) else -1.0
+
+class CreatorSimilarityIndex:
+    """
+    In-process approximate nearest-neighbour index over public creators.
+    Each creator is a hashed TF-IDF vector (L2-normalized, cosine similarity)
+    built from bio, tags and content type. Large indexes are searched through
+    an inverted file over k-means centroids, then re-ranked by exact cosine.
+    IDF weights use document frequencies at the time a row is written;
+    rebuild() re-weights every row and retrains the centroids.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._size = 0
+        self._live = 0
+        self._ids: List[uuid.UUID] = []
+        self._rows: Dict[uuid.UUID, int] = {}
+        # Term dictionary: id -> hashed slot/sign and document frequency
+        self._term_ids: Dict[str, int] = {}
+        self._term_slots = np.zeros(1024, dtype=np.int64)
+        self._term_signs = np.zeros(1024, dtype=np.float64)
+        self._document_frequency = np.zeros(1024, dtype=np.int64)
+        # Per row: (term ids, sublinear tf weights)
+        self._row_terms: List[Optional[tuple]] = []
+        self._vectors = np.zeros((capacity, VECTOR_DIMENSIONS), dtype=np.float32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._list_of = np.full(capacity, -1, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[Set[int]] = []
+        self._trained_rows = 0
+        self.watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = len(self._term_ids)
+            if term_id == len(self._term_slots):
+                for name in ("_term_slots", "_term_signs", "_document_frequency"):
+                    old = getattr(self, name)
+                    setattr(self, name, np.concatenate([old, np.zeros_like(old)]))
+            self._term_slots[term_id], self._term_signs[term_id] = term_slot(term)
+        return term_id
+
+    def _grow(self, capacity: int) -> None:
+        for name, fill in (("_vectors", 0), ("_alive", False), ("_list_of", -1)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _unfile(self, position: int) -> None:
+        if self._list_of[position] >= 0:
+            self._lists[self._list_of[position]].discard(position)
+            self._list_of[position] = -1
+
+    def _unlink(self, position: int) -> None:
+        if self._alive[position]:
+            term_ids, _ = self._row_terms[position]
+            self._document_frequency[term_ids] -= 1
+            self._live -= 1
+            self._unfile(position)
+        self._alive[position] = False
+
+    def _embed(self, positions: List[int]) -> None:
+        """
+        Write hashed TF-IDF vectors (sublinear tf, smoothed idf, L2-normalized)
+        for a batch of rows in one vectorized pass, and file them under their
+        nearest centroid when the inverted file is trained.
+        """
+        if not positions:
+            return
+        term_ids = np.concatenate([self._row_terms[position][0] for position in positions])
+        tf = np.concatenate([self._row_terms[position][1] for position in positions])
+        owners = np.repeat(np.arange(len(positions)), [len(self._row_terms[position][0]) for position in positions])
+        idf = np.log((1 + max(self._live, 1)) / (1 + self._document_frequency[term_ids])) + 1.0
+        vectors = np.bincount(
+            owners * VECTOR_DIMENSIONS + self._term_slots[term_ids],
+            weights=self._term_signs[term_ids] * tf * idf,
+            minlength=len(positions) * VECTOR_DIMENSIONS
+        ).reshape(len(positions), VECTOR_DIMENSIONS)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        rows = np.array(positions)
+        self._vectors[rows] = vectors / np.where(norms == 0, 1.0, norms)
+        if self._centroids is not None:
+            self._file(rows)
+
+    def _file(self, rows: np.ndarray) -> None:
+        """Add rows to the list of their nearest centroid"""
+        nearest = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+        for position, list_id in zip(rows.tolist(), nearest.tolist()):
+            self._lists[list_id].add(position)
+            self._list_of[position] = list_id
+
+    def apply_rows(self, rows) -> int:
+        """
+        Upsert rows (objects with the SIMILARITY_COLUMNS attributes).
+        Private profiles drop out of the index.
+        """
+        applied = 0
+        with self._lock:
+            pending: List[int] = []
+            for row in rows:
+                position = self._rows.get(row.id)
+                if position is None:
+                    if self._size == len(self._alive):
+                        self._grow(self._size * 2)
+                    position = self._size
+                    self._size += 1
+                    self._ids.append(row.id)
+                    self._rows[row.id] = position
+                    self._row_terms.append(None)
+                self._unlink(position)
+
+                if row.is_public:
+                    terms = creator_terms(row.bio, row.tags, row.content_type)
+                    known = [self._term_ids.get(term) for term in terms]
+                    if None in known:
+                        known = [self._term_id(term) for term in terms]
+                    term_ids = np.array(known, dtype=np.int64)
+                    tf = np.array([1.0 + math.log(count) for count in terms.values()])
+                    self._row_terms[position] = (term_ids, tf)
+                    self._document_frequency[term_ids] += 1
+                    self._alive[position] = True
+                    self._live += 1
+                    pending.append(position)
+                    if len(pending) >= EMBED_BATCH_ROWS:
+                        self._embed_pending(pending)
+                        pending = []
+                else:
+                    self._row_terms[position] = None
+
+                changed_at = row.updated_at or row.created_at
+                if changed_at and (self.watermark is None or changed_at > self.watermark):
+                    self.watermark = changed_at
+                applied += 1
+            self._embed_pending(pending)
+
+            # Train once the index is big enough, and again each time it doubles
+            if self._live >= IVF_MIN_ROWS and self._live >= 2 * self._trained_rows:
+                self._train()
+        return applied
+
+    def _embed_pending(self, pending: List[int]) -> None:
+        # A row repeated in one batch is embedded once; one made private since is skipped
+        live = [position for position in dict.fromkeys(pending) if self._alive[position]]
+        for position in live:
+            self._unfile(position)
+        self._embed(live)
+
+    def _train(self) -> None:
+        """Spherical k-means over a sample of live vectors, then refile every row"""
+        live = np.flatnonzero(self._alive[:self._size])
+        list_count = int(min(4096, max(16, math.sqrt(len(live)))))
+        rng = np.random.default_rng(KMEANS_SEED)
+        sample = self._vectors[rng.choice(live, min(len(live), list_count * KMEANS_SAMPLE_PER_LIST), replace=False)]
+        centroids = sample[rng.choice(len(sample), list_count, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            nearest = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, nearest, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.where(norms == 0, 1.0, norms), centroids)
+
+        self._centroids = centroids.astype(np.float32)
+        self._lists = [set() for _ in range(list_count)]
+        self._list_of[:] = -1
+        for start in range(0, len(live), 65536):
+            self._file(live[start:start + 65536])
+        self._trained_rows = len(live)
+
+    def refresh(self, db: Session) -> int:
+        """Incrementally load rows changed since the watermark (all rows on first call)"""
+        changed_at = func.coalesce(CreatorProfile.updated_at, CreatorProfile.created_at)
+        query = db.query(*SIMILARITY_COLUMNS)
+        if self.watermark is not None:
+            query = query.filter(changed_at > self.watermark - REFRESH_OVERLAP)
+        applied = self.apply_rows(query.yield_per(5000))
+        self.last_refresh = time.monotonic()
+        return applied
+
+    def refresh_if_stale(self, db: Session, max_age_seconds: float) -> None:
+        """Poll for changes if the last refresh is older than max_age_seconds"""
+        if time.monotonic() - self.last_refresh >= max_age_seconds:
+            self.refresh(db)
+
+    def rebuild(self) -> None:
+        """Re-weight every vector with the current document frequencies and retrain"""
+        with self._lock:
+            live = [int(position) for position in np.flatnonzero(self._alive[:self._size])]
+            self._centroids = None
+            self._list_of[:] = -1
+            for start in range(0, len(live), EMBED_BATCH_ROWS):
+                self._embed(live[start:start + EMBED_BATCH_ROWS])
+            if len(live) >= IVF_MIN_ROWS:
+                self._train()
+
+    def similar(self, profile_id: uuid.UUID, limit: int = 10) -> List[tuple]:
+        """
+        (creator id, cosine similarity) for the creators most similar to
+        profile_id, best first, excluding itself. Empty if it is not indexed.
+        """
+        with self._lock:
+            position = self._rows.get(profile_id)
+            if position is None or not self._alive[position]:
+                return []
+            query = self._vectors[position]
+            if self._centroids is None:
+                rows = np.flatnonzero(self._alive[:self._size])
+            else:
+                probes = np.argsort(-(self._centroids @ query))[:IVF_PROBES]
+                members = set().union(*(self._lists[list_id] for list_id in probes.tolist()))
+                rows = np.fromiter(members, dtype=np.int64, count=len(members))
+            rows = rows[rows != position]
+            if not len(rows):
+                return []
+            scores = self._vectors[rows] @ query
+            order = np.lexsort((rows, -scores))[:limit]
+            return [(self._ids[rows[i]], round(float(scores[i]), 4)) for i in order]
+
+creator_similarity_index = CreatorSimilarityIndex()
\ No newline at end of file
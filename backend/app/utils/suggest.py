@@ -0,0 +1,201 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.brand import BrandProfile
+from app.db.models.creator import CreatorProfile
+from app.utils.discovery_index import REFRESH_OVERLAP
+
+SUGGEST_KINDS = ("handle", "creator", "brand", "tag")
+
+# Matching entries looked at per query before ranking; bounds the work for
+# short prefixes such as a single letter
+SUGGEST_SCAN_LIMIT = 500
+
+# Above this many keys added in one apply call, append and re-sort instead
+# of inserting each key in place
+BULK_MERGE_KEYS = 64
+
+# Separates the search key from the entry identity in the sorted keys, and
+# sorts below every printable character so prefixes still bisect correctly
+_SEPARATOR = "\x00"
+
+CREATOR_SUGGEST_COLUMNS = (
+    CreatorProfile.id,
+    CreatorProfile.is_public,
+    CreatorProfile.handle,
+    CreatorProfile.display_name,
+    CreatorProfile.tags,
+    CreatorProfile.xp_score,
+    CreatorProfile.created_at,
+    CreatorProfile.updated_at,
+)
+
+BRAND_SUGGEST_COLUMNS = (
+    BrandProfile.id,
+    BrandProfile.brand_name,
+    BrandProfile.total_campaigns,
+    BrandProfile.created_at,
+    BrandProfile.updated_at,
+)
+
+def suggest_key(text: str) -> str:
+    """Case- and whitespace-insensitive search key"""
+    return " ".join(text.lower().split())
+
+class SuggestIndex:
+    """
+    Typeahead over creator handles and display names, brand names and tags.
+    Entries live in one sorted array of "key\\0kind\\0ref" strings, so a prefix
+    lookup is a binary search plus a short forward scan. Writes insert and
+    remove single entries in place; bulk loads append and re-sort once. Only public creators are suggested, but
+    every handle is kept in a set for availability checks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        # Keys added by the apply call in progress, merged in once at its end
+        self._pending: Set[str] = set()
+        # (kind, ref) -> (label, weight, sorted key) for every indexed entry
+        self._entries: Dict[Tuple[str, str], tuple] = {}
+        # creator id -> (handle, tags counted while public)
+        self._creators: Dict[str, tuple] = {}
+        self._handles: Set[str] = set()
+        self._tag_counts: Dict[str, int] = {}
+        self.creator_watermark: Optional[datetime] = None
+        self.brand_watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _put(self, kind: str, ref: str, label: Optional[str], weight: float) -> None:
+        """Insert, replace or (label None) remove one entry"""
+        previous = self._entries.pop((kind, ref), None)
+        if previous is not None:
+            if previous[2] in self._pending:
+                self._pending.discard(previous[2])
+            else:
+                del self._keys[bisect_left(self._keys, previous[2])]
+        if label:
+            sorted_key = f"{suggest_key(label)}{_SEPARATOR}{kind}{_SEPARATOR}{ref}"
+            self._pending.add(sorted_key)
+            self._entries[(kind, ref)] = (label, weight, sorted_key)
+
+    def _merge_pending(self) -> None:
+        """Insert pending keys: one by one for a few writes, one sort for bulk loads"""
+        if len(self._pending) > BULK_MERGE_KEYS:
+            self._keys.extend(self._pending)
+            self._keys.sort()
+        else:
+            for sorted_key in self._pending:
+                insort(self._keys, sorted_key)
+        self._pending.clear()
+
+    def _count_tag(self, tag: str, delta: int) -> None:
+        count = self._tag_counts.get(tag, 0) + delta
+        if count > 0:
+            self._tag_counts[tag] = count
+        else:
+            self._tag_counts.pop(tag, None)
+        self._put("tag", tag, tag if count > 0 else None, count)
+
+    def apply_creators(self, rows) -> int:
+        """Upsert creator rows (objects with the CREATOR_SUGGEST_COLUMNS attributes)"""
+        applied = 0
+        with self._lock:
+            for row in rows:
+                ref = str(row.id)
+                old_handle, old_tags = self._creators.get(ref, (None, ()))
+                if old_handle:
+                    self._handles.discard(old_handle)
+                for tag in old_tags:
+                    self._count_tag(tag, -1)
+
+                tags = tuple(sorted(set(row.tags or []))) if row.is_public else ()
+                self._creators[ref] = (row.handle, tags)
+                if row.handle:
+                    self._handles.add(row.handle)
+                for tag in tags:
+                    self._count_tag(tag, 1)
+                weight = float(row.xp_score or 0)
+                self._put("handle", ref, row.handle if row.is_public else None, weight)
+                self._put("creator", ref, row.display_name if row.is_public else None, weight)
+
+                changed_at = row.updated_at or row.created_at
+                if changed_at and (self.creator_watermark is None or changed_at > self.creator_watermark):
+                    self.creator_watermark = changed_at
+                applied += 1
+            self._merge_pending()
+        return applied
+
+    def apply_brands(self, rows) -> int:
+        """Upsert brand rows (objects with the BRAND_SUGGEST_COLUMNS attributes)"""
+        applied = 0
+        with self._lock:
+            for row in rows:
+                self._put("brand", str(row.id), row.brand_name, float(row.total_campaigns or 0))
+                changed_at = row.updated_at or row.created_at
+                if changed_at and (self.brand_watermark is None or changed_at > self.brand_watermark):
+                    self.brand_watermark = changed_at
+                applied += 1
+            self._merge_pending()
+        return applied
+
+    def refresh(self, db: Session) -> int:
+        """Incrementally load creators and brands changed since the watermarks"""
+        applied = 0
+        for model, columns, watermark, apply in (
+            (CreatorProfile, CREATOR_SUGGEST_COLUMNS, self.creator_watermark, self.apply_creators),
+            (BrandProfile, BRAND_SUGGEST_COLUMNS, self.brand_watermark, self.apply_brands),
+        ):
+            query = db.query(*columns)
+            if watermark is not None:
+                query = query.filter(func.coalesce(model.updated_at, model.created_at) > watermark - REFRESH_OVERLAP)
+            applied += apply(query.yield_per(5000))
+        self.last_refresh = time.monotonic()
+        return applied
+
+    def refresh_if_stale(self, db: Session, max_age_seconds: float) -> None:
+        """Poll for changes if the last refresh is older than max_age_seconds"""
+        if time.monotonic() - self.last_refresh >= max_age_seconds:
+            self.refresh(db)
+
+    def has_handle(self, handle: str) -> bool:
+        """True if a profile had this handle at the last refresh; it may have been released since"""
+        return handle in self._handles
+
+    def suggest(self, prefix: str, limit: int = 10, kinds: Optional[List[str]] = None) -> List[dict]:
+        """
+        Entries whose key starts with prefix, heaviest first (xp score for
+        creators, campaigns for brands, public creators for tags).
+        """
+        key = suggest_key(prefix.lstrip("@"))
+        if not key:
+            return []
+        wanted = set(kinds or SUGGEST_KINDS)
+        with self._lock:
+            position = bisect_left(self._keys, key)
+            matches = []
+            for sorted_key in self._keys[position:position + SUGGEST_SCAN_LIMIT]:
+                if not sorted_key.startswith(key):
+                    break
+                _, kind, ref = sorted_key.split(_SEPARATOR)
+                if kind in wanted:
+                    label, weight, _ = self._entries[(kind, ref)]
+                    matches.append({
+                        "kind": kind,
+                        "text": label,
+                        "id": None if kind == "tag" else ref,
+                        "weight": weight,
+                    })
+        matches.sort(key=lambda match: (-match["weight"], len(match["text"]), match["text"]))
+        return matches[:limit]
+
+suggest_index = SuggestIndex()
\ No newline at end of file
@@ -0,0 +1,12 @@
+from typing import Iterable, List, Optional
+
+def normalize_tag(tag: str) -> str:
+    """Stored and compared form of a tag: stripped and lower-cased"""
+    return tag.strip().lower()
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Normalized tags in first-seen order, without blanks or duplicates"""
+    if tags is None:
+        return None
+    normalized = (normalize_tag(tag) for tag in tags)
+    return list(dict.fromkeys(tag for tag in normalized if tag))
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""Shared helpers for the revisions in versions/.
+
+App startup (create_all) builds missing tables and indexes from the current
+models, so a database may already hold what a revision adds. Every helper
+skips objects that already exist, which lets each revision apply cleanly to
+such a database.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def inspector():
+    return sa.inspect(op.get_bind())
+
+
+def has_table(name: str) -> bool:
+    return inspector().has_table(name)
+
+
+def has_column(table: str, column: str) -> bool:
+    return any(item["name"] == column for item in inspector().get_columns(table))
+
+
+def has_index(table: str, name: str) -> bool:
+    return any(item["name"] == name for item in inspector().get_indexes(table))
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    if not has_column(table, column.name):
+        op.add_column(table, column)
+
+
+def create_index(name: str, table: str, columns, **kw) -> None:
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kw)
+
+
+def public_only():
+    return sa.text("is_public = true")
+
+
+def desc_id(column: str) -> list:
+    """column DESC NULLS LAST, id: the discovery sort index layout"""
+    return [sa.text(f"{column} DESC NULLS LAST"), "id"]
@@ -0,0 +1,35 @@
+"""currency rates
+
+USD value per unit of each quote currency.
+
+Revision ID: 1674ae500421
+Revises: 2c171e55a2b0
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import has_table
+
+
+# revision identifiers, used by Alembic.
+revision = '1674ae500421'
+down_revision = '2c171e55a2b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table('currency_rates'):
+        op.create_table(
+            'currency_rates',
+            sa.Column('code', sa.String(length=3), nullable=False, comment='ISO 4217 currency code'),
+            sa.Column('usd_per_unit', sa.Float(), nullable=False, comment='Value of one unit in US dollars'),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.PrimaryKeyConstraint('code')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('currency_rates')
@@ -0,0 +1,56 @@
+"""brand creator matches
+
+Persisted top creator matches per brand, ranked by score, and the time
+each brand's list was last built.
+
+Revision ID: 242bab1798a1
+Revises: 56b50fbe6ee4
+Create Date: 2026-10-19 09:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.helpers import create_index, has_column, has_table
+
+
+# revision identifiers, used by Alembic.
+revision = '242bab1798a1'
+down_revision = '56b50fbe6ee4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table('brand_creator_matches'):
+        op.create_table(
+            'brand_creator_matches',
+            sa.Column('brand_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('creator_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('score', sa.Float(), nullable=False, comment='Match score (0-1)'),
+            sa.Column('components', sa.JSON(), nullable=True, comment='Per-component score breakdown'),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.ForeignKeyConstraint(['brand_id'], ['brand_profiles.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['creator_id'], ['creator_profiles.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('brand_id', 'creator_id')
+        )
+    create_index(
+        'ix_brand_creator_matches_brand_score', 'brand_creator_matches',
+        ['brand_id', sa.text('score DESC'), 'creator_id']
+    )
+    if not has_column('brand_profiles', 'matches_built_at'):
+        op.add_column('brand_profiles', sa.Column(
+            'matches_built_at', sa.DateTime(timezone=True), nullable=True,
+            comment='When the match list was last built; NULL until the first build'
+        ))
+        # Lists that already exist count as built
+        op.execute("""
+            UPDATE brand_profiles SET matches_built_at = now()
+            WHERE EXISTS (SELECT 1 FROM brand_creator_matches WHERE brand_creator_matches.brand_id = brand_profiles.id)
+        """)
+
+
+def downgrade() -> None:
+    op.drop_column('brand_profiles', 'matches_built_at')
+    op.drop_table('brand_creator_matches')
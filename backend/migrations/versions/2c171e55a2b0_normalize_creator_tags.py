@@ -0,0 +1,56 @@
+"""normalize creator tags
+
+Tags are stored stripped, lower-cased and without duplicates (see
+app.utils.tags.normalize_tags). Rewrites existing profiles to that form
+and recounts the tag facet.
+
+Revision ID: 2c171e55a2b0
+Revises: deba13d3dfd6
+Create Date: 2026-10-19 09:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c171e55a2b0'
+down_revision = 'deba13d3dfd6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # updated_at moves so the discovery, leaderboard and typeahead indexes pick the rows up
+    op.execute("""
+        WITH normalized AS (
+            SELECT id, ARRAY(
+                SELECT tag FROM (
+                    SELECT lower(btrim(raw)) AS tag, min(ord) AS ord
+                    FROM unnest(creator_profiles.tags) WITH ORDINALITY AS t(raw, ord)
+                    WHERE btrim(raw) <> ''
+                    GROUP BY 1
+                ) AS distinct_tags
+                ORDER BY ord
+            ) AS tags
+            FROM creator_profiles
+            WHERE tags IS NOT NULL
+        )
+        UPDATE creator_profiles
+        SET tags = normalized.tags, updated_at = now()
+        FROM normalized
+        WHERE creator_profiles.id = normalized.id AND creator_profiles.tags IS DISTINCT FROM normalized.tags
+    """)
+    op.execute("DELETE FROM creator_facet_counts WHERE facet = 'tag'")
+    op.execute("""
+        INSERT INTO creator_facet_counts (facet, value, count)
+        SELECT 'tag', tags.tag, count(*)
+        FROM creator_profiles
+        CROSS JOIN LATERAL (SELECT DISTINCT unnest(creator_profiles.tags) AS tag) AS tags
+        WHERE is_public AND tags.tag IS NOT NULL GROUP BY tags.tag
+    """)
+
+
+def downgrade() -> None:
+    # The original spelling of each tag is not kept
+    pass
@@ -0,0 +1,76 @@
+"""geocoded locations
+
+Latitude, longitude and geohash on creator, brand and agency profiles,
+with the geohash prefix indexes behind radius search. Existing locations
+are geocoded against the bundled gazetteer.
+
+Revision ID: 3f2a9c1d7b40
+Revises: 242bab1798a1
+Create Date: 2026-10-19 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, create_index, has_column, public_only
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b40'
+down_revision = '242bab1798a1'
+branch_labels = None
+depends_on = None
+
+GEO_TABLES = ("creator_profiles", "brand_profiles", "agency_profiles")
+
+
+def _backfill_geocodes(table: str) -> None:
+    """Geocode existing rows once per distinct location against the bundled gazetteer"""
+    from app.utils.geo import geocode, geohash_encode
+
+    bind = op.get_bind()
+    locations = bind.execute(sa.text(
+        f"SELECT DISTINCT location FROM {table} WHERE location IS NOT NULL AND latitude IS NULL"
+    )).scalars().all()
+    for location in locations:
+        place = geocode(location)
+        if place is None:
+            continue
+        bind.execute(
+            sa.text(
+                f"UPDATE {table} SET latitude = :latitude, longitude = :longitude, geohash = :geohash "
+                "WHERE location = :location AND latitude IS NULL"
+            ),
+            {
+                "latitude": place.latitude,
+                "longitude": place.longitude,
+                "geohash": geohash_encode(place.latitude, place.longitude),
+                "location": location,
+            }
+        )
+
+
+def upgrade() -> None:
+    for table in GEO_TABLES:
+        geocoded = has_column(table, "latitude")
+        add_column(table, sa.Column('latitude', sa.Float(), nullable=True, comment='Latitude of the geocoded location'))
+        add_column(table, sa.Column('longitude', sa.Float(), nullable=True, comment='Longitude of the geocoded location'))
+        add_column(table, sa.Column('geohash', sa.String(length=12), nullable=True, comment='Geohash of latitude/longitude for radius search'))
+        if not geocoded:
+            _backfill_geocodes(table)
+    create_index(
+        'ix_creator_profiles_public_geohash', 'creator_profiles', ['geohash'],
+        postgresql_ops={'geohash': 'varchar_pattern_ops'}, postgresql_where=public_only()
+    )
+    create_index('ix_brand_profiles_geohash', 'brand_profiles', ['geohash'], postgresql_ops={'geohash': 'varchar_pattern_ops'})
+    create_index('ix_agency_profiles_geohash', 'agency_profiles', ['geohash'], postgresql_ops={'geohash': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agency_profiles_geohash', table_name='agency_profiles')
+    op.drop_index('ix_brand_profiles_geohash', table_name='brand_profiles')
+    op.drop_index('ix_creator_profiles_public_geohash', table_name='creator_profiles')
+    for table in GEO_TABLES:
+        op.drop_column(table, 'geohash')
+        op.drop_column(table, 'longitude')
+        op.drop_column(table, 'latitude')
@@ -0,0 +1,71 @@
+"""discovery facet counts
+
+Per-value counts of public creators for the discovery facets, kept up to
+date on every profile write. Backfilled from the existing profiles.
+
+Revision ID: 56b50fbe6ee4
+Revises: d0b0a85a6694
+Create Date: 2026-10-19 09:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import has_table
+
+
+# revision identifiers, used by Alembic.
+revision = '56b50fbe6ee4'
+down_revision = 'd0b0a85a6694'
+branch_labels = None
+depends_on = None
+
+# Enum names stored by the creator Enum columns -> values shown by the API
+CONTENT_TYPE_VALUES = {
+    "REELS": "Reels", "STORIES": "Stories", "POSTS": "Posts",
+    "YOUTUBE": "YouTube", "BLOGS": "Blogs", "ALL": "All",
+}
+CREATOR_TYPE_VALUES = {"NANO": "Nano", "MICRO": "Micro", "MACRO": "Macro", "CELEBRITY": "Celebrity"}
+
+
+def _enum_value_case(column: str, values: dict) -> str:
+    whens = " ".join(f"WHEN '{name}' THEN '{value}'" for name, value in values.items())
+    return f"CASE {column}::text {whens} END"
+
+
+def _backfill_facet_counts() -> None:
+    """Same keys as app.crud.creator._creator_facet_keys, counted over public profiles"""
+    op.execute(f"""
+        INSERT INTO creator_facet_counts (facet, value, count)
+        SELECT 'total', '', count(*) FROM creator_profiles WHERE is_public
+        UNION ALL
+        SELECT 'content_type', {_enum_value_case('content_type', CONTENT_TYPE_VALUES)}, count(*)
+        FROM creator_profiles WHERE is_public AND content_type IS NOT NULL GROUP BY content_type
+        UNION ALL
+        SELECT 'creator_type', {_enum_value_case('creator_type', CREATOR_TYPE_VALUES)}, count(*)
+        FROM creator_profiles WHERE is_public AND creator_type IS NOT NULL GROUP BY creator_type
+        UNION ALL
+        SELECT 'location', location, count(*)
+        FROM creator_profiles WHERE is_public AND location <> '' GROUP BY location
+        UNION ALL
+        SELECT 'tag', tags.tag, count(*)
+        FROM creator_profiles
+        CROSS JOIN LATERAL (SELECT DISTINCT unnest(creator_profiles.tags) AS tag) AS tags
+        WHERE is_public AND tags.tag IS NOT NULL GROUP BY tags.tag
+    """)
+
+
+def upgrade() -> None:
+    if not has_table('creator_facet_counts'):
+        op.create_table(
+            'creator_facet_counts',
+            sa.Column('facet', sa.String(), nullable=False, comment='Facet name'),
+            sa.Column('value', sa.String(), nullable=False, comment='Facet value (enum values as shown in the API)'),
+            sa.Column('count', sa.Integer(), nullable=False, comment='Number of public profiles with this value'),
+            sa.PrimaryKeyConstraint('facet', 'value')
+        )
+        _backfill_facet_counts()
+
+
+def downgrade() -> None:
+    op.drop_table('creator_facet_counts')
@@ -0,0 +1,43 @@
+"""discovery filter indexes
+
+Partial composite indexes for the multi-value discovery filters and the
+GIN index behind tag containment.
+
+Revision ID: 661a7be185bc
+Revises: 68ed6431f0ff
+Create Date: 2026-10-19 09:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index, desc_id, public_only
+
+
+# revision identifiers, used by Alembic.
+revision = '661a7be185bc'
+down_revision = '68ed6431f0ff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for name, column in (('content_type', 'content_type'), ('creator_type', 'creator_type'), ('language', 'language')):
+        create_index(
+            f'ix_creator_profiles_public_{name}_xp', 'creator_profiles',
+            [column, *desc_id('xp_score')], postgresql_where=public_only()
+        )
+    create_index(
+        'ix_creator_profiles_public_verified_xp', 'creator_profiles', desc_id('xp_score'),
+        postgresql_where=sa.text('is_public = true AND is_verified = true')
+    )
+    create_index('ix_creator_profiles_public_tags', 'creator_profiles', ['tags'], postgresql_using='gin', postgresql_where=public_only())
+
+
+def downgrade() -> None:
+    for name in (
+        'ix_creator_profiles_public_tags', 'ix_creator_profiles_public_verified_xp',
+        'ix_creator_profiles_public_language_xp', 'ix_creator_profiles_public_creator_type_xp',
+        'ix_creator_profiles_public_content_type_xp',
+    ):
+        op.drop_index(name, table_name='creator_profiles')
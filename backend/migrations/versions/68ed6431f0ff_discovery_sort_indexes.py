@@ -0,0 +1,44 @@
+"""discovery sort indexes
+
+Indexes behind the sort_by orders of the creator, brand and agency
+discovery endpoints.
+
+Revision ID: 68ed6431f0ff
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index, desc_id, public_only
+
+
+# revision identifiers, used by Alembic.
+revision = '68ed6431f0ff'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index('ix_creator_profiles_public_xp_score', 'creator_profiles', desc_id('xp_score'), postgresql_where=public_only())
+    create_index('ix_creator_profiles_public_engagement', 'creator_profiles', desc_id('avg_engagement_rate'), postgresql_where=public_only())
+    create_index('ix_creator_profiles_public_total_campaigns', 'creator_profiles', desc_id('total_campaigns'), postgresql_where=public_only())
+    create_index('ix_creator_profiles_public_created_at', 'creator_profiles', desc_id('created_at'), postgresql_where=public_only())
+    create_index('ix_brand_profiles_total_campaigns', 'brand_profiles', desc_id('total_campaigns'))
+    create_index('ix_brand_profiles_created_at', 'brand_profiles', desc_id('created_at'))
+    create_index('ix_agency_profiles_total_campaigns_run', 'agency_profiles', desc_id('total_campaigns_run'))
+    create_index('ix_agency_profiles_created_at', 'agency_profiles', desc_id('created_at'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agency_profiles_created_at', table_name='agency_profiles')
+    op.drop_index('ix_agency_profiles_total_campaigns_run', table_name='agency_profiles')
+    op.drop_index('ix_brand_profiles_created_at', table_name='brand_profiles')
+    op.drop_index('ix_brand_profiles_total_campaigns', table_name='brand_profiles')
+    for name in (
+        'ix_creator_profiles_public_created_at', 'ix_creator_profiles_public_total_campaigns',
+        'ix_creator_profiles_public_engagement', 'ix_creator_profiles_public_xp_score',
+    ):
+        op.drop_index(name, table_name='creator_profiles')
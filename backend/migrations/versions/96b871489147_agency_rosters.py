@@ -0,0 +1,62 @@
+"""agency rosters
+
+Creator agency_id, the keyset indexes behind roster listings and the
+roster invite table.
+
+Revision ID: 96b871489147
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-19 09:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.helpers import create_index, has_column, has_table
+
+
+# revision identifiers, used by Alembic.
+revision = '96b871489147'
+down_revision = '3f2a9c1d7b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_column('creator_profiles', 'agency_id'):
+        op.add_column('creator_profiles', sa.Column(
+            'agency_id', postgresql.UUID(as_uuid=True), nullable=True, comment='Managing agency ID if applicable'
+        ))
+        op.create_foreign_key('creator_profiles_agency_id_fkey', 'creator_profiles', 'agency_profiles', ['agency_id'], ['id'])
+    create_index(
+        'ix_creator_profiles_agency_roster', 'creator_profiles', ['agency_id', 'display_name', 'id'],
+        postgresql_where=sa.text('agency_id IS NOT NULL')
+    )
+    create_index(
+        'ix_brand_profiles_agency_roster', 'brand_profiles', ['agency_id', 'brand_name', 'id'],
+        postgresql_where=sa.text('agency_id IS NOT NULL')
+    )
+    if not has_table('agency_roster_invites'):
+        op.create_table(
+            'agency_roster_invites',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('agency_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('kind', sa.String(length=16), nullable=False, comment='Roster kind: creators or brands'),
+            sa.Column('profile_id', postgresql.UUID(as_uuid=True), nullable=False, comment='Invited creator or brand profile ID'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.ForeignKeyConstraint(['agency_id'], ['agency_profiles.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+    create_index(
+        'ix_agency_roster_invites_agency_profile', 'agency_roster_invites',
+        ['agency_id', 'kind', 'profile_id'], unique=True
+    )
+    create_index('ix_agency_roster_invites_profile', 'agency_roster_invites', ['kind', 'profile_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('agency_roster_invites')
+    op.drop_index('ix_brand_profiles_agency_roster', table_name='brand_profiles')
+    op.drop_index('ix_creator_profiles_agency_roster', table_name='creator_profiles')
+    op.drop_constraint('creator_profiles_agency_id_fkey', 'creator_profiles', type_='foreignkey')
+    op.drop_column('creator_profiles', 'agency_id')
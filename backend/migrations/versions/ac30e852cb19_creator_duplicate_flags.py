@@ -0,0 +1,40 @@
+"""creator duplicate flags
+
+Pairs of creator profiles flagged as near-duplicates for review.
+
+Revision ID: ac30e852cb19
+Revises: 1674ae500421
+Create Date: 2026-10-19 09:11:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.helpers import create_index, has_table
+
+
+# revision identifiers, used by Alembic.
+revision = 'ac30e852cb19'
+down_revision = '1674ae500421'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table('creator_duplicate_flags'):
+        op.create_table(
+            'creator_duplicate_flags',
+            sa.Column('creator_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('duplicate_of_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('similarity', sa.Float(), nullable=False, comment='Estimated Jaccard similarity (0-1)'),
+            sa.Column('flagged_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.ForeignKeyConstraint(['creator_id'], ['creator_profiles.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['duplicate_of_id'], ['creator_profiles.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('creator_id', 'duplicate_of_id')
+        )
+    create_index('ix_creator_duplicate_flags_flagged_at', 'creator_duplicate_flags', [sa.text('flagged_at DESC')])
+
+
+def downgrade() -> None:
+    op.drop_table('creator_duplicate_flags')
@@ -0,0 +1,35 @@
+"""processed metric events
+
+Ids of applied metric events, so replayed batches are skipped.
+
+Revision ID: c3715fb603af
+Revises: 96b871489147
+Create Date: 2026-10-19 09:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index, has_table
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3715fb603af'
+down_revision = '96b871489147'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table('processed_metric_events'):
+        op.create_table(
+            'processed_metric_events',
+            sa.Column('event_id', sa.String(length=128), nullable=False, comment='Producer-assigned unique event id'),
+            sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.PrimaryKeyConstraint('event_id')
+        )
+    create_index('ix_processed_metric_events_processed_at', 'processed_metric_events', ['processed_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('processed_metric_events')
@@ -0,0 +1,29 @@
+"""discovery index change polling
+
+Expression index on coalesce(updated_at, created_at), which the in-memory
+discovery index polls for rows changed since its watermark.
+
+Revision ID: d0b0a85a6694
+Revises: 661a7be185bc
+Create Date: 2026-10-19 09:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0b0a85a6694'
+down_revision = '661a7be185bc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index('ix_creator_profiles_changed_at', 'creator_profiles', [sa.text('coalesce(updated_at, created_at)')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_creator_profiles_changed_at', table_name='creator_profiles')
@@ -0,0 +1,34 @@
+"""creator xp_dirty
+
+Dirty flag read by the XP recompute job in --dirty mode. Existing rows
+start dirty so the first run scores every creator.
+
+Revision ID: deba13d3dfd6
+Revises: c3715fb603af
+Create Date: 2026-10-19 09:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, create_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'deba13d3dfd6'
+down_revision = 'c3715fb603af'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    add_column('creator_profiles', sa.Column(
+        'xp_dirty', sa.Boolean(), server_default=sa.true(), nullable=False,
+        comment='xp_score is stale; recomputed by python -m app.crud.xp'
+    ))
+    create_index('ix_creator_profiles_xp_dirty', 'creator_profiles', ['id'], postgresql_where=sa.text('xp_dirty = true'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_creator_profiles_xp_dirty', table_name='creator_profiles')
+    op.drop_column('creator_profiles', 'xp_dirty')
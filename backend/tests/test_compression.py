@@ -0,0 +1,92 @@
+import asyncio
+import gzip
+import zlib
+from types import SimpleNamespace
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, compress, negotiate_encoding
+from app.utils.result_cache import _discovery_response
+
+BODY = b'{"items":[' + b",".join(b'{"handle":"creator_%d","bio":"food and travel"}' % i for i in range(200)) + b"]}"
+
+def _run(app, accept_encoding="gzip", minimum_size=1000) -> list:
+    """Drive CompressionMiddleware around app and collect the sent messages"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, receive, send))
+    return sent
+
+def _app(chunks, headers=((b"content-type", b"application/json"),)):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": list(headers)})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+def _headers(message) -> dict:
+    return {key.decode().lower(): value.decode() for key, value in message["headers"]}
+
+def test_negotiate_encoding():
+    """Highest q-value wins, q=0 refuses, unknown codings are ignored"""
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("compress, *;q=0.5") == compression.available_encodings()[0]
+    assert negotiate_encoding("GZIP;q=0.8") == "gzip"
+
+def test_large_bodies_are_compressed():
+    """Bodies over the threshold are encoded, with length, Vary and a weak ETag"""
+    start, body = _run(_app([BODY], [(b"content-type", b"application/json"), (b"etag", b'"abc"')]))
+    headers = _headers(start)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == 'W/"abc"'
+    assert int(headers["content-length"]) == len(body["body"]) < len(BODY)
+    assert gzip.decompress(body["body"]) == BODY
+
+def test_small_encoded_and_binary_bodies_pass_through():
+    """Small bodies, already encoded bodies and non-text media types are left alone"""
+    start, body = _run(_app([b'{"ok":true}']))
+    assert "content-encoding" not in _headers(start) and body["body"] == b'{"ok":true}'
+
+    encoded = compress(BODY, "gzip")
+    start, body = _run(_app([encoded], [(b"content-type", b"application/json"), (b"content-encoding", b"gzip")]))
+    assert body["body"] == encoded
+
+    start, body = _run(_app([BODY], [(b"content-type", b"image/png")]))
+    assert "content-encoding" not in _headers(start) and body["body"] == BODY
+
+    start, body = _run(_app([BODY]), accept_encoding="identity")
+    assert body["body"] == BODY
+
+def test_streaming_chunks_decode_as_they_arrive():
+    """Every streamed chunk is flushed, so the client can decode it immediately"""
+    chunks = [b"first chunk ", b"second chunk ", b"last"]
+    messages = _run(_app(chunks), minimum_size=10_000)
+    assert "content-length" not in _headers(messages[0])
+    decoder = zlib.decompressobj(31)
+    for chunk, message in zip(chunks, messages[1:]):
+        assert decoder.decompress(message["body"]) == chunk
+    assert messages[-1]["more_body"] is False
+
+def test_cached_discovery_bodies_are_compressed_once(monkeypatch):
+    """A cache entry keeps its compressed body, so later hits reuse it"""
+    calls = []
+    monkeypatch.setattr("app.utils.result_cache.compress", lambda body, encoding: calls.append(encoding) or compress(body, encoding))
+    request = SimpleNamespace(headers={"accept-encoding": "gzip"})
+    encoded = {}
+    for _ in range(3):
+        response = _discovery_response(request, BODY, '"abc"', "HIT", encoded)
+    assert calls == ["gzip"]
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert gzip.decompress(response.body) == BODY
+
+    revalidate = SimpleNamespace(headers={"accept-encoding": "gzip", "if-none-match": 'W/"abc"'})
+    assert _discovery_response(revalidate, BODY, '"abc"', "HIT", encoded).status_code == 304
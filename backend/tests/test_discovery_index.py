@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.utils.discovery_index import CreatorDiscoveryIndex
+from app.db.models.creator import ContentTypeEnum, CreatorTypeEnum
+
+def _row(**overrides):
+    """Build a creator row with the columns the discovery index reads"""
+    row = dict(
+        id=uuid.uuid4(),
+        is_public=True,
+        is_verified=False,
+        content_type=ContentTypeEnum.POSTS,
+        creator_type=CreatorTypeEnum.MICRO,
+        location="Mumbai, India",
+        latitude=None,
+        longitude=None,
+        language="English",
+        tags=["fashion"],
+        platforms=[{"platform": "instagram", "followers": 50000}],
+        pricing_info=None,
+        xp_score=10.0,
+        avg_engagement_rate=None,
+        total_campaigns=0,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=None,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def test_search_ranks_by_sort_key_then_id():
+    """Pages are ordered by sort key DESC NULLS LAST, then id"""
+    index = CreatorDiscoveryIndex(capacity=2)
+    low = _row(xp_score=5.0)
+    high = _row(xp_score=50.0)
+    tied = sorted([_row(xp_score=20.0), _row(xp_score=20.0)], key=lambda row: row.id.int)
+    index.apply_rows([low, tied[1], high, tied[0]])
+
+    assert index.search(sort_by="xp_score") == [high.id, tied[0].id, tied[1].id, low.id]
+    assert index.search(sort_by="xp_score", skip=1, limit=2) == [tied[0].id, tied[1].id]
+
+    engaged = _row(avg_engagement_rate=0.05)
+    index.apply_rows([engaged])
+    assert index.search(sort_by="avg_engagement_rate", limit=1) == [engaged.id]
+
+def test_search_filters():
+    """Filters match the SQL discovery semantics"""
+    index = CreatorDiscoveryIndex()
+    reel = _row(content_type=ContentTypeEnum.REELS, tags=["fashion", "travel"], is_verified=True)
+    nano = _row(creator_type=CreatorTypeEnum.NANO, location="Pune", language="Hindi", xp_score=1.0)
+    index.apply_rows([reel, nano])
+
+    assert index.search({"content_type": [ContentTypeEnum.REELS]}) == [reel.id]
+    assert set(index.search({"content_type": ["Reels", "Posts"]})) == {reel.id, nano.id}
+    assert index.search({"creator_type": [CreatorTypeEnum.NANO]}) == [nano.id]
+    assert index.search({"tags": ["fashion", "travel"]}) == [reel.id]
+    assert index.search({"tags": ["unknown"]}) == []
+    assert index.search({"location": "pun"}) == [nano.id]
+    assert index.search({"language": ["Hindi"]}) == [nano.id]
+    assert index.search({"is_verified": True}) == [reel.id]
+    assert index.search({"min_xp": 5.0}) == [reel.id]
+
+def test_search_near_uses_coordinates():
+    """near keeps rows within the radius; rows without coordinates never match"""
+    index = CreatorDiscoveryIndex()
+    pune = _row(location="Poona", latitude=18.5204, longitude=73.8567)
+    mumbai = _row(location="Bombay", latitude=19.076, longitude=72.8777)
+    unknown = _row(location="Somewhere")
+    index.apply_rows([pune, mumbai, unknown])
+
+    assert index.search({"near": (18.5204, 73.8567, 50)}) == [pune.id]
+    assert set(index.search({"near": (18.5204, 73.8567, 150)})) == {pune.id, mumbai.id}
+    assert index.stats({"near": (18.5204, 73.8567, 150)})["total"] == 2
+
+def test_updates_replace_rows_and_hide_private_profiles():
+    """Re-applied rows overwrite their columns; private rows drop out"""
+    index = CreatorDiscoveryIndex()
+    row = _row()
+    index.apply_rows([row])
+    assert len(index) == 1
+
+    row.tags = ["food"]
+    index.apply_rows([row])
+    assert index.search({"tags": ["fashion"]}) == []
+    assert index.search({"tags": ["food"]}) == [row.id]
+
+    row.is_public = False
+    index.apply_rows([row])
+    assert index.search() == []
+    assert len(index) == 0
+
+def test_tag_bitset_grows_past_64_tags():
+    """Tag bitsets widen when more than 64 distinct tags are seen"""
+    index = CreatorDiscoveryIndex()
+    rows = [_row(tags=[f"tag{i}"]) for i in range(100)]
+    index.apply_rows(rows)
+    assert index.search({"tags": ["tag99"]}) == [rows[99].id]
+    assert index.search({"tags": ["tag0"]}) == [rows[0].id]
+
+def test_stats_counts_totals_and_facets():
+    """Totals and facet counts cover exactly the filtered public rows"""
+    index = CreatorDiscoveryIndex()
+    index.apply_rows([
+        _row(content_type=ContentTypeEnum.REELS, tags=["fashion", "travel"]),
+        _row(tags=["fashion"], location="Pune"),
+        _row(tags=["food"], creator_type=CreatorTypeEnum.NANO),
+        _row(is_public=False, tags=["fashion"]),
+    ])
+
+    stats = index.stats()
+    assert stats["total"] == 3
+    assert stats["facets"]["tag"] == [
+        {"value": "fashion", "count": 2},
+        {"value": "food", "count": 1},
+        {"value": "travel", "count": 1},
+    ]
+    assert stats["facets"]["creator_type"] == [{"value": "Micro", "count": 2}, {"value": "Nano", "count": 1}]
+
+    stats = index.stats({"tags": ["fashion"]}, facet_limit=1)
+    assert stats["total"] == 2
+    assert stats["facets"]["content_type"] == [{"value": "Posts", "count": 1}]
+    assert stats["facets"]["location"] == [{"value": "Mumbai, India", "count": 1}]
+
+def test_match_ranks_creators_against_brand_preferences():
+    """Matching scores public creators on preferences and budget"""
+    index = CreatorDiscoveryIndex()
+    fit = _row(tags=["Fashion"], content_type=ContentTypeEnum.REELS, pricing_info=[{"price": 300}])
+    pricey = _row(tags=["fashion"], pricing_info=[{"price": 5000}])
+    other = _row(tags=["food"], creator_type=CreatorTypeEnum.MACRO)
+    hidden = _row(tags=["fashion"], is_public=False)
+    index.apply_rows([other, hidden, pricey, fit])
+
+    preferences = {"niches": ["fashion"], "creator_tiers": ["micro"], "content_types": ["reels"]}
+    matches = index.match(preferences, {"min": 100, "max": 1000}, limit=5)
+    assert [creator_id for creator_id, _, _ in matches] == [fit.id, pricey.id, other.id]
+    assert matches[0][2]["niche"] == 1.0
+    assert matches[1][2]["price"] == 0.2
+    assert index.match(preferences, None, limit=1)[0][0] == fit.id
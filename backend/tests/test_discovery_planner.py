@@ -0,0 +1,189 @@
+import pytest
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from app.crud.creator import (
+    plan_creator_query,
+    build_public_creator_query,
+    build_creator_facet_query,
+    Explain,
+    _creator_facet_keys,
+    _top_facet_counts
+)
+from app.db.models.creator import CreatorProfile, ContentTypeEnum, CreatorTypeEnum
+
+def _compile(query) -> str:
+    """Render a discovery query as PostgreSQL SQL"""
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+def test_plan_without_filters_uses_sort_index():
+    """Unfiltered discovery walks the partial sort index"""
+    plan = plan_creator_query({}, "xp_score")
+    assert plan["index"] == "ix_creator_profiles_public_xp_score"
+    assert plan["strategy"] == "index_scan"
+    assert plan["predicates"] == []
+
+    plan = plan_creator_query({}, "created_at")
+    assert plan["index"] == "ix_creator_profiles_public_created_at"
+
+def test_plan_orders_predicates_by_selectivity():
+    """Most selective predicates come first, location ilike last"""
+    plan = plan_creator_query({
+        "location": "Mumbai",
+        "min_xp": 100.0,
+        "content_type": [ContentTypeEnum.REELS],
+        "is_verified": True,
+    })
+    assert plan["predicates"] == ["is_verified", "content_type", "location", "min_xp"]
+    assert plan["index"] == "ix_creator_profiles_public_verified_xp"
+
+def test_plan_single_value_uses_composite_index():
+    """A single content type drives an ordered composite index scan"""
+    plan = plan_creator_query({"content_type": [ContentTypeEnum.REELS]})
+    assert plan["index"] == "ix_creator_profiles_public_content_type_xp"
+    assert plan["strategy"] == "index_scan"
+    assert plan["driving_filter"] == "content_type"
+
+def test_plan_in_list_uses_merge():
+    """Multi-select on a composite index column merges per-value scans"""
+    plan = plan_creator_query({"creator_type": [CreatorTypeEnum.NANO, CreatorTypeEnum.MICRO]})
+    assert plan["index"] == "ix_creator_profiles_public_creator_type_xp"
+    assert plan["strategy"] == "merge"
+
+def test_plan_composite_index_requires_xp_sort():
+    """Composite indexes are ordered by xp_score and not used for other sorts"""
+    plan = plan_creator_query({"language": ["Hindi"]}, "avg_engagement_rate")
+    assert plan["index"] == "ix_creator_profiles_public_engagement"
+    assert plan["driving_filter"] is None
+
+def test_plan_selective_tags_use_gin_index():
+    """Several tags are selective enough to drive a bitmap scan"""
+    plan = plan_creator_query({
+        "tags": ["fashion", "travel"],
+        "content_type": [ContentTypeEnum.POSTS],
+    })
+    assert plan["index"] == "ix_creator_profiles_public_tags"
+    assert plan["strategy"] == "bitmap"
+
+    plan = plan_creator_query({"tags": ["fashion"], "content_type": [ContentTypeEnum.POSTS]})
+    assert plan["strategy"] == "index_scan"
+
+def test_plan_small_radius_uses_geohash_index():
+    """A small near= radius drives a geohash range scan; a wide one does not"""
+    plan = plan_creator_query({"near": (18.52, 73.86, 10.0), "content_type": [ContentTypeEnum.POSTS]})
+    assert plan["index"] == "ix_creator_profiles_public_geohash"
+    assert plan["strategy"] == "bitmap"
+
+    plan = plan_creator_query({"near": (18.52, 73.86, 200.0)})
+    assert plan["strategy"] == "index_scan"
+
+    sql = _compile(build_public_creator_query(Session(), 0, 20, {"near": (18.52, 73.86, 10.0)}))
+    assert "creator_profiles.geohash LIKE" in sql
+    assert "asin" in sql
+
+def test_plan_unverified_filter_is_not_selective():
+    """is_verified=false does not pick the verified index"""
+    plan = plan_creator_query({"is_verified": False})
+    assert plan["index"] == "ix_creator_profiles_public_xp_score"
+
+def test_query_sql_matches_sort_index():
+    """ORDER BY matches the partial index definition"""
+    sql = _compile(build_public_creator_query(Session(), 0, 20, {}, "xp_score"))
+    assert "creator_profiles.is_public = true" in sql
+    assert "ORDER BY creator_profiles.xp_score DESC NULLS LAST, creator_profiles.id" in sql
+
+def test_query_selects_only_public_columns():
+    """Discovery loads the public schema's columns, not owner-only JSON"""
+    sql = _compile(build_public_creator_query(Session(), 0, 20, {}, "xp_score"))
+    select_list = sql.split(" FROM ")[0]
+    assert "creator_profiles.platforms" in select_list
+    assert "creator_profiles.is_public" in select_list
+    for column in ("pricing_info", "social_links", "portfolio_items", "total_earnings", "media_kit_url"):
+        assert f"creator_profiles.{column}" not in select_list
+
+def test_query_sql_uses_array_containment_for_tags():
+    """Tags filter uses @> so the GIN index applies"""
+    sql = _compile(build_public_creator_query(Session(), 0, 20, {"tags": ["fashion"]}))
+    assert "@>" in sql
+
+def test_query_sql_merge_branches():
+    """Merge plans emit one limited branch per IN-list value"""
+    query = build_public_creator_query(
+        Session(), 20, 20,
+        {"content_type": [ContentTypeEnum.REELS, ContentTypeEnum.POSTS]}
+    )
+    sql = _compile(query)
+    assert sql.count("UNION ALL") == 1
+
+def test_facet_query_groups_each_facet_over_matches():
+    """Facet counts are one statement over a CTE of the filtered matches"""
+    sql = str(build_creator_facet_query(Session(), {"tags": ["fashion"]}).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH matches AS")
+    assert sql.count("UNION ALL") == 3
+    assert "unnest(matches.tags)" in sql
+    assert "@>" in sql
+
+def test_explain_wraps_statement():
+    """Broad totals use the planner estimate from EXPLAIN"""
+    query = build_public_creator_query(Session(), 0, 20, {"is_verified": False})
+    sql = str(Explain(query.statement).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+def test_facet_keys_follow_visibility():
+    """Only public profiles contribute to the maintained facet counts"""
+    profile = CreatorProfile(
+        is_public=True,
+        content_type=ContentTypeEnum.REELS,
+        creator_type=None,
+        location="Pune",
+        tags=["food", "food", "travel"],
+    )
+    assert _creator_facet_keys(profile) == [
+        ("total", ""),
+        ("content_type", "Reels"),
+        ("location", "Pune"),
+        ("tag", "food"),
+        ("tag", "travel"),
+    ]
+    profile.is_public = False
+    assert _creator_facet_keys(profile) == []
+
+def test_facet_counts_from_table_and_enum_columns():
+    """Table rows keep their API values; Enum column rows map names to values"""
+    profile = CreatorProfile(is_public=True, content_type=ContentTypeEnum.REELS, creator_type=CreatorTypeEnum.MACRO, tags=["food"])
+    table_rows = [(facet, value, 1) for facet, value in _creator_facet_keys(profile)]
+    facets = _top_facet_counts(table_rows, 5)
+    assert facets["content_type"] == [{"value": "Reels", "count": 1}]
+    assert facets["creator_type"] == [{"value": CreatorTypeEnum.MACRO.value, "count": 1}]
+    assert facets["tag"] == [{"value": "food", "count": 1}]
+
+    enum_rows = [("content_type", "REELS", 3), ("creator_type", "MACRO", 2)]
+    facets = _top_facet_counts(enum_rows, 5, enum_names=True)
+    assert facets["content_type"] == [{"value": "Reels", "count": 3}]
+    assert facets["creator_type"] == [{"value": CreatorTypeEnum.MACRO.value, "count": 2}]
+
+def test_xp_score_sql_scores_the_incremented_values():
+    """The metrics UPDATE scores old value + delta, not the stale column"""
+    from sqlalchemy import update
+    from app.crud.creator import xp_score_sql
+
+    total_campaigns = func.coalesce(CreatorProfile.total_campaigns, 0) + 1
+    statement = update(CreatorProfile).values(
+        total_campaigns=total_campaigns,
+        xp_score=xp_score_sql(total_campaigns=total_campaigns)
+    ).returning(CreatorProfile.xp_score)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "RETURNING creator_profiles.xp_score" in sql
+    assert "(coalesce(coalesce(creator_profiles.total_campaigns" in sql
+    assert "least(" in sql and "cardinality(creator_profiles.tags)" in sql
+
+def test_metrics_update_returns_previous_xp_score():
+    """The single-creator metrics UPDATE locks the row and returns its old XP alongside the new row"""
+    from app.crud.creator import build_creator_metrics_update
+
+    sql = str(build_creator_metrics_update("00000000-0000-0000-0000-000000000001", 1).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH previous AS")
+    assert "FOR UPDATE" in sql
+    assert "WHERE creator_profiles.id = previous.id" in sql
+    assert sql.endswith("previous.xp_score AS xp_score_1")
+
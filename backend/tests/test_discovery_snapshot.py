@@ -0,0 +1,123 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.utils.discovery_index import CreatorDiscoveryIndex
+from app.utils.discovery_snapshot import (
+    DiscoverySnapshot,
+    SnapshotCreatorIndex,
+    SnapshotHandle,
+    write_snapshot,
+    search_brand_snapshot,
+    snapshot_builder_pass,
+    _profile_section,
+    BRAND_TYPE_CODES
+)
+from app.db.models.brand import BrandTypeEnum
+from app.db.models.creator import ContentTypeEnum, CreatorTypeEnum
+
+def _creator(**overrides):
+    row = dict(
+        id=uuid.uuid4(), is_public=True, is_verified=False,
+        content_type=ContentTypeEnum.POSTS, creator_type=CreatorTypeEnum.MICRO,
+        location="Pune", latitude=None, longitude=None, language="English", tags=["fashion"],
+        platforms=[{"platform": "instagram", "followers": 1000}], pricing_info=None,
+        xp_score=1.0, avg_engagement_rate=None, total_campaigns=0,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def _brand(**overrides):
+    row = dict(
+        id=uuid.uuid4(), industry="Fashion", location="Mumbai", latitude=19.076, longitude=72.8777,
+        brand_type=BrandTypeEnum.D2C,
+        is_verified=False, total_campaigns=0, created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def _brand_section(rows):
+    return _profile_section(rows, "brand_type", BRAND_TYPE_CODES, {
+        "total_campaigns": "total_campaigns",
+        "created_at": "created_at",
+    })
+
+def test_snapshot_creator_index_matches_in_memory_index(tmp_path):
+    """A snapshot-backed index answers the same queries as the index it was built from"""
+    index = CreatorDiscoveryIndex()
+    rows = [
+        _creator(xp_score=float(i), tags=[f"tag{i % 70}", "common"], location=f"City {i % 3}")
+        for i in range(200)
+    ]
+    rows[5].is_public = False
+    index.apply_rows(rows)
+
+    path = str(tmp_path / "discovery.snap")
+    write_snapshot(path, {"creator": index.export(), "brand": _brand_section([])})
+    snapshot_index = SnapshotCreatorIndex(DiscoverySnapshot(path))
+
+    for filters in [{}, {"tags": ["tag69"]}, {"tags": ["common", "tag3"]}, {"location": "city 1"}, {"tags": ["nope"]}]:
+        for sort_by in ["xp_score", "created_at"]:
+            assert snapshot_index.search(filters, sort_by, 0, 50) == index.search(filters, sort_by, 0, 50)
+    assert len(snapshot_index) == 199
+    for filters in [{}, {"tags": ["common"]}, {"location": "city 2"}]:
+        assert snapshot_index.stats(filters) == index.stats(filters)
+    preferences = {"niches": ["tag3", "common"], "platforms": ["instagram"]}
+    assert snapshot_index.match(preferences, {"max": 10}, 10) == index.match(preferences, {"max": 10}, 10)
+
+def test_brand_snapshot_search(tmp_path):
+    """Brand sections filter by substring and type and sort like SQL discovery"""
+    busy = _brand(total_campaigns=10)
+    startup = _brand(
+        brand_type=BrandTypeEnum.STARTUP, industry="Tech", location="Bengaluru", latitude=12.9716, longitude=77.5946
+    )
+    path = str(tmp_path / "discovery.snap")
+    write_snapshot(path, {"brand": _brand_section([busy, startup])})
+    snapshot = DiscoverySnapshot(path)
+
+    assert search_brand_snapshot(snapshot, sort_by="total_campaigns") == [busy.id, startup.id]
+    assert search_brand_snapshot(snapshot, industry="tech") == [startup.id]
+    assert search_brand_snapshot(snapshot, brand_type="Startup") == [startup.id]
+    assert search_brand_snapshot(snapshot, brand_type="Unknown") == []
+    assert search_brand_snapshot(snapshot, near=(18.5204, 73.8567, 150)) == [busy.id]
+
+def test_snapshot_handle_swaps_on_rebuild(tmp_path):
+    """Workers pick up a rebuilt snapshot by remapping the swapped file"""
+    path = str(tmp_path / "discovery.snap")
+    handle = SnapshotHandle(path, check_seconds=0)
+    assert handle.get() is None
+
+    first = _brand()
+    write_snapshot(path, {"brand": _brand_section([first])})
+    assert search_brand_snapshot(handle.get()) == [first.id]
+
+    second = _brand(total_campaigns=5)
+    write_snapshot(path, {"brand": _brand_section([first, second])})
+    assert search_brand_snapshot(handle.get(), sort_by="total_campaigns") == [second.id, first.id]
+
+def test_builder_skips_rebuild_until_watermark_advances(tmp_path, monkeypatch):
+    """Rows re-read inside the refresh overlap do not rewrite an unchanged snapshot"""
+    from app.utils import discovery_snapshot
+
+    path = str(tmp_path / "discovery.snap")
+    changed = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    rows = [_creator(updated_at=changed)]
+    builds = []
+    index = CreatorDiscoveryIndex()
+    monkeypatch.setattr(index, "refresh", lambda db: index.apply_rows(rows))
+    monkeypatch.setattr(discovery_snapshot, "_profiles_fingerprint", lambda db, model: (0, None))
+    monkeypatch.setattr(
+        discovery_snapshot, "build_discovery_snapshot",
+        lambda db, path, creator_index: builds.append(creator_index.watermark) or write_snapshot(path, {"creator": creator_index.export()})
+    )
+
+    fingerprints = snapshot_builder_pass(None, path, index)
+    mtime = (tmp_path / "discovery.snap").stat().st_mtime_ns
+    fingerprints = snapshot_builder_pass(None, path, index, fingerprints)
+    assert builds == [changed]
+    assert (tmp_path / "discovery.snap").stat().st_mtime_ns == mtime
+
+    rows[0].updated_at = datetime(2024, 1, 3, tzinfo=timezone.utc)
+    snapshot_builder_pass(None, path, index, fingerprints)
+    assert builds == [changed, rows[0].updated_at]
+
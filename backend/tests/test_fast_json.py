@@ -0,0 +1,37 @@
+import json
+import uuid
+import orjson
+from app.db.models.brand import BrandProfile
+from app.db.models.creator import CreatorProfile, ContentTypeEnum
+from app.schemas.brand.profile import BrandProfilePublic
+from app.schemas.creator.profile import CreatorProfilePublic
+from app.utils.fast_json import _legacy_render, encode_items, render_json, synthetic_creators, trusted_encoder
+
+def test_trusted_encoder_matches_validated_output():
+    """Projected rows render the same JSON as validating through the schema"""
+    rows = synthetic_creators(20)
+    sparse = CreatorProfile(
+        id=uuid.uuid4(), display_name="Sparse", handle="sparse", content_type=ContentTypeEnum.POSTS,
+        platforms=[{"platform": "instagram", "followers": 1200.0, "engagement_rate": 0, "handle": "extra"}],
+        total_campaigns=0, xp_score=12, is_verified=False,
+    )
+    rows.append(sparse)
+    assert json.loads(render_json(encode_items(CreatorProfilePublic, rows))) == \
+        json.loads(_legacy_render(CreatorProfilePublic, rows))
+    platform = encode_items(CreatorProfilePublic, [sparse])[0]["platforms"][0]
+    assert platform == {"platform": "instagram", "followers": 1200, "engagement_rate": 0.0}
+
+def test_fields_needing_validation_use_type_adapter():
+    """Schemas with fields like HttpUrl fall back to the prebuilt TypeAdapter"""
+    assert trusted_encoder(BrandProfilePublic) is None
+    brand = BrandProfile(
+        id=uuid.uuid4(), brand_name="Acme", website_url="https://acme.example.com",
+        total_campaigns=3, is_verified=True,
+    )
+    assert encode_items(BrandProfilePublic, [brand]) == json.loads(_legacy_render(BrandProfilePublic, [brand]))
+
+def test_render_json_payloads():
+    """Wrapped pages with totals and facets render with orjson"""
+    items = encode_items(CreatorProfilePublic, synthetic_creators(2))
+    body = render_json({"items": items, "total": 2, "facets": {"tag": {"food": 2}}})
+    assert orjson.loads(body)["items"] == json.loads(json.dumps(items, default=str))
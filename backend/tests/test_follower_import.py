@@ -0,0 +1,73 @@
+import io
+from app.crud.follower_import import (
+    SnapshotRow,
+    batch_by_handle,
+    benchmark_parse,
+    classify_creator_type,
+    merge_platforms,
+    parse_snapshot_records,
+    read_snapshot_records,
+    weighted_engagement_rate
+)
+from app.db.models.creator import CreatorTypeEnum
+
+def _parse(text, fmt):
+    stats = {"rows": 0, "invalid": 0}
+    return list(parse_snapshot_records(read_snapshot_records(io.StringIO(text), fmt), stats)), stats
+
+def test_parse_csv_and_ndjson_rows():
+    """Handles lose their @, platforms are lower-cased, percentages become fractions"""
+    rows, stats = _parse(
+        "handle,platform,followers,engagement\n"
+        "@ana,Instagram,20000,2.5%\n"
+        "ben,youtube,1500.0,0.04\n"
+        "cat,x,-5,\n"
+        "dan,x,many,\n"
+        "eve,x,10,140%\n",
+        "csv"
+    )
+    assert rows == [SnapshotRow("ana", "instagram", 20000, 0.025), SnapshotRow("ben", "youtube", 1500, 0.04)]
+    assert stats == {"rows": 5, "invalid": 3}
+
+    rows, stats = _parse('{"handle": "ana", "platform": "tiktok", "followers": 7}\nnot json\n\n', "ndjson")
+    assert rows == [SnapshotRow("ana", "tiktok", 7, None)]
+    assert stats == {"rows": 2, "invalid": 1}
+
+def test_batches_group_rows_by_handle():
+    """A batch holds whole handles; later rows for a platform win"""
+    rows = [
+        SnapshotRow("ana", "instagram", 1, None),
+        SnapshotRow("ben", "x", 2, None),
+        SnapshotRow("ana", "instagram", 3, None),
+        SnapshotRow("cat", "x", 4, None),
+    ]
+    batches = list(batch_by_handle(rows, 2))
+    assert [sorted(batch) for batch in batches] == [["ana", "ben"], ["cat"]]
+    assert batches[0]["ana"]["instagram"].followers == 3
+
+def test_merge_derives_engagement_and_tier():
+    """Snapshot platforms update in place or append; engagement is follower-weighted"""
+    platforms = merge_platforms(
+        [{"platform": "Instagram", "followers": 10, "engagement_rate": 0.5, "url": "https://instagram.com/ana"}],
+        {
+            "instagram": SnapshotRow("ana", "instagram", 90000, 0.02),
+            "youtube": SnapshotRow("ana", "youtube", 30000, 0.06),
+        }
+    )
+    assert platforms[0] == {
+        "platform": "Instagram", "followers": 90000, "engagement_rate": 0.02, "url": "https://instagram.com/ana"
+    }
+    assert platforms[1] == {"platform": "youtube", "followers": 30000, "engagement_rate": 0.06}
+    assert weighted_engagement_rate(platforms) == 0.03
+    assert weighted_engagement_rate([{"platform": "x", "followers": 5}]) is None
+
+    assert classify_creator_type(120000) == CreatorTypeEnum.MACRO
+    assert classify_creator_type(9999) == CreatorTypeEnum.NANO
+    assert classify_creator_type(1_000_000) == CreatorTypeEnum.CELEBRITY
+    assert classify_creator_type(0) is None
+
+def test_benchmark_parse_reports_throughput():
+    """The synthetic benchmark runs the whole parse pipeline"""
+    stats = benchmark_parse(3000, "ndjson", batch_handles=100)
+    assert stats["rows"] == 3000 and stats["invalid"] == 0
+    assert stats["batches"] >= 10 and stats["rows_per_second"] > 0
@@ -0,0 +1,66 @@
+import random
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from app.utils.geo import (
+    geocode,
+    geocode_profile,
+    geohash_encode,
+    geohash_cover,
+    haversine_km,
+    parse_near
+)
+
+def test_geocode_normalizes_aliases():
+    """Spellings, aliases and 'City, Country' input resolve to the same place"""
+    bengaluru = geocode("Bengaluru")
+    assert bengaluru is not None
+    assert geocode("Bangalore, IN") == bengaluru
+    assert geocode("BLR") == bengaluru
+    assert geocode("bangalore , india") == bengaluru
+    assert geocode("Atlantis") is None
+    assert geocode("") is None
+
+def test_geocode_accepts_coordinates():
+    """'lat,lon' input is used as is; out-of-range pairs are rejected"""
+    place = geocode("18.52, 73.85")
+    assert (place.latitude, place.longitude) == (18.52, 73.85)
+    assert geocode("123,45") is None
+
+def test_geohash_encode_known_value():
+    """Matches the reference geohash encoding"""
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_encode(42.6, -5.6, 5) == "ezs42"
+
+def test_geohash_cover_contains_every_point_in_radius():
+    """Every point within the radius falls under one of the cover prefixes"""
+    rng = random.Random(7)
+    for _ in range(200):
+        latitude, longitude = rng.uniform(-60, 60), rng.uniform(-179, 179)
+        radius_km = rng.choice([1, 10, 50, 300])
+        cover = geohash_cover(latitude, longitude, radius_km)
+        for _ in range(20):
+            point_lat = latitude + rng.uniform(-1, 1) * radius_km / 111.0
+            point_lon = longitude + rng.uniform(-1, 1) * radius_km / 50.0
+            if haversine_km(latitude, longitude, point_lat, point_lon) <= radius_km:
+                point_hash = geohash_encode(point_lat, point_lon)
+                assert any(point_hash.startswith(cell) for cell in cover)
+
+def test_haversine_distance():
+    """Pune to Mumbai is about 120 km"""
+    assert 115 < haversine_km(18.5204, 73.8567, 19.076, 72.8777) < 125
+
+def test_geocode_profile_and_parse_near():
+    """Profiles get coordinates from their location; unknown near= is a 400"""
+    profile = SimpleNamespace(location="Poona")
+    geocode_profile(profile)
+    assert profile.geohash.startswith("tek")
+    profile.location = "Nowhere"
+    geocode_profile(profile)
+    assert profile.latitude is None and profile.geohash is None
+
+    assert parse_near("Pune", 25)[2] == 25
+    assert parse_near(None, 25) is None
+    with pytest.raises(HTTPException) as error:
+        parse_near("Atlantis", 25)
+    assert error.value.status_code == 400
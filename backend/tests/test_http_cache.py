@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.utils.http_cache import profile_etag, etag_matches
+
+def _request(if_none_match=None):
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return SimpleNamespace(headers=headers)
+
+def test_profile_etag_changes_with_version_and_representation():
+    """ETags differ per update time and per representation"""
+    profile_id = uuid.uuid4()
+    first = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    second = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    etag = profile_etag("creator-public", profile_id, first)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == profile_etag("creator-public", profile_id, first)
+    assert etag != profile_etag("creator-public", profile_id, second)
+    assert etag != profile_etag("creator-me", profile_id, first)
+
+def test_etag_matches_if_none_match():
+    """If-None-Match uses weak comparison and accepts lists and *"""
+    etag = '"abc"'
+    assert not etag_matches(_request(), etag)
+    assert etag_matches(_request('"abc"'), etag)
+    assert etag_matches(_request('W/"abc"'), etag)
+    assert etag_matches(_request('"xyz", "abc"'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"xyz"'), etag)
@@ -0,0 +1,97 @@
+import random
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from app.db.models.creator import ContentTypeEnum, CreatorTypeEnum
+from app.utils import leaderboard
+from app.utils.leaderboard import CreatorLeaderboards, RankedList
+from app.utils.tags import normalize_tags
+
+def _creator(xp_score, content_type=ContentTypeEnum.REELS, creator_type=None, tags=(), is_public=True, **overrides):
+    row = dict(
+        id=uuid.uuid4(), is_public=is_public, content_type=content_type, creator_type=creator_type,
+        tags=list(tags), xp_score=xp_score,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def test_ranked_list_matches_a_sorted_list(monkeypatch):
+    """Positions, slices and removals agree with a plain sorted list across block splits"""
+    monkeypatch.setattr(leaderboard, "BLOCK_SIZE", 4)
+    rng = random.Random(7)
+    ranked, expected = RankedList(), []
+    for step in range(3000):
+        if expected and rng.random() < 0.4:
+            key = rng.choice(expected)
+            expected.remove(key)
+            ranked.remove(key)
+        else:
+            key = (rng.randint(0, 40), rng.randint(0, 500))
+            expected.append(key)
+            ranked.add(key)
+        if step % 50 == 0:
+            expected.sort()
+            assert ranked.keys() == expected and len(ranked) == len(expected)
+            for key in expected[::9]:
+                assert ranked.index(key) == expected.index(key)
+            for start in range(0, len(expected), 11):
+                assert ranked.slice(start, start + 6) == expected[start:start + 6]
+
+    with pytest.raises(KeyError):
+        ranked.remove((99, 99))
+
+def test_ranked_list_bulk_update_keeps_duplicates(monkeypatch):
+    """A bulk rebuild removes one occurrence per removed key"""
+    monkeypatch.setattr(leaderboard, "BULK_REBUILD_ENTRIES", 2)
+    ranked = RankedList([1, 1, 2, 3])
+    ranked.update([0, 5, 6], [1, 3])
+    assert ranked.keys() == [0, 1, 2, 5, 6]
+
+def test_leaderboards_rank_per_board():
+    """Creators are ranked by XP overall and on each of their boards"""
+    boards = CreatorLeaderboards()
+    top = _creator(900.0, tags=["fitness"], creator_type=CreatorTypeEnum.MICRO)
+    middle = _creator(500.0, content_type=ContentTypeEnum.POSTS, tags=["fitness", "food"])
+    low = _creator(100.0, tags=["food"])
+    boards.apply_rows([low, top, middle])
+
+    total, entries = boards.top(("overall", ""), limit=2)
+    assert total == 3
+    assert [(rank, ref) for rank, ref, _ in entries] == [(1, str(top.id)), (2, str(middle.id))]
+    assert boards.rank(("tag", "food"), low.id) == (2, 100.0)
+    assert boards.rank(("content_type", ContentTypeEnum.REELS.value), low.id) == (2, 100.0)
+    assert boards.rank(("creator_type", CreatorTypeEnum.MICRO.value), middle.id) is None
+    assert boards.top(("tag", "travel")) == (0, [])
+
+    _, entries = boards.top(("overall", ""), offset=2, limit=5)
+    assert entries == [(3, str(low.id), 100.0)]
+
+def test_leaderboards_follow_xp_changes_and_visibility():
+    """An XP change moves the creator; going private or changing tags drops them from boards"""
+    boards = CreatorLeaderboards()
+    first, second = _creator(300.0, tags=["food"]), _creator(200.0, tags=["food"])
+    boards.apply_rows([first, second])
+
+    second.xp_score = 400.0
+    boards.apply_rows([second])
+    assert boards.rank(("overall", ""), second.id) == (1, 400.0)
+    assert boards.rank(("tag", "food"), first.id) == (2, 300.0)
+
+    second.tags = ["travel"]
+    first.is_public = False
+    boards.apply_rows([first, second])
+    assert boards.rank(("overall", ""), first.id) is None
+    assert boards.top(("tag", "food")) == (0, [])
+    assert boards.rank(("tag", "travel"), second.id) == (1, 400.0)
+    assert len(boards) == 1
+
+def test_tag_boards_use_normalized_tags():
+    """Tags differing only in case or padding are stored, and ranked, as one tag"""
+    assert normalize_tags(["Food", " food ", "Travel", " "]) == ["food", "travel"]
+    assert normalize_tags(None) is None
+    row = _creator(100.0, tags=normalize_tags(["Food", " food ", "Travel"]))
+    assert leaderboard.creator_boards(row) == [
+        ("overall", ""), ("content_type", ContentTypeEnum.REELS.value), ("tag", "food"), ("tag", "travel"),
+    ]
@@ -0,0 +1,81 @@
+import uuid
+from types import SimpleNamespace
+import numpy as np
+from sqlalchemy.dialects import postgresql
+from app.crud import brand as brand_crud
+from app.crud.creator import _trim_brand_matches
+from app.utils.matching import TopKMatches, enum_preference_codes, min_price, price_fit, score_creators
+from app.utils.discovery_index import CREATOR_TYPE_CODES
+from app.db.models.creator import CreatorTypeEnum
+
+def test_price_fit():
+    """Offers within budget fit fully, pricier ones decay, unknown prices are neutral"""
+    fit = price_fit(np.array([100.0, 2000.0, np.nan]), 1000.0)
+    assert fit.tolist() == [1.0, 0.5, 0.5]
+    assert min_price([{"price": 500}, {"price": 200}, {"platform": "instagram"}]) == 200.0
+    assert np.isnan(min_price(None))
+
+def test_enum_preference_codes_are_case_insensitive():
+    """Brand preference strings map onto enum codes regardless of case"""
+    codes = enum_preference_codes(["nano", "MACRO", "unknown"], CREATOR_TYPE_CODES)
+    assert codes == [CREATOR_TYPE_CODES[CreatorTypeEnum.NANO], CREATOR_TYPE_CODES[CreatorTypeEnum.MACRO]]
+
+def test_score_renormalizes_over_given_preferences():
+    """Components without a brand preference do not dilute the score"""
+    components = score_creators(
+        niche_hits=np.array([2, 0]), niche_count=2,
+        tier_hit=None, content_hit=None, platform_hit=None,
+        prices=None, budget_max=None,
+        xp=np.array([1e9, -np.inf])
+    )
+    assert set(components) == {"niche", "xp", "score"}
+    assert components["score"][0] > 0.99
+    assert components["score"][1] == 0.0
+
+def test_top_k_merges_batches_and_breaks_ties_by_id():
+    """The heap keeps the best k across batches, lower id first on ties"""
+    top = TopKMatches(3)
+    top.push(np.array([0.5, 0.9, 0.5]), lambda i: [30, 10, 20][i], ["c", "a", "b"])
+    top.push(np.array([0.5, 0.1]), lambda i: [5, 40][i], ["e", "f"])
+    assert top.results() == [(0.9, "a"), (0.5, "e"), (0.5, "b")]
+
+def test_trim_keeps_top_n_per_brand():
+    """Overflowing lists are cut back to N in one DELETE, ranked like the list reads"""
+    sql = str(_trim_brand_matches({uuid.UUID(int=1)}).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM brand_creator_matches WHERE (brand_creator_matches.brand_id, brand_creator_matches.creator_id) IN")
+    assert "PARTITION BY brand_creator_matches.brand_id ORDER BY brand_creator_matches.score DESC, brand_creator_matches.creator_id" in sql
+    assert "rank >" in sql
+
+def test_brand_matches_build_once_per_brand(monkeypatch):
+    """Only a never-built list is built on read, and only by the reader that claims it"""
+    class Query:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: self
+        def all(self):
+            return []
+
+    class Session:
+        def query(self, *entities):
+            return Query()
+        def commit(self):
+            pass
+
+    rebuilt = []
+    monkeypatch.setattr(brand_crud, "rebuild_brand_matches", lambda db, brand_id, preferences, budget: rebuilt.append(brand_id))
+    preferences = {"content_types": ["Reels"]}
+
+    # Built before and empty: no rebuild
+    built = SimpleNamespace(id=uuid.uuid4(), matches_built_at="2026-10-19", campaign_preferences=preferences, budget_range=None)
+    assert brand_crud.get_brand_matches(Session(), built) == []
+    assert rebuilt == []
+
+    # Never built, claimed by another reader: empty until that build lands
+    monkeypatch.setattr(brand_crud, "_mark_matches_built", lambda db, brand_id, built=True, only_unbuilt=False: False)
+    cold = SimpleNamespace(id=uuid.uuid4(), matches_built_at=None, campaign_preferences=preferences, budget_range=None)
+    assert brand_crud.get_brand_matches(Session(), cold) == []
+    assert rebuilt == []
+
+    # Never built and claimed here: built once
+    monkeypatch.setattr(brand_crud, "_mark_matches_built", lambda db, brand_id, built=True, only_unbuilt=False: True)
+    brand_crud.get_brand_matches(Session(), cold)
+    assert rebuilt == [cold.id]
@@ -0,0 +1,122 @@
+import threading
+import time
+import uuid
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.crud.metrics import aggregate_metric_events, build_metric_batch_update
+from app.schemas.shared.metrics import MetricEvent
+from app.utils.metric_ingest import MetricIngestWorker
+
+CREATOR = uuid.UUID(int=1)
+AGENCY = uuid.UUID(int=2)
+
+def _event(event_id, profile_type="creator", user_id=CREATOR, **deltas):
+    return MetricEvent(event_id=event_id, profile_type=profile_type, user_id=user_id, **deltas)
+
+def test_aggregate_sums_deltas_per_profile():
+    """Deltas add up per profile; the latest engagement rate wins"""
+    deltas = aggregate_metric_events([
+        _event("1", campaigns=1, earnings=100.0, engagement_rate=0.02),
+        _event("2", campaigns=2, earnings=50.0, engagement_rate=0.05),
+        _event("3", "agency", AGENCY, campaigns=1, spend=900.0),
+    ])
+    assert deltas["creator"][CREATOR] == {"campaigns": 3, "earnings": 150.0, "spend": 0.0, "engagement_rate": 0.05}
+    assert deltas["agency"][AGENCY]["spend"] == 900.0
+
+def test_batch_update_joins_a_values_list():
+    """One UPDATE ... FROM (VALUES ...) applies every profile and recomputes XP"""
+    profiles = aggregate_metric_events([_event("1", campaigns=1), _event("2", user_id=AGENCY, campaigns=1)])["creator"]
+    sql = str(build_metric_batch_update("creator", profiles).compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES" in sql and sql.count("::UUID") == 2
+    assert "WHERE creator_profiles.user_id = CAST(deltas.user_id AS UUID)" in sql
+    assert "xp_score=" in sql and "RETURNING" in sql
+
+def test_worker_batches_within_window_and_skips_queued_duplicates():
+    """Events arriving inside the window go out as one batch, repeats dropped"""
+    batches = []
+    done = threading.Event()
+    def apply(events):
+        batches.append([event.event_id for event in events])
+        done.set()
+        return {"applied": len(events), "already_processed": 0, "profiles_updated": 1}
+
+    worker = MetricIngestWorker(apply, window_seconds=0.1, max_batch=100, max_pending=100)
+    assert worker.submit([_event("a"), _event("b")]) == (2, 0)
+    assert worker.submit([_event("b"), _event("c"), _event("c")]) == (1, 2)
+    assert done.wait(2)
+    worker.stop(timeout=2)
+
+    assert batches == [["a", "b", "c"]]
+    stats = worker.stats()
+    assert stats["applied"] == 3 and stats["duplicates"] == 2 and stats["batches"] == 1
+    assert stats["pending"] == 0 and stats["events_per_second"] > 0
+
+def test_worker_flushes_full_batches_early():
+    """max_batch events are applied without waiting for the window"""
+    batches = []
+    worker = MetricIngestWorker(
+        lambda events: batches.append(len(events)) or {"applied": len(events)},
+        window_seconds=30, max_batch=2, max_pending=100
+    )
+    worker.submit([_event("a"), _event("b"), _event("c")])
+    deadline = time.monotonic() + 2
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches[0] == 2
+    worker.stop(timeout=2)
+    assert batches == [2, 1]
+
+def test_worker_retries_failed_batches_and_applies_backpressure():
+    """A failing batch stays buffered; a full buffer rejects new events"""
+    attempts = []
+    def apply(events):
+        attempts.append(len(events))
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+        return {"applied": len(events)}
+
+    worker = MetricIngestWorker(apply, window_seconds=60, max_batch=10, max_pending=2)
+    worker.submit([_event("a"), _event("b")])
+    with pytest.raises(BufferError):
+        worker.submit([_event("c")])
+
+    assert worker.flush() == 0
+    assert worker.stats()["failed_batches"] == 1 and worker.stats()["pending"] == 2
+    assert "database unavailable" in worker.stats()["last_error"]
+    assert worker.flush() == 2
+    assert attempts == [2, 2] and worker.stats()["applied"] == 2
+    worker.stop(timeout=2)
+
+def test_worker_isolates_events_that_keep_failing():
+    """After max_attempts the batch is applied event by event and the bad event dropped"""
+    batches = []
+    def apply(events):
+        batches.append([event.event_id for event in events])
+        if any(event.event_id == "bad" for event in events):
+            raise ValueError("invalid input syntax for type uuid")
+        return {"applied": len(events)}
+
+    worker = MetricIngestWorker(apply, window_seconds=60, max_batch=10, max_pending=10, max_attempts=2)
+    worker.submit([_event("a"), _event("bad"), _event("c")])
+
+    assert worker.flush() == 0
+    assert worker.stats()["pending"] == 3
+    assert worker.flush() == 2
+    assert batches == [["a", "bad", "c"]] * 2 + [["a"], ["bad"], ["c"]]
+    stats = worker.stats()
+    assert stats["pending"] == 0 and stats["applied"] == 2 and stats["dropped_events"] == 1
+    assert "bad" in stats["last_error"]
+    worker.stop(timeout=2)
+
+def test_worker_keeps_events_when_every_event_fails():
+    """If no event applies on its own the batch is kept, not dropped"""
+    def apply(events):
+        raise RuntimeError("database unavailable")
+
+    worker = MetricIngestWorker(apply, window_seconds=60, max_batch=10, max_pending=10, max_attempts=1)
+    worker.submit([_event("a"), _event("b")])
+
+    assert worker.flush() == 0
+    stats = worker.stats()
+    assert stats["pending"] == 2 and stats["dropped_events"] == 0
+    worker.stop(timeout=0.1)
@@ -0,0 +1,87 @@
+import time
+import uuid
+from types import SimpleNamespace
+import numpy as np
+from app.crud.duplicates import find_duplicate_pairs
+from app.utils.near_duplicates import (
+    NUM_PERMUTATIONS, NearDuplicateIndex, minhash_signatures, profile_shingles
+)
+
+BIO = (
+    "Food blogger sharing quick weeknight recipes, street food finds and honest "
+    "restaurant reviews from around Mumbai. DM for collaborations."
+)
+
+def _row(bio, handle, social_links=None, **overrides):
+    """Build a creator row with the columns the near-duplicate index reads"""
+    return SimpleNamespace(
+        id=overrides.get("id", uuid.uuid4()), bio=bio, handle=handle, social_links=social_links,
+        created_at=None, updated_at=None,
+    )
+
+def test_profile_shingles():
+    """Bio case, punctuation and link schemes do not change the shingles"""
+    a = profile_shingles("Quick RECIPES, daily!", "@chef_anna", {"instagram": "https://www.instagram.com/chef_anna/"})
+    b = profile_shingles("quick recipes daily", "chef_anna", {"ig": "instagram.com/chef_anna"})
+    assert np.array_equal(a, b)
+    assert len(profile_shingles(None, None, None)) == 0
+
+def test_signature_estimates_jaccard():
+    """Signature agreement tracks the true Jaccard similarity of the shingle sets"""
+    rng = np.random.default_rng(1)
+    base = rng.choice(1 << 32, 400, replace=False).astype(np.uint32)
+    other = np.concatenate([base[:300], rng.choice(1 << 32, 100, replace=False).astype(np.uint32)])
+    signatures = minhash_signatures([base, other, np.empty(0, dtype=np.uint32)])
+    assert signatures.shape == (3, NUM_PERMUTATIONS)
+    assert abs((signatures[0] == signatures[1]).mean() - 300 / 500) < 0.12
+    # Batching must not change a profile's signature
+    assert np.array_equal(minhash_signatures([other])[0], signatures[1])
+
+def test_finds_near_duplicates_only():
+    """A lightly edited copy is found; an unrelated profile and the profile itself are not"""
+    index = NearDuplicateIndex()
+    original = _row(BIO, "mumbai_food_diaries", {"instagram": "instagram.com/mumbai_food_diaries"})
+    other = _row("Competitive esports player streaming ranked matches every night.", "nightowl_gg")
+    index.apply_rows([original, other])
+
+    matches = index.find(BIO + " Subscribe!", "mumbai_food_diaries1", {"instagram": "instagram.com/mumbai_food_diaries"})
+    assert [profile_id for profile_id, _ in matches] == [original.id]
+    assert matches[0][1] >= 0.8
+    assert index.find(BIO, original.handle, original.social_links, exclude=original.id) == []
+    assert index.find("Travel vlogs from the Himalayas and beyond, every week.", "wanderlust", None) == []
+
+def test_short_and_updated_profiles():
+    """Profiles too short to judge are not indexed; rewrites move a profile's buckets"""
+    index = NearDuplicateIndex()
+    short = _row("hi", "ab")
+    original = _row(BIO, "mumbai_food_diaries")
+    index.apply_rows([short, original])
+    assert len(index) == 1
+    assert index.find("hi", "ab", None) == []
+
+    index.apply_rows([_row("Competitive esports player streaming ranked matches.", "nightowl_gg", id=original.id)])
+    assert len(index) == 1
+    assert index.find(BIO, "mumbai_food_diaries", None) == []
+
+def test_duplicate_pairs_flag_newer_profile():
+    """Each pair is flagged once, on the profile created later"""
+    index = NearDuplicateIndex()
+    original = _row(BIO, "mumbai_food_diaries")
+    copy = _row(BIO, "mumbai_food_diaries_")
+    index.apply_rows([original, copy, _row("Competitive esports player streaming ranked matches.", "nightowl_gg")])
+
+    pairs = find_duplicate_pairs(index, {original.id: 1.0, copy.id: 2.0})
+    assert [(creator_id, duplicate_of_id) for creator_id, duplicate_of_id, _ in pairs] == [(copy.id, original.id)]
+
+def test_lookup_is_sublinear():
+    """A lookup touches only the query's buckets, not every indexed profile"""
+    index = NearDuplicateIndex()
+    rng = np.random.default_rng(7)
+    words = [f"word{i}" for i in range(5000)]
+    rows = [_row(" ".join(rng.choice(words, 30)), f"creator_{i}") for i in range(5000)]
+    index.apply_rows(rows)
+
+    started = time.perf_counter()
+    for row in rows[:200]:
+        assert index.find(row.bio, row.handle, None)[0][0] == row.id
+    assert (time.perf_counter() - started) / 200 < 0.005
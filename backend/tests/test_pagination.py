@@ -0,0 +1,15 @@
+import uuid
+import pytest
+from app.utils.pagination import encode_cursor, decode_cursor
+
+def test_cursor_round_trip():
+    """Cursors carry the last row's sort value and id"""
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor("Zoë Studio", row_id)) == ("Zoë Studio", row_id)
+    assert decode_cursor(None) is None
+
+def test_malformed_cursor_is_rejected():
+    """Tampered or truncated cursors raise ValueError"""
+    for cursor in ["not-a-cursor", encode_cursor("a", uuid.uuid4())[:-4], encode_cursor("a", uuid.uuid4())[::-1]]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -70,4 +70,94 @@ def test_discover_creators_with_filters():
         }
     )
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert isinstance(response.json(), list)
+
+def test_discover_creators_sorted():
+    """Test creator discovery with each supported sort order"""
+    for sort_by in ["xp_score", "avg_engagement_rate", "total_campaigns", "created_at"]:
+        response = client.get("/api/creator/profile/", params={"sort_by": sort_by})
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+def test_discover_creators_invalid_sort():
+    """Test that unknown sort orders are rejected"""
+    response = client.get("/api/creator/profile/", params={"sort_by": "handle"})
+    assert response.status_code == 422
+
+def test_discover_creators_cache_headers():
+    """Discovery reports cache status and honours the bypass header"""
+    response = client.get("/api/creator/profile/", params={"limit": 5})
+    assert response.headers["X-Cache"] in ("HIT", "MISS")
+
+    response = client.get(
+        "/api/creator/profile/",
+        params={"limit": 5},
+        headers={"X-Discovery-Cache": "bypass"}
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "BYPASS"
+
+def test_metrics_reports_cache_hit_ratio():
+    """Metrics endpoint exposes discovery cache stats"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "hit_ratio" in response.json()["discovery_cache"]
+
+def test_discover_creators_include_total_and_facets():
+    """include=total,facets wraps the page with counts"""
+    response = client.get("/api/creator/profile/", params={"include": "total,facets", "limit": 5})
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data["items"], list)
+    assert data["total"] >= len(data["items"])
+    assert set(data["facets"]) == {"content_type", "creator_type", "location", "tag"}
+
+def test_discover_creators_invalid_include():
+    """Unknown include values are rejected"""
+    response = client.get("/api/creator/profile/", params={"include": "everything"})
+    assert response.status_code == 400
+
+def test_brand_matches_without_auth():
+    """Test that creator matching requires an authenticated brand"""
+    response = client.get("/api/brand/profile/me/matches")
+    assert response.status_code == 401
+
+def test_similar_creators_not_found():
+    """Test similar creators for an unknown profile"""
+    response = client.get("/api/creator/profile/00000000-0000-0000-0000-000000000000/similar")
+    assert response.status_code == 404
+
+def test_batch_profiles_unknown_ids():
+    """Test that batch fetch leaves out unknown IDs"""
+    for entity in ("creator", "brand", "agency"):
+        response = client.post(
+            f"/api/{entity}/profile/batch",
+            json={"ids": ["00000000-0000-0000-0000-000000000000"]}
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+def test_batch_profiles_validation():
+    """Test that batch fetch rejects empty and oversized ID lists"""
+    response = client.post("/api/creator/profile/batch", json={"ids": []})
+    assert response.status_code == 422
+    
+    ids = [f"00000000-0000-4000-8000-{i:012d}" for i in range(201)]
+    response = client.post("/api/creator/profile/batch", json={"ids": ids})
+    assert response.status_code == 422
+
+def test_agency_roster_without_auth():
+    """Test that roster endpoints require an authenticated agency"""
+    response = client.get("/api/agency/profile/me/roster/creators")
+    assert response.status_code == 401
+    
+    response = client.post("/api/agency/profile/me/roster/brands/00000000-0000-0000-0000-000000000000/invite")
+    assert response.status_code == 401
+
+def test_agency_invites_without_auth():
+    """Test that only the invited profile's owner can list or accept invites"""
+    response = client.get("/api/creator/profile/me/agency-invites")
+    assert response.status_code == 401
+    
+    response = client.post("/api/brand/profile/me/agency-invites/00000000-0000-0000-0000-000000000000/accept")
+    assert response.status_code == 401
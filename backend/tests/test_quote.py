@@ -0,0 +1,63 @@
+import uuid
+from types import SimpleNamespace
+from app.crud import quote
+from app.schemas.brand.quote import CampaignQuote, QuoteDeliverable
+from app.utils.currency import convert, load_default_rates
+
+RATES = {"USD": 1.0, "INR": 0.0125, "EUR": 1.1}
+
+class _Session:
+    """Returns fixed rows for the quote's single SELECT"""
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, statement):
+        self.queries += 1
+        return SimpleNamespace(all=lambda: self.rows)
+
+def _creator(pricing_info, **overrides):
+    row = dict(id=uuid.uuid4(), display_name="Ana", handle="ana", pricing_info=pricing_info)
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def test_convert_uses_usd_cross_rates():
+    """Conversions go through US dollars; unknown codes give None"""
+    assert convert(800.0, "INR", "USD", RATES) == 10.0
+    assert round(convert(11.0, "EUR", "inr", RATES), 6) == 968.0
+    assert convert(1.0, "XYZ", "USD", RATES) is None
+    assert load_default_rates()["USD"] == 1.0
+
+def test_quote_prices_line_items_and_flags_missing(monkeypatch):
+    """Cheapest matching offer per deliverable, converted; gaps are flagged"""
+    monkeypatch.setattr(quote.currency_rates, "get", lambda db: RATES)
+    priced = _creator([
+        {"platform": "Instagram", "content_type": "Reel", "price": 8000, "currency": "INR"},
+        {"platform": "instagram", "content_type": "reel", "price": 150, "currency": "USD"},
+        {"platform": "youtube", "content_type": "video", "price": 500, "currency": "EUR"},
+    ])
+    partial = _creator(
+        [{"platform": "instagram", "content_type": "reel", "price": 90, "currency": "XYZ"}],
+        display_name="Ben", handle="ben"
+    )
+    unknown = uuid.uuid4()
+    db = _Session([partial, priced])
+
+    result = quote.build_campaign_quote(db, [priced.id, partial.id, unknown, priced.id], [
+        QuoteDeliverable(platform="instagram", content_type="reel", quantity=2),
+        QuoteDeliverable(platform="YouTube", content_type="Video"),
+    ], "usd")
+    CampaignQuote.model_validate(result)
+
+    assert db.queries == 1
+    assert result["currency"] == "USD"
+    assert [creator["handle"] for creator in result["creators"]] == ["ana", "ben"]
+    ana, ben = result["creators"]
+    assert [(item["unit_price"], item["subtotal"]) for item in ana["line_items"]] == [(100.0, 200.0), (550.0, 550.0)]
+    assert ana["line_items"][0]["price_currency"] == "INR" and ana["subtotal"] == 750.0
+    assert ben["line_items"] == []
+    assert [missing["reason"] for missing in ben["missing"]] == ["unknown_currency", "no_price"]
+    assert result["total"] == 750.0
+    assert result["incomplete"] == [partial.id]
+    assert result["not_found"] == [unknown]
+    assert result["rates_used"] == {"EUR": 1.1, "INR": 0.0125}
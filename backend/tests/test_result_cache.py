@@ -0,0 +1,65 @@
+import time
+from app.utils.result_cache import DiscoveryResultCache, SharedGenerations
+from app.db.models.creator import ContentTypeEnum
+
+def test_cache_key_is_normalized():
+    """Equivalent filter sets share one cache entry"""
+    key = DiscoveryResultCache.key
+    assert key("creator", {"tags": ["b", "a"], "location": None}) == key("creator", {"tags": ["a", "b"]})
+    assert key("creator", {"content_type": [ContentTypeEnum.REELS]}) == key("creator", {"content_type": ["Reels"]})
+    assert key("creator", {"skip": 0}) != key("brand", {"skip": 0})
+
+def test_generation_bump_invalidates():
+    """Profile writes invalidate cached pages for that entity only"""
+    cache = DiscoveryResultCache(max_entries=10, ttl_seconds=60)
+    cache.set("creator", {"skip": 0}, ["page"], cache.generation("creator"))
+    cache.set("brand", {"skip": 0}, ["brands"], cache.generation("brand"))
+    assert cache.get("creator", {"skip": 0}) == ["page"]
+
+    cache.bump("creator")
+    assert cache.get("creator", {"skip": 0}) is None
+    assert cache.get("brand", {"skip": 0}) == ["brands"]
+
+    # Results computed before a write are not cached after it
+    stale_generation = cache.generation("creator")
+    cache.bump("creator")
+    cache.set("creator", {"skip": 0}, ["stale"], stale_generation)
+    assert cache.get("creator", {"skip": 0}) is None
+
+def test_ttl_and_size_bounds():
+    """Entries expire after the TTL and the least recently used are evicted"""
+    cache = DiscoveryResultCache(max_entries=2, ttl_seconds=60)
+    for skip in range(3):
+        cache.set("creator", {"skip": skip}, [skip], 0)
+    assert cache.get("creator", {"skip": 0}) is None
+    assert cache.get("creator", {"skip": 2}) == [2]
+    assert cache.stats()["evictions"] == 1
+
+    cache = DiscoveryResultCache(max_entries=2, ttl_seconds=0.01)
+    cache.set("creator", {"skip": 0}, [0], 0)
+    time.sleep(0.02)
+    assert cache.get("creator", {"skip": 0}) is None
+
+def test_hit_ratio():
+    """Stats report the hit ratio over all lookups"""
+    cache = DiscoveryResultCache(max_entries=10, ttl_seconds=60)
+    cache.get("creator", {"skip": 0})
+    cache.set("creator", {"skip": 0}, [], 0)
+    cache.get("creator", {"skip": 0})
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+def test_shared_generations_invalidate_every_worker(tmp_path):
+    """A write in one worker invalidates the pages another worker cached"""
+    path = str(tmp_path / "generations")
+    worker_a = DiscoveryResultCache(max_entries=10, ttl_seconds=60, generations=SharedGenerations(path))
+    worker_b = DiscoveryResultCache(max_entries=10, ttl_seconds=60, generations=SharedGenerations(path))
+    worker_b.set("creator", {"skip": 0}, ["page"], worker_b.generation("creator"))
+    worker_b.set("brand", {"skip": 0}, ["brands"], worker_b.generation("brand"))
+
+    worker_a.bump("creator")
+    assert worker_b.generation("creator") == 1
+    assert worker_b.get("creator", {"skip": 0}) is None
+    assert worker_b.get("brand", {"skip": 0}) == ["brands"]
+
@@ -0,0 +1,45 @@
+import time
+from types import SimpleNamespace
+from app.crud import search
+
+def test_search_returns_partial_results_at_deadline(monkeypatch):
+    """A slow source is reported incomplete without holding up the others"""
+    def fake_source(section, deadline, q, location, near, limit):
+        if section == "agencies":
+            time.sleep(0.5)
+        if section == "brands":
+            raise RuntimeError("canceling statement due to statement timeout")
+        return [f"{section}:{q}"]
+
+    monkeypatch.setattr(search, "_run_search_source", fake_source)
+    started = time.monotonic()
+    result = search.search_all("fab", deadline_ms=100)
+
+    assert time.monotonic() - started < 0.4
+    assert result["creators"] == ["creators:fab"]
+    assert result["brands"] == [] and result["agencies"] == []
+    assert sorted(result["incomplete"]) == ["agencies", "brands"]
+
+def test_handle_availability_queries_unless_known_taken(monkeypatch):
+    """Handles missing from the index are checked in the database; known ones are taken"""
+    class Query:
+        def __init__(self, rows):
+            self.rows = rows
+        def filter(self, *criteria):
+            return self
+        def first(self):
+            return self.rows[0] if self.rows else None
+
+    queries = []
+    def db_with(rows):
+        return SimpleNamespace(query=lambda *columns: queries.append(columns) or Query(rows))
+
+    index = SimpleNamespace(refresh_if_stale=lambda db, seconds: None, has_handle=lambda handle: handle == "known")
+    monkeypatch.setattr(search, "suggest_index", index)
+
+    assert search.is_handle_available(db_with([]), "free") is True
+    # Claimed through another worker since this worker's index refreshed
+    assert search.is_handle_available(db_with([("id",)]), "just_claimed") is False
+    assert len(queries) == 2
+    assert search.is_handle_available(db_with([]), "known") is False
+    assert len(queries) == 2
@@ -0,0 +1,65 @@
+import uuid
+from types import SimpleNamespace
+from app.utils import similarity
+from app.utils.similarity import CreatorSimilarityIndex, creator_terms
+from app.db.models.creator import ContentTypeEnum
+
+def _row(bio, tags, content_type=ContentTypeEnum.POSTS, is_public=True, **overrides):
+    """Build a creator row with the columns the similarity index reads"""
+    return SimpleNamespace(
+        id=overrides.get("id", uuid.uuid4()), is_public=is_public, bio=bio, tags=tags,
+        content_type=content_type, created_at=None, updated_at=None,
+    )
+
+def test_creator_terms():
+    """Bio words and bigrams, tags and content type become weighted terms"""
+    terms = creator_terms("Street food and travel vlogs", ["Food"], ContentTypeEnum.REELS)
+    assert terms["w:street"] == 1.0
+    assert terms["b:street_food"] == 1.0
+    assert terms["t:food"] == 3.0
+    assert terms["c:reels"] == 2.0
+    assert "w:and" in terms and "w:a" not in terms
+
+def test_similar_ranks_closest_creators_first():
+    """Creators sharing bio words and tags outrank unrelated ones"""
+    index = CreatorSimilarityIndex()
+    cook = _row("home cooking recipes and street food", ["food", "cooking"])
+    chef = _row("quick recipes for home cooking", ["cooking"])
+    gamer = _row("competitive esports streams", ["gaming"], ContentTypeEnum.YOUTUBE)
+    index.apply_rows([cook, chef, gamer])
+
+    results = index.similar(cook.id, limit=5)
+    assert [creator_id for creator_id, _ in results] == [chef.id, gamer.id]
+    assert results[0][1] > results[1][1]
+    assert index.similar(uuid.uuid4()) == []
+
+def test_private_and_updated_profiles():
+    """Writes re-embed a creator; private creators drop out"""
+    index = CreatorSimilarityIndex()
+    cook = _row("home cooking recipes", ["food"])
+    other = _row("esports streams", ["gaming"])
+    index.apply_rows([cook, other])
+
+    index.apply_rows([_row("home cooking recipes daily", ["food"], id=other.id)])
+    assert index.similar(cook.id)[0][1] > 0.5
+
+    index.apply_rows([_row("esports", ["gaming"], is_public=False, id=other.id)])
+    assert index.similar(cook.id) == []
+    assert len(index) == 1
+
+def test_inverted_file_matches_exact_search(monkeypatch):
+    """Above the IVF threshold queries probe centroid lists and still find the closest rows"""
+    monkeypatch.setattr(similarity, "IVF_MIN_ROWS", 200)
+    index = CreatorSimilarityIndex()
+    topics = [["alpha", "bravo", "charlie"], ["delta", "echo", "foxtrot"], ["golf", "hotel", "india"]]
+    rows = [
+        _row(" ".join(topics[i % 3]) + f" item{i}", [topics[i % 3][0]])
+        for i in range(300)
+    ]
+    index.apply_rows(rows)
+    assert index._centroids is not None
+
+    same_topic = {row.id for row in rows[3::3]}
+    results = index.similar(rows[0].id, limit=5)
+    assert len(results) == 5
+    assert {creator_id for creator_id, _ in results} <= same_topic
@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.utils.suggest import SuggestIndex
+
+def _creator(handle, display_name, tags=(), is_public=True, xp_score=0.0, **overrides):
+    row = dict(
+        id=uuid.uuid4(), is_public=is_public, handle=handle, display_name=display_name,
+        tags=list(tags), xp_score=xp_score,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def _brand(brand_name, total_campaigns=0):
+    return SimpleNamespace(
+        id=uuid.uuid4(), brand_name=brand_name, total_campaigns=total_campaigns,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+    )
+
+def test_suggest_matches_prefixes_across_kinds():
+    """Prefixes match handles, names, brands and tags case-insensitively, heaviest first"""
+    index = SuggestIndex()
+    star = _creator("fashionista", "Fatima Khan", tags=["fashion"], xp_score=90.0)
+    newbie = _creator("fab_finds", "Farhan", tags=["fashion", "food"], xp_score=5.0)
+    index.apply_creators([star, newbie])
+    index.apply_brands([_brand("FabIndia", total_campaigns=12)])
+
+    texts = [suggestion["text"] for suggestion in index.suggest("FA", limit=10)]
+    assert set(texts[:2]) == {"fashionista", "Fatima Khan"}
+    assert set(texts) == {"fashionista", "Fatima Khan", "fab_finds", "Farhan", "FabIndia", "fashion"}
+    assert index.suggest("@fab", kinds=["handle"]) == [
+        {"kind": "handle", "text": "fab_finds", "id": str(newbie.id), "weight": 5.0}
+    ]
+    assert [suggestion["text"] for suggestion in index.suggest("f", kinds=["tag"])] == ["fashion", "food"]
+    assert index.suggest("zz") == []
+
+def test_updates_replace_entries_and_hide_private_creators():
+    """Renames replace old keys; private creators and their tags drop out"""
+    index = SuggestIndex()
+    creator = _creator("oldhandle", "Old Name", tags=["travel"])
+    index.apply_creators([creator])
+
+    creator.handle, creator.display_name = "newhandle", "New Name"
+    index.apply_creators([creator])
+    assert index.suggest("old") == []
+    assert {suggestion["text"] for suggestion in index.suggest("new")} == {"newhandle", "New Name"}
+
+    creator.is_public = False
+    index.apply_creators([creator])
+    assert index.suggest("new") == []
+    assert index.suggest("trav") == []
+    assert len(index) == 0
+
+def test_handle_lookup_covers_private_profiles():
+    """Private handles are not suggested but still count as taken"""
+    index = SuggestIndex()
+    hidden = _creator("hidden", "Hidden", is_public=False)
+    index.apply_creators([hidden])
+    assert index.has_handle("hidden")
+    assert not index.has_handle("free")
+
+    hidden.handle = "renamed"
+    index.apply_creators([hidden])
+    assert not index.has_handle("hidden")
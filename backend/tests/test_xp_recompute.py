@@ -0,0 +1,46 @@
+import uuid
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+from app.crud import xp
+
+def test_recompute_pages_by_id_and_reports_progress(monkeypatch):
+    """Chunks are keyset-paged by id; progress sees running totals; rescored creators are re-matched"""
+    ids = [uuid.UUID(int=i) for i in range(1, 6)]
+    calls = []
+    def next_chunk(db, full, after, chunk_rows):
+        calls.append((full, after))
+        start = 0 if after is None else ids.index(after) + 1
+        return ids[start:start + chunk_rows]
+
+    monkeypatch.setattr(xp, "_next_chunk", next_chunk)
+    monkeypatch.setattr(xp, "_rescore_chunk", lambda db, chunk: chunk[1:])
+    refreshed, bumps = [], []
+    monkeypatch.setattr(xp, "refresh_creator_matches", lambda db, profiles: refreshed.append(list(profiles)))
+    monkeypatch.setattr(xp.discovery_cache, "bump", bumps.append)
+    reports = []
+    stats = xp.recompute_xp_scores(None, full=True, chunk_rows=2, progress=reports.append)
+
+    assert calls == [(True, None), (True, ids[1]), (True, ids[3]), (True, ids[4])]
+    assert [report["scanned"] for report in reports] == [2, 4, 5]
+    assert stats["mode"] == "full" and stats["scanned"] == 5 and stats["updated"] == 2
+    assert stats["chunks"] == 3 and "rows_per_second" in stats
+    assert refreshed == [[ids[1]], [ids[3]]]
+    assert bumps == ["creator", "creator"]
+
+def test_rescore_chunk_skips_unchanged_rows():
+    """The UPDATE only touches stale rows or rows whose score changes"""
+    class Session:
+        def execute(self, statement, execution_options=None):
+            self.sql = str(statement.compile(dialect=postgresql.dialect()))
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: ["profile"]))
+        def expunge(self, profile):
+            pass
+        def commit(self):
+            pass
+
+    db = Session()
+    assert xp._rescore_chunk(db, [uuid.UUID(int=1)]) == ["profile"]
+    assert "xp_dirty=" in db.sql and "updated_at=now()" in db.sql
+    assert "creator_profiles.xp_score IS DISTINCT FROM" in db.sql
+    assert "creator_profiles.id = ANY (" in db.sql
+    assert "RETURNING creator_profiles.id" in db.sql